@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from apps.posts.deletion import schedule_user_deletion
+
 from .models import User
 
 
@@ -13,5 +15,13 @@ class CustomUserAdmin(admin.ModelAdmin):
         "is_active",
     )
 
+    # Accounts are deleted in the background, see apps.posts.deletion.
+    def delete_model(self, request, obj):
+        schedule_user_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            schedule_user_deletion(user)
+
 
 admin.site.register(User, CustomUserAdmin)
@@ -1,10 +1,15 @@
 from django.contrib.auth.models import update_last_login
 from djoser.serializers import UserCreateSerializer, UserSerializer
+from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.settings import api_settings
 
+from core.images import variant_urls
+
 
 class CustomUserSerializer(UserSerializer):
+    avatar_variants = serializers.SerializerMethodField()
+
     class Meta(UserCreateSerializer.Meta):
         fields = [
             "id",
@@ -14,10 +19,14 @@ class CustomUserSerializer(UserSerializer):
             "is_active",
             "bio",
             "avatar",
+            "avatar_variants",
             "created_at",
             "updated_at",
         ]
 
+    def get_avatar_variants(self, obj):
+        return variant_urls(obj.avatar_variants, self.context.get("request"))
+
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom serializer definition for the TokenObtainPairSerializer."""
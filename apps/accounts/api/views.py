@@ -1,3 +1,4 @@
+from djoser import utils
 from djoser.social.views import ProviderAuthView
 from djoser.views import UserViewSet
 from rest_framework import status
@@ -6,6 +7,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
+from apps.posts.deletion import schedule_user_deletion
+from core.throttling import LoginThrottle
 from settings.base import Base
 
 from ..renderers import AccountsRenderer
@@ -15,10 +18,16 @@ from .serializers import CustomTokenObtainPairSerializer
 class CustomUserViewSet(UserViewSet):
     renderer_classes = [AccountsRenderer]
 
+    def perform_destroy(self, instance):
+        if instance == self.request.user:
+            utils.logout_user(self.request)
+        schedule_user_deletion(instance)
+
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     renderer_classes = [AccountsRenderer]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request: Request, *args, **kwargs) -> Response:
         response = super().post(request, *args, **kwargs)
@@ -7,4 +7,10 @@ class AccountsConfig(AppConfig):
     label = "user_accounts"
 
     def ready(self):
-        import apps.accounts.extensions  # noqa
+        if self.apps.is_installed("drf_spectacular"):
+            import apps.accounts.extensions  # noqa
+        from core.images import register_image_variants
+
+        from .models import User
+
+        register_image_variants(User, "avatar", "avatar_variants")
@@ -2,6 +2,10 @@ from django.contrib.auth.models import UserManager
 
 
 class CustomUserManager(UserManager):
+    def get_queryset(self):
+        # Accounts being deleted in the background can no longer sign in or be looked up.
+        return super().get_queryset().filter(deleting_at__isnull=True)
+
     def _create_user(self, email, password, **extra_fields):
         """Create and save a user with the given email, and password."""
         if not email:
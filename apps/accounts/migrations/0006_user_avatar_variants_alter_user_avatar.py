@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:20
+
+import core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0005_alter_user_bio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='profile picture variants'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='images', validators=[core.images.validate_image_upload], verbose_name='profile picture'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0006_user_avatar_variants_alter_user_avatar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='deleting_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='deleting at'),
+        ),
+    ]
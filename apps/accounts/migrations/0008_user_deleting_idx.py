@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0007_user_deleting_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('deleting_at__isnull', False)), fields=['deleting_at'], name='accounts_user_deleting_idx'),
+        ),
+    ]
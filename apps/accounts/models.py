@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
 from django.utils.translation import gettext as _
 
+from core.images import validate_image_upload
+
 from .managers import CustomUserManager
 
 
@@ -44,9 +46,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         upload_to="images",
         null=True,
         blank=True,
+        validators=[validate_image_upload],
     )
+    avatar_variants = models.JSONField(_("profile picture variants"), default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+    # Set while the account is deleted in the background, see apps.posts.deletion.
+    deleting_at = models.DateTimeField(_("deleting at"), null=True, blank=True, editable=False)
 
     objects = CustomUserManager()
 
@@ -58,3 +64,9 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # The few users being deleted, excluded from the comments and likes served.
+            models.Index(
+                fields=["deleting_at"], name="accounts_user_deleting_idx", condition=models.Q(deleting_at__isnull=False)
+            ),
+        ]
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "task",
+        "queue",
+        "status",
+        "attempts",
+        "progress",
+        "run_at",
+        "finished_at",
+    ]
+    list_filter = ["status", "queue"]
+    search_fields = ["task"]
+
+
+admin.site.register(Job, JobAdmin)
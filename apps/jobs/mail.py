@@ -0,0 +1,73 @@
+"""Email backend that sends messages from the job queue instead of the request."""
+
+import base64
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .queue import enqueue, get_setting
+
+SEND_EMAILS_TASK = "jobs.send_emails"
+
+
+def serialize_message(message: EmailMessage) -> dict:
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            # MIME parts, rendered as they would be sent.
+            attachment = (attachment.get_filename(), attachment.get_payload(decode=True), attachment.get_content_type())
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append([filename, base64.b64encode(content).decode(), mimetype])
+
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": message.to,
+        "cc": message.cc,
+        "bcc": message.bcc,
+        "reply_to": message.reply_to,
+        "headers": message.extra_headers,
+        "content_subtype": message.content_subtype,
+        "alternatives": [list(alternative) for alternative in getattr(message, "alternatives", [])],
+        "attachments": attachments,
+    }
+
+
+def deserialize_message(data: dict, connection=None) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject=data["subject"],
+        body=data["body"],
+        from_email=data["from_email"],
+        to=data["to"],
+        cc=data["cc"],
+        bcc=data["bcc"],
+        reply_to=data["reply_to"],
+        headers=data["headers"],
+        alternatives=[tuple(alternative) for alternative in data["alternatives"]],
+        connection=connection,
+    )
+    message.content_subtype = data["content_subtype"]
+    for filename, content, mimetype in data["attachments"]:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Queue every message as a job, delivered by the worker through `JOBS["EMAIL_BACKEND"]`."""
+
+    def send_messages(self, email_messages):
+        queued = 0
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            try:
+                enqueue(SEND_EMAILS_TASK, serialize_message(message), queue=get_setting("EMAIL_QUEUE"))
+            except Exception:
+                if not self.fail_silently:
+                    raise
+            else:
+                queued += 1
+        return queued
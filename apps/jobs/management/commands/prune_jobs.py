@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import prune_jobs
+
+
+class Command(BaseCommand):
+    help = "Deletes the jobs that finished longer ago than JOBS['DONE_RETENTION_DAYS']"
+
+    def handle(self, *args, **options):
+        deleted = prune_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} jobs"))
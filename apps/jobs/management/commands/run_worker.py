@@ -0,0 +1,74 @@
+import os
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from apps.jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Only run jobs of this queue, may be repeated. Defaults to every queue",
+        )
+        parser.add_argument("--concurrency", type=int, default=1, help="Number of worker threads")
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs claimed at a time by every thread")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when no job is due")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due instead of polling")
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.lock = threading.Lock()
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        try:
+            if options["concurrency"] == 1:
+                self.work(worker_id, options)
+            else:
+                self.work_in_threads(worker_id, options)
+        except KeyboardInterrupt:
+            self.stopping.set()
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {self.processed} jobs"))
+
+    def work_in_threads(self, worker_id, options):
+        def work(thread_worker_id):
+            try:
+                self.work(thread_worker_id, options)
+            finally:
+                # Every thread has its own database connections.
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=work, args=(f"{worker_id}:{index}",), daemon=True)
+            for index in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+    def work(self, worker_id, options):
+        while not self.stopping.is_set():
+            close_old_connections()
+            count = run_pending(worker_id, queues=options["queues"], batch_size=options["batch_size"])
+            with self.lock:
+                self.processed += count
+            if not count:
+                if options["once"]:
+                    return
+                self.stopping.wait(options["poll_interval"])
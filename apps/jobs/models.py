@@ -0,0 +1,53 @@
+from enum import Enum
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    @classmethod
+    def choices(cls):
+        return [(key.value, key.name) for key in cls]
+
+
+class Job(models.Model):
+    """A task waiting for, or run by, the `run_worker` command. See apps.jobs.queue."""
+
+    queue = models.CharField(_("queue"), max_length=50, default="default")
+    task = models.CharField(_("task"), max_length=100)
+    payload = models.JSONField(_("payload"), default=dict, blank=True)
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=JobStatus.choices(),
+        default=JobStatus.QUEUED.value,
+    )
+    attempts = models.PositiveIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveIntegerField(_("max attempts"), default=5)
+    run_at = models.DateTimeField(_("run at"), default=timezone.now)
+    locked_at = models.DateTimeField(_("locked at"), null=True, blank=True)
+    locked_by = models.CharField(_("locked by"), max_length=100, blank=True)
+    last_error = models.TextField(_("last error"), blank=True)
+    # Reported by long running tasks with apps.jobs.queue.set_progress().
+    progress = models.JSONField(_("progress"), default=dict, blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    finished_at = models.DateTimeField(_("finished at"), null=True, blank=True)
+
+    class Meta:
+        """Meta definition for Job."""
+
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            # Workers poll for due jobs of their queues.
+            models.Index(fields=["status", "queue", "run_at"], name="jobs_job_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,241 @@
+"""Background jobs stored in the primary database.
+
+Request handlers `enqueue()` jobs, which become visible to workers when the request's transaction
+commits. `run_worker` processes claim due jobs in batches with SELECT ... FOR UPDATE SKIP LOCKED,
+so concurrent workers never claim the same job, and retry failed jobs with exponential backoff.
+While jobs run a heartbeat thread keeps their locks fresh, and their results are only saved by
+the worker still holding the lock.
+"""
+
+import logging
+import random
+import threading
+import traceback
+import uuid
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job, JobStatus
+from .registry import get_task
+
+log = logging.getLogger(__name__)
+
+_current_job = ContextVar("current_job", default=None)
+
+DEFAULTS = {
+    "MAX_ATTEMPTS": 5,
+    # Seconds before the first retry, doubled on every later attempt up to RETRY_BACKOFF_MAX.
+    "RETRY_BACKOFF": 30,
+    "RETRY_BACKOFF_MAX": 60 * 60,
+    # Running jobs locked for longer than this belong to a dead worker and are claimed again.
+    "LOCK_TIMEOUT": 10 * 60,
+    # Seconds between the refreshes of the locks of running jobs, well within LOCK_TIMEOUT.
+    "HEARTBEAT_INTERVAL": 60,
+    # Days finished jobs are kept for before `prune_jobs` deletes them.
+    "DONE_RETENTION_DAYS": 7,
+    # Backend the email task delivers queued messages with.
+    "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+    "EMAIL_QUEUE": "email",
+}
+
+
+def get_setting(name):
+    return getattr(settings, "JOBS", {}).get(name, DEFAULTS[name])
+
+
+def enqueue(task: str, payload: dict = None, queue: str = "default", run_at=None, max_attempts: int = None) -> Job:
+    """Queue `task` to run with `payload` once the current transaction commits."""
+    return Job.objects.create(
+        task=task,
+        payload=payload or {},
+        queue=queue,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or get_setting("MAX_ATTEMPTS"),
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    delay = min(get_setting("RETRY_BACKOFF") * 2 ** (attempts - 1), get_setting("RETRY_BACKOFF_MAX"))
+    # Jitter spreads out the retries of jobs that failed together.
+    return delay * random.uniform(0.75, 1.25)
+
+
+def claim_jobs(worker_id: str, queues: list[str] = None, batch_size: int = 10) -> list[Job]:
+    """Lock up to `batch_size` due jobs for `worker_id` and return them."""
+    now = timezone.now()
+    stale = Q(
+        status=JobStatus.RUNNING.value,
+        locked_at__lt=now - timedelta(seconds=get_setting("LOCK_TIMEOUT")),
+    )
+    # Jobs whose worker died on their last attempt are given up rather than run again.
+    exhausted = Job.objects.filter(stale, attempts__gte=F("max_attempts"))
+    if queues:
+        exhausted = exhausted.filter(queue__in=queues)
+    exhausted.update(
+        status=JobStatus.FAILED.value,
+        finished_at=now,
+        last_error="The worker running the last attempt stopped before it finished.",
+    )
+
+    due = Q(status=JobStatus.QUEUED.value, run_at__lte=now) | (stale & Q(attempts__lt=F("max_attempts")))
+    queryset = Job.objects.filter(due)
+    if queues:
+        queryset = queryset.filter(queue__in=queues)
+
+    # Every claim gets its own token, so only the jobs this UPDATE locked are returned even on
+    # databases without row locks.
+    token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+    with transaction.atomic():
+        ids = list(
+            queryset.select_for_update(skip_locked=True)
+            .order_by("run_at", "pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        Job.objects.filter(due, pk__in=ids).update(
+            status=JobStatus.RUNNING.value,
+            attempts=F("attempts") + 1,
+            locked_at=now,
+            locked_by=token,
+        )
+    return list(Job.objects.filter(locked_by=token, status=JobStatus.RUNNING.value).order_by("run_at", "pk"))
+
+
+def locked(jobs: list[Job]):
+    """Return the running `jobs` still locked by the claims that returned them."""
+    return Job.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        locked_by__in={job.locked_by for job in jobs},
+        status=JobStatus.RUNNING.value,
+    )
+
+
+def refresh_locks(jobs: list[Job]) -> int:
+    """Push back the lock expiry of the running `jobs` and return how many are still held."""
+    return locked(jobs).update(locked_at=timezone.now())
+
+
+class Heartbeat:
+    """Refreshes the locks of running jobs from a thread, so jobs outliving LOCK_TIMEOUT are not claimed again.
+
+    The thread has its own connection, so the refreshes commit even while tasks hold a transaction open.
+    """
+
+    def __init__(self, jobs: list[Job]):
+        self.jobs = jobs
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="jobs-heartbeat", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(get_setting("HEARTBEAT_INTERVAL")):
+                try:
+                    refresh_locks(self.jobs)
+                except Exception:
+                    log.exception("Could not refresh the locks of %s jobs", len(self.jobs))
+        finally:
+            connections.close_all()
+
+
+def set_progress(**progress) -> None:
+    """Record the progress of the job running in this thread, if any."""
+    job = _current_job.get()
+    if job is not None:
+        job.progress = progress
+        locked([job]).update(progress=progress, locked_at=timezone.now())
+
+
+def save_result(job: Job, fields: list[str]) -> bool:
+    """Save `fields` of `job` unless another worker claimed it since, and return whether it was saved."""
+    saved = locked([job]).update(**{field: getattr(job, field) for field in fields})
+    if not saved:
+        log.warning("Job %s (%s) was claimed again while it ran, dropping its result", job.pk, job.task)
+    return bool(saved)
+
+
+def finish_job(job: Job) -> bool:
+    job.status = JobStatus.DONE.value
+    job.finished_at = timezone.now()
+    job.last_error = ""
+    return save_result(job, ["status", "finished_at", "last_error"])
+
+
+def fail_job(job: Job, error: str) -> bool:
+    """Schedule a retry of `job`, or give up once it ran out of attempts."""
+    job.last_error = error
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED.value
+        job.run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+        log.warning("Job %s (%s) failed, retrying at %s", job.pk, job.task, job.run_at)
+    else:
+        job.status = JobStatus.FAILED.value
+        job.finished_at = timezone.now()
+        log.error("Job %s (%s) failed after %s attempts", job.pk, job.task, job.attempts)
+    return save_result(job, ["status", "run_at", "finished_at", "last_error"])
+
+
+def run_jobs(jobs: list[Job]) -> None:
+    """Run claimed jobs, calling batch tasks once for all their jobs."""
+    batches = {}
+    for job in jobs:
+        task = get_task(job.task)
+        if task is None:
+            job.attempts = job.max_attempts
+            fail_job(job, f"Unknown task {job.task!r}.")
+        elif task.batch:
+            batches.setdefault(task, []).append(job)
+        else:
+            token = _current_job.set(job)
+            try:
+                task.func(**job.payload)
+            except Exception:
+                fail_job(job, traceback.format_exc())
+            else:
+                finish_job(job)
+            finally:
+                _current_job.reset(token)
+
+    for task, batch in batches.items():
+        try:
+            errors = task.func([job.payload for job in batch])
+        except Exception:
+            error = traceback.format_exc()
+            for job in batch:
+                fail_job(job, error)
+            continue
+        # Batch tasks that report an error, or None, per payload only retry the jobs that failed.
+        if not isinstance(errors, list):
+            errors = [None] * len(batch)
+        for job, error in zip(batch, errors):
+            if error is None:
+                finish_job(job)
+            else:
+                fail_job(job, error)
+
+
+def run_pending(worker_id: str = "worker", queues: list[str] = None, batch_size: int = 10) -> int:
+    """Claim and run one batch of due jobs and return how many ran."""
+    jobs = claim_jobs(worker_id, queues=queues, batch_size=batch_size)
+    if jobs:
+        with Heartbeat(jobs):
+            run_jobs(jobs)
+    return len(jobs)
+
+
+def prune_jobs(now=None) -> int:
+    """Delete the jobs finished more than DONE_RETENTION_DAYS ago and return how many there were."""
+    cutoff = (now or timezone.now()) - timedelta(days=get_setting("DONE_RETENTION_DAYS"))
+    deleted, _ = Job.objects.filter(status=JobStatus.DONE.value, finished_at__lt=cutoff).delete()
+    return deleted
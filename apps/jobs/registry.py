@@ -0,0 +1,40 @@
+"""Registry of the tasks jobs can run.
+
+Apps declare their tasks in a `tasks` module, imported when the jobs app is ready:
+
+    @task("posts.rebuild_artifacts")
+    def rebuild_artifacts(post_id):
+        ...
+
+A job runs its task with its payload as keyword arguments. Tasks registered with `batch=True`
+are called once per claimed batch with the list of payloads instead, so they can share a
+connection, as emails do. A batch task that returns a list with an error, or None, for every
+payload has only the jobs with an error retried; otherwise an exception fails the whole batch.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    batch: bool = False
+
+
+_tasks = {}
+
+
+def task(name: str, batch: bool = False):
+    def register(func):
+        if name in _tasks and _tasks[name].func is not func:
+            raise ValueError(f"A task named {name!r} is already registered.")
+        _tasks[name] = Task(name=name, func=func, batch=batch)
+        return func
+
+    return register
+
+
+def get_task(name: str) -> Task | None:
+    return _tasks.get(name)
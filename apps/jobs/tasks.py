@@ -0,0 +1,24 @@
+import traceback
+
+from django.core.mail import get_connection
+
+from .mail import SEND_EMAILS_TASK, deserialize_message
+from .queue import get_setting
+from .registry import task
+
+
+@task(SEND_EMAILS_TASK, batch=True)
+def send_emails(payloads) -> list:
+    """Deliver a batch of queued messages over a single connection, and return the error of each."""
+    errors = []
+    with get_connection(get_setting("EMAIL_BACKEND")) as connection:
+        # One message per call, so a rejected message retries alone instead of re-sending the
+        # messages delivered before it.
+        for payload in payloads:
+            try:
+                connection.send_messages([deserialize_message(payload, connection)])
+            except Exception:
+                errors.append(traceback.format_exc())
+            else:
+                errors.append(None)
+    return errors
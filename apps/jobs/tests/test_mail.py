@@ -0,0 +1,80 @@
+from smtplib import SMTPRecipientsRefused
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends import locmem
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import run_pending
+
+
+@pytest.fixture(autouse=True)
+def queued_email(settings):
+    settings.EMAIL_BACKEND = "apps.jobs.mail.QueuedEmailBackend"
+    settings.JOBS = {"EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend"}
+
+
+@pytest.mark.django_db()
+def test_messages_are_queued_and_delivered_by_the_worker():
+    message = EmailMultiAlternatives("Hello", "Plain body", "from@example.com", ["to@example.com"])
+    message.attach_alternative("<p>HTML body</p>", "text/html")
+    message.attach("notes.txt", b"attached", "text/plain")
+    assert message.send() == 1
+
+    assert mail.outbox == []
+    job = Job.objects.get()
+    assert job.queue == "email"
+
+    run_pending()
+
+    assert len(mail.outbox) == 1
+    sent = mail.outbox[0]
+    assert sent.subject == "Hello"
+    assert sent.to == ["to@example.com"]
+    assert sent.alternatives[0][0] == "<p>HTML body</p>"
+    assert sent.attachments[0][:2] == ("notes.txt", "attached")
+
+
+@pytest.mark.django_db()
+def test_password_reset_enqueues_the_email(client):
+    User.objects.create_user(
+        email="reader@example.com",
+        password="a-long-password",
+        first_name="Reader",
+        last_name="User",
+        is_active=True,
+    )
+
+    response = client.post(reverse("reset_password"), {"email": "reader@example.com"})
+    assert response.status_code == 204
+    assert mail.outbox == []
+    assert Job.objects.filter(task="jobs.send_emails").count() == 1
+
+    run_pending()
+    assert mail.outbox[0].to == ["reader@example.com"]
+
+
+class RejectingBackend(locmem.EmailBackend):
+    def send_messages(self, messages):
+        if any("rejected@example.com" in message.to for message in messages):
+            raise SMTPRecipientsRefused({"rejected@example.com": (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db()
+def test_only_the_failed_messages_of_a_batch_are_retried(settings):
+    settings.JOBS = {"EMAIL_BACKEND": f"{__name__}.RejectingBackend"}
+    for to in ("first@example.com", "rejected@example.com", "last@example.com"):
+        EmailMultiAlternatives("Hello", "Body", "from@example.com", [to]).send()
+
+    assert run_pending() == 3
+    assert [message.to for message in mail.outbox] == [["first@example.com"], ["last@example.com"]]
+    assert list(Job.objects.order_by("pk").values_list("status", flat=True)) == [
+        JobStatus.DONE.value,
+        JobStatus.QUEUED.value,
+        JobStatus.DONE.value,
+    ]
+    assert "No such user" in Job.objects.get(status=JobStatus.QUEUED.value).last_error
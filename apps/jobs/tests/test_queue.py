@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import claim_jobs, enqueue, finish_job, refresh_locks, run_pending
+from apps.jobs.registry import task
+
+calls = []
+
+
+@task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.record_batch", batch=True)
+def record_batch(payloads):
+    calls.append([payload["value"] for payload in payloads])
+
+
+@task("tests.fail")
+def fail():
+    raise RuntimeError("Mail API is down")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db()
+def test_run_pending_runs_due_jobs():
+    job = enqueue("tests.record", {"value": 1})
+    enqueue("tests.record", {"value": 2}, run_at=timezone.now() + timedelta(hours=1))
+
+    assert run_pending() == 1
+    assert calls == [1]
+    job.refresh_from_db()
+    assert job.status == JobStatus.DONE.value
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+@pytest.mark.django_db()
+def test_batch_tasks_run_once_per_claim():
+    for value in range(3):
+        enqueue("tests.record_batch", {"value": value})
+
+    assert run_pending(batch_size=10) == 3
+    assert calls == [[0, 1, 2]]
+
+
+@pytest.mark.django_db()
+def test_failed_jobs_are_retried_with_backoff(settings):
+    settings.JOBS = {"RETRY_BACKOFF": 60, "MAX_ATTEMPTS": 2}
+    job = enqueue("tests.fail")
+
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == JobStatus.QUEUED.value
+    assert "Mail API is down" in job.last_error
+    assert job.run_at > timezone.now() + timedelta(seconds=30)
+    assert run_pending() == 0
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED.value
+    assert job.attempts == 2
+
+
+@pytest.mark.django_db()
+def test_unknown_tasks_fail_without_retrying():
+    job = enqueue("tests.missing")
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED.value
+
+
+@pytest.mark.django_db()
+def test_claimed_jobs_are_not_claimed_again_until_their_lock_expires():
+    job = enqueue("tests.record", {"value": 1})
+    assert claim_jobs("first") == [job]
+    assert claim_jobs("second") == []
+
+    Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+    assert claim_jobs("second") == [job]
+
+
+@pytest.mark.django_db()
+def test_claims_are_limited_to_queues():
+    enqueue("tests.record", {"value": 1}, queue="email")
+    assert claim_jobs("worker", queues=["default"]) == []
+    assert len(claim_jobs("worker", queues=["email"])) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_command_runs_queued_jobs():
+    enqueue("tests.record", {"value": 1})
+    enqueue("tests.record", {"value": 2})
+
+    call_command("run_worker", "--once", "--batch-size", "1")
+
+    assert sorted(calls) == [1, 2]
+    assert not Job.objects.exclude(status=JobStatus.DONE.value).exists()
+
+
+@pytest.mark.django_db()
+def test_jobs_locked_on_their_last_attempt_are_given_up():
+    job = enqueue("tests.record", {"value": 1}, max_attempts=1)
+    assert claim_jobs("first") == [job]
+
+    Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+    assert claim_jobs("second") == []
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED.value
+    assert job.attempts == 1
+
+
+@pytest.mark.django_db()
+def test_refreshed_locks_are_not_claimed_again():
+    job = enqueue("tests.record", {"value": 1})
+    [claimed] = claim_jobs("first")
+
+    Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+    assert refresh_locks([claimed]) == 1
+    assert claim_jobs("second") == []
+
+
+@pytest.mark.django_db()
+def test_results_of_jobs_claimed_again_are_dropped():
+    job = enqueue("tests.record", {"value": 1})
+    [first] = claim_jobs("first")
+    Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+    [second] = claim_jobs("second")
+
+    assert not finish_job(first)
+    assert refresh_locks([first]) == 0
+    job.refresh_from_db()
+    assert job.status == JobStatus.RUNNING.value
+    assert job.locked_by == second.locked_by
+
+    assert finish_job(second)
+    job.refresh_from_db()
+    assert job.status == JobStatus.DONE.value
+
+
+@pytest.mark.django_db()
+def test_prune_jobs_deletes_old_finished_jobs():
+    old, recent = enqueue("tests.record", {"value": 1}), enqueue("tests.record", {"value": 2})
+    failed = enqueue("tests.fail")
+    run_pending()
+    Job.objects.filter(pk__in=[old.pk, failed.pk]).update(
+        status=JobStatus.DONE.value, finished_at=timezone.now() - timedelta(days=30)
+    )
+    Job.objects.filter(pk=failed.pk).update(status=JobStatus.FAILED.value)
+
+    call_command("prune_jobs")
+    assert set(Job.objects.values_list("pk", flat=True)) == {recent.pk, failed.pk}
@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import Notification, NotificationCounter
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ["id", "recipient", "actor", "kind", "post", "read_at", "created_at"]
+    list_filter = ["kind"]
+    raw_id_fields = ["recipient", "actor", "post", "comment"]
+
+
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ["user", "unread", "updated_at"]
+    raw_id_fields = ["user"]
+
+
+admin.site.register(Notification, NotificationAdmin)
+admin.site.register(NotificationCounter, NotificationCounterAdmin)
@@ -0,0 +1,47 @@
+from rest_framework import serializers
+
+from apps.accounts.models import User
+from apps.notifications.models import Notification
+
+
+class NotificationActorSerializer(serializers.ModelSerializer):
+    """Serializer definition for the user a Notification is about."""
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+        ]
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """Serializer definition for the Notification model."""
+
+    actor = NotificationActorSerializer(read_only=True)
+    post_title = serializers.CharField(source="post.title", read_only=True)
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = [
+            "id",
+            "kind",
+            "actor",
+            "post",
+            "post_title",
+            "comment",
+            "is_read",
+            "read_at",
+            "created_at",
+        ]
+
+    def get_is_read(self, obj: Notification) -> bool:
+        return obj.read_at is not None
+
+
+class MarkReadSerializer(serializers.Serializer):
+    """Notifications to mark read, every unread one when `ids` is left out."""
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=500)
@@ -0,0 +1,27 @@
+from django.urls import path
+
+from .views import NotificationViewSet
+
+notification_list = NotificationViewSet.as_view(
+    {
+        "get": "list",
+    }
+)
+
+notification_unread_count = NotificationViewSet.as_view(
+    {
+        "get": "unread_count",
+    }
+)
+
+notification_mark_read = NotificationViewSet.as_view(
+    {
+        "post": "mark_read",
+    }
+)
+
+urlpatterns = [
+    path("notifications/", notification_list, name="notification-list"),
+    path("notifications/unread-count/", notification_unread_count, name="notification-unread-count"),
+    path("notifications/read/", notification_mark_read, name="notification-mark-read"),
+]
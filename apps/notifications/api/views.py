@@ -0,0 +1,55 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+
+from apps.notifications.api.serializers import MarkReadSerializer, NotificationSerializer
+from apps.notifications.counters import get_unread, mark_read
+from apps.notifications.models import Notification
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class NotificationViewSet(ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Notification.objects.filter(recipient=self.request.user).select_related("actor", "post")
+
+    def list(self, request: Request) -> Response:
+        """Notifications of the user, newest first, paginated by cursor. ?unread=true keeps the unread ones."""
+        # Cursors seek on the primary key, so pages cost the same however deep they are and do
+        # not shift as new notifications arrive.
+        paginator = CursorPagination()
+        paginator.ordering = "-id"
+        paginator.page_size = PAGE_SIZE
+        paginator.page_size_query_param = "page_size"
+        paginator.max_page_size = MAX_PAGE_SIZE
+
+        queryset = self.get_queryset()
+        if request.query_params.get("unread") in ("true", "1"):
+            queryset = queryset.filter(read_at__isnull=True)
+
+        instance = paginator.paginate_queryset(queryset, request)
+        serializer = NotificationSerializer(instance=instance, many=True, context={"request": request})
+        response = paginator.get_paginated_response(serializer.data)
+        response.data["unread"] = get_unread(request.user)
+        return response
+
+    @action(methods=["get"], detail=False)
+    def unread_count(self, request: Request) -> Response:
+        """Number of unread notifications of the user, read from its counter."""
+        return Response({"unread": get_unread(request.user)}, status=status.HTTP_200_OK)
+
+    @action(methods=["post"], detail=False)
+    def mark_read(self, request: Request) -> Response:
+        """Mark the notifications of `ids` read, or every unread one without `ids`, in one UPDATE."""
+        serializer = MarkReadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        marked = mark_read(request.user, serializer.validated_data.get("ids"))
+        return Response({"marked": marked, "unread": get_unread(request.user)}, status=status.HTTP_200_OK)
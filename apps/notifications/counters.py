@@ -0,0 +1,74 @@
+"""Denormalized unread counts of notifications.
+
+Counters are shifted in place with UPDATEs, one per distinct delta, so a fan-out to thousands of
+recipients costs a couple of queries. Notifications deleted by the cascade of their post, comment
+or actor do not shift them, so the paths deleting those run within `recounting()`, which recounts
+the recipients of the deleted notifications afterwards.
+"""
+
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Notification, NotificationCounter
+
+
+def shift_unread(deltas: dict) -> None:
+    """Shift the unread counter of every user id of `deltas` by its delta."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id) for user_id in deltas], ignore_conflicts=True
+    )
+    by_delta = {}
+    for user_id, delta in deltas.items():
+        by_delta.setdefault(delta, []).append(user_id)
+    for delta, user_ids in by_delta.items():
+        NotificationCounter.objects.filter(user_id__in=user_ids).update(unread=Greatest(F("unread") + delta, 0))
+
+
+def get_unread(user) -> int:
+    return NotificationCounter.objects.filter(user_id=user.pk).values_list("unread", flat=True).first() or 0
+
+
+def mark_read(user, ids=None) -> int:
+    """Mark the unread notifications of `user` among `ids`, or all of them, read and return how many were."""
+    queryset = Notification.objects.filter(recipient_id=user.pk, read_at__isnull=True)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    with transaction.atomic():
+        count = queryset.update(read_at=timezone.now())
+        shift_unread({user.pk: -count})
+    return count
+
+
+def recount(user_ids=None) -> int:
+    """Recompute the counters of `user_ids`, or of every user, from their unread notifications."""
+    unread = (
+        Notification.objects.filter(recipient_id=OuterRef("user_id"), read_at__isnull=True)
+        .order_by()
+        .values("recipient_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    queryset = NotificationCounter.objects.all()
+    if user_ids is not None:
+        queryset = queryset.filter(user_id__in=user_ids)
+    return queryset.update(unread=Coalesce(Subquery(unread), 0))
+
+
+@contextmanager
+def recounting(notifications):
+    """Recount the counters of the recipients of the unread `notifications` once the block deleted them.
+
+    Run it in the transaction of the deletion, so the counters never count deleted notifications.
+    """
+    user_ids = list(
+        notifications.filter(read_at__isnull=True).order_by().values_list("recipient_id", flat=True).distinct()
+    )
+    yield
+    recount(user_ids)
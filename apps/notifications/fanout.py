@@ -0,0 +1,121 @@
+"""Notifications of new comments, replies and likes, fanned out by the background worker.
+
+Comments and likes queue a `FAN_OUT_TASK` job when they are created. Workers run the jobs of a
+claimed batch together: the comments and likes are read with one query per kind and the earlier
+participants of their threads with one more, then the notifications are written with
+`bulk_create` and the unread counters shifted `BATCH_SIZE` notifications at a time. The number
+of queries grows with the number of batches, not of recipients.
+
+A comment notifies the author of the post and everyone who commented on the post before. A reply
+notifies the author of the post, the author of the comment it answers and everyone who replied to
+that comment before. Nobody is notified of their own comments and likes.
+"""
+
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, Q
+
+from apps.jobs.queue import enqueue
+from apps.jobs.registry import task
+from apps.posts.models import Comment, Like
+
+from .counters import shift_unread
+from .models import Notification, NotificationKind
+
+DEFAULTS = {
+    # Notifications written, and counters shifted, per query.
+    "BATCH_SIZE": 500,
+    "QUEUE": "notifications",
+}
+
+FAN_OUT_TASK = "notifications.fan_out"
+
+
+def get_setting(name):
+    return getattr(settings, "NOTIFICATIONS", {}).get(name, DEFAULTS[name])
+
+
+def schedule_fan_out(kind: NotificationKind, object_id):
+    """Queue the notifications of the comment or like `object_id`, in the current transaction."""
+    return enqueue(FAN_OUT_TASK, {"kind": kind.value, "id": str(object_id)}, queue=get_setting("QUEUE"))
+
+
+def first_participations(comments) -> dict:
+    """Return when every user first commented on the posts, or replied to the comments, of `comments`."""
+    post_ids = {comment.post_id for comment in comments if comment.parent_id is None}
+    parent_ids = {comment.parent_id for comment in comments if comment.parent_id is not None}
+    if not post_ids and not parent_ids:
+        return {}
+
+    threads = Q(post_id__in=post_ids, parent__isnull=True) | Q(parent_id__in=parent_ids)
+    rows = Comment.objects.filter(threads).order_by().values("post_id", "parent_id", "user_id")
+    participations = {}
+    for row in rows.annotate(first=Min("created_at")):
+        # Roots are keyed by their post, replies by the comment they answer.
+        thread = row["parent_id"] or row["post_id"]
+        participations.setdefault(thread, {})[row["user_id"]] = row["first"]
+    return participations
+
+
+def build_notifications(payloads):
+    """Yield the notifications of the comments and likes of `payloads` that still exist."""
+    ids = {kind: [] for kind in (NotificationKind.COMMENT.value, NotificationKind.LIKE.value)}
+    for payload in payloads:
+        ids[payload["kind"]].append(payload["id"])
+
+    comments = list(
+        Comment.objects.visible()
+        .filter(pk__in=ids[NotificationKind.COMMENT.value])
+        .select_related("post", "parent")
+        .order_by("created_at")
+    )
+    participations = first_participations(comments)
+    for comment in comments:
+        if comment.parent_id is None:
+            kind, thread, recipients = NotificationKind.COMMENT, comment.post_id, [comment.post.user_id]
+        else:
+            kind, thread = NotificationKind.REPLY, comment.parent_id
+            recipients = [comment.parent.user_id, comment.post.user_id]
+        recipients += [
+            user_id for user_id, first in participations.get(thread, {}).items() if first < comment.created_at
+        ]
+        for recipient_id in dict.fromkeys(recipients):
+            if recipient_id != comment.user_id:
+                yield Notification(
+                    recipient_id=recipient_id,
+                    actor_id=comment.user_id,
+                    kind=kind.value,
+                    post_id=comment.post_id,
+                    comment_id=comment.pk,
+                )
+
+    likes = Like.objects.visible().filter(pk__in=ids[NotificationKind.LIKE.value])
+    for like in likes.select_related("post").order_by("created_at"):
+        if like.user_id != like.post.user_id:
+            yield Notification(
+                recipient_id=like.post.user_id,
+                actor_id=like.user_id,
+                kind=NotificationKind.LIKE.value,
+                post_id=like.post_id,
+            )
+
+
+def write_notifications(notifications) -> int:
+    """Insert `notifications` and count them as unread, `BATCH_SIZE` at a time, and return how many there were."""
+    notifications = iter(notifications)
+    written = 0
+    while batch := list(islice(notifications, get_setting("BATCH_SIZE"))):
+        Notification.objects.bulk_create(batch)
+        shift_unread(Counter(notification.recipient_id for notification in batch))
+        written += len(batch)
+    return written
+
+
+@task(FAN_OUT_TASK, batch=True)
+def fan_out(payloads) -> int:
+    # One transaction, so a retried batch does not notify anyone twice.
+    with transaction.atomic():
+        return write_notifications(build_notifications(payloads))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.counters import recount
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized unread notification counters of every user"
+
+    def handle(self, *args, **options):
+        count = recount()
+        self.stdout.write(self.style.SUCCESS(f"Recounted unread notifications of {count} users"))
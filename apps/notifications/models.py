@@ -0,0 +1,79 @@
+from enum import Enum
+
+from django.db import models
+from django.utils.translation import gettext as _
+
+from apps.accounts.models import User
+from apps.posts.models import Comment, Post
+
+
+class NotificationKind(Enum):
+    COMMENT = "comment"
+    REPLY = "reply"
+    LIKE = "like"
+
+    @classmethod
+    def choices(cls):
+        return [(key.value, key.name) for key in cls]
+
+
+class Notification(models.Model):
+    """Model definition for Notification.
+
+    Written in bulk by the fan-out task from the comments and likes of posts (see
+    apps.notifications.fanout). The increasing primary key is the cursor of the listing.
+    """
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(_("kind"), max_length=10, choices=NotificationKind.choices())
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    read_at = models.DateTimeField(_("read at"), null=True, blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        """Meta definition for Notification."""
+
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        indexes = [
+            # Newest first listings of a recipient, and of their unread notifications.
+            models.Index(fields=["recipient", "-id"], name="notifications_recipient_idx"),
+            models.Index(
+                fields=["recipient", "-id"],
+                condition=models.Q(read_at__isnull=True),
+                name="notifications_unread_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Unicode representation of Notification."""
+        return f"{self.kind} for {self.recipient_id} on {self.post_id}"
+
+
+class NotificationCounter(models.Model):
+    """Model definition for NotificationCounter.
+
+    Denormalized unread count of a user, shifted by the fan-out and by marking notifications read,
+    and recounted when notifications are removed with their post, comment or actor.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(_("unread"), default=0)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        """Meta definition for NotificationCounter."""
+
+        verbose_name = "Notification counter"
+        verbose_name_plural = "Notification counters"
+
+    def __str__(self):
+        """Unicode representation of NotificationCounter."""
+        return f"{self.user_id}: {self.unread} unread"
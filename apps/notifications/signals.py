@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.posts.models import Comment, Like
+
+from .fanout import schedule_fan_out
+from .models import NotificationKind
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        schedule_fan_out(NotificationKind.COMMENT, instance.pk)
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        schedule_fan_out(NotificationKind.LIKE, instance.pk)
@@ -0,0 +1,2 @@
+# Tasks are declared next to the code they run, importing it registers them.
+from . import fanout  # noqa: F401
@@ -0,0 +1,166 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.jobs.queue import run_pending
+from apps.notifications.counters import get_unread
+from apps.notifications.fanout import FAN_OUT_TASK, fan_out
+from apps.notifications.models import Notification, NotificationCounter
+from apps.posts.archive import archive_post
+from apps.posts.deletion import schedule_post_deletion, schedule_user_deletion
+from apps.posts.models import Like, Post
+from apps.posts.moderation import archive_posts
+from apps.posts.tests.factories import CommentFactory, PostFactory, UserFactory
+
+
+def notified(kind):
+    return sorted(Notification.objects.filter(kind=kind).values_list("recipient_id", flat=True))
+
+
+@pytest.mark.django_db()
+def test_comments_replies_and_likes_are_fanned_out(user, other_user):
+    post = PostFactory(user=user)
+    first = CommentFactory(post=post, user=other_user)
+    third = UserFactory()
+    CommentFactory(post=post, user=third)
+    CommentFactory(post=post, parent=first, user=user)
+    Like.objects.create(user=user, post=post)
+    Like.objects.create(user=other_user, post=post)
+
+    assert run_pending(batch_size=10) == 5
+
+    # The post author, then the earlier commenter too, and never the actor.
+    assert notified("comment") == sorted([user.pk, user.pk, other_user.pk])
+    assert notified("reply") == [other_user.pk]
+    assert notified("like") == [user.pk]
+    assert get_unread(user) == 3
+    assert get_unread(other_user) == 2
+    assert get_unread(third) == 0
+
+
+@pytest.mark.django_db()
+def test_fan_out_queries_grow_with_batches(user, settings):
+    settings.NOTIFICATIONS = {"BATCH_SIZE": 10}
+    post = PostFactory(user=user)
+    for commenter in UserFactory.create_batch(24):
+        CommentFactory(post=post, user=commenter)
+    comment = CommentFactory(post=post)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert fan_out([{"kind": "comment", "id": str(comment.pk)}]) == 25
+
+    # The comments and the thread participants, then for each of the 3 batches the notifications,
+    # the missing counters and their UPDATE, within a savepoint.
+    assert len(queries) == 2 + 3 * 3 + 2
+    assert NotificationCounter.objects.filter(unread=1).count() == 25
+
+
+@pytest.mark.django_db()
+def test_fan_out_skips_deleted_likes(user, other_user):
+    like = Like.objects.create(user=other_user, post=PostFactory(user=user))
+    like_id = like.pk
+    like.delete()
+
+    assert fan_out([{"kind": "like", "id": str(like_id)}]) == 0
+
+
+@pytest.mark.django_db()
+def test_list_is_paginated_by_cursor(api_client, user, other_user):
+    post = PostFactory(user=user)
+    for _ in range(5):
+        CommentFactory(post=post, user=other_user)
+    run_pending(batch_size=10)
+    url = reverse("notification-list")
+
+    first = api_client.get(url, {"page_size": 3}).json()
+    second = api_client.get(first["next"]).json()
+
+    assert first["unread"] == 5
+    assert len(first["results"]) == 3 and len(second["results"]) == 2
+    ids = [item["id"] for item in first["results"] + second["results"]]
+    assert ids == sorted(ids, reverse=True)
+    assert first["results"][0]["actor"]["id"] == str(other_user.pk)
+    assert first["results"][0]["post_title"] == post.title
+
+
+@pytest.mark.django_db()
+def test_mark_read_in_bulk(api_client, user, other_user):
+    post = PostFactory(user=user)
+    for _ in range(4):
+        CommentFactory(post=post, user=other_user)
+    run_pending(batch_size=10)
+    ids = list(Notification.objects.order_by("id").values_list("id", flat=True))
+    url = reverse("notification-mark-read")
+
+    response = api_client.post(url, {"ids": ids[:2]}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"marked": 2, "unread": 2}
+    # Already read notifications are not counted twice.
+    assert api_client.post(url, {"ids": ids[:3]}, format="json").json() == {"marked": 1, "unread": 1}
+    assert api_client.post(url, {}, format="json").json() == {"marked": 1, "unread": 0}
+
+    unread = api_client.get(reverse("notification-list"), {"unread": "true"}).json()
+    assert unread["results"] == []
+    assert api_client.get(reverse("notification-unread-count")).json() == {"unread": 0}
+    assert api_client.post(url, {"ids": ["x"]}, format="json").status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db()
+def test_recount_notifications(user, other_user):
+    CommentFactory(post=PostFactory(user=user), user=other_user)
+    run_pending()
+    NotificationCounter.objects.update(unread=7)
+
+    call_command("recount_notifications")
+
+    assert get_unread(user) == 1
+
+
+def test_fan_out_is_a_batch_task():
+    from apps.jobs.registry import get_task
+
+    assert get_task(FAN_OUT_TASK).batch is True
+
+
+@pytest.mark.django_db()
+def test_deleting_notified_content_recounts_unread(api_client, user, other_user):
+    post = PostFactory(user=other_user)
+    comment = CommentFactory(post=post, user=user)
+    Like.objects.create(user=user, post=post)
+    commented = PostFactory(user=user)
+    parent = CommentFactory(post=commented, user=other_user)
+    CommentFactory(post=commented, parent=parent, user=UserFactory())
+    run_pending()
+    assert get_unread(other_user) == 3
+    assert get_unread(user) == 2
+
+    response = api_client.delete(reverse("comment-detail", kwargs={"pk": comment.pk}))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert get_unread(other_user) == 2
+
+    # The post with its comment and the reply to it.
+    schedule_post_deletion(commented)
+    run_pending()
+    assert get_unread(user) == 0
+    assert get_unread(other_user) == 1
+
+
+@pytest.mark.django_db()
+def test_archiving_and_deleting_actors_recounts_unread(user, other_user):
+    archived = PostFactory(user=user)
+    Like.objects.create(user=other_user, post=archived)
+    liker = UserFactory()
+    Like.objects.create(user=liker, post=PostFactory(user=user))
+    run_pending()
+    assert get_unread(user) == 2
+
+    archive_posts(Post.objects.filter(pk=archived.pk))
+    archive_post(archived.pk)
+    assert get_unread(user) == 1
+
+    schedule_user_deletion(liker)
+    run_pending()
+    assert get_unread(user) == 0
@@ -1,14 +1,111 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-from .models import Post
+from core.pagination import EstimatedCountPaginator
 
+from . import moderation
+from .deletion import schedule_post_deletion
+from .models import Comment, Like, Post, Tag
 
-class CustomPostAdminMixin(admin.ModelAdmin):
+
+class ModerationAdmin(admin.ModelAdmin):
+    """Changelists that never count a whole table, for tables too large to browse naively."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def report(self, request, count, message):
+        self.message_user(request, message.format(count=count), messages.SUCCESS)
+
+
+class CustomPostAdminMixin(ModerationAdmin):
     list_display = [
         "id",
         "title",
+        "user",
+        "status",
+        "likes",
         "updated_at",
     ]
+    list_select_related = ["user"]
+    list_filter = ["status"]
+    search_fields = ["=id", "title__startswith", "=user__email"]
+    ordering = ["-updated_at"]
+    raw_id_fields = ["user"]
+    autocomplete_fields = ["tags"]
+    actions = ["archive_posts", "delete_posts_by_authors"]
+
+    @admin.action(description="Archive selected posts")
+    def archive_posts(self, request, queryset):
+        self.report(request, moderation.archive_posts(queryset), "Archived {count} posts.")
+
+    @admin.action(description="Delete every post by the authors of the selected posts")
+    def delete_posts_by_authors(self, request, queryset):
+        posts = Post.objects.filter(user_id__in=queryset.values("user_id"))
+        self.report(request, moderation.delete_posts(posts), "Deleted {count} posts.")
+
+    def delete_model(self, request, obj):
+        schedule_post_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        moderation.delete_posts(queryset)
+
+
+class CommentAdmin(ModerationAdmin):
+    list_display = [
+        "id",
+        "user",
+        "post",
+        "created_at",
+    ]
+    list_select_related = ["user", "post"]
+    search_fields = ["=id", "=user__email"]
+    raw_id_fields = ["user", "post", "parent"]
+    actions = ["delete_comments_by_authors"]
+
+    @admin.action(description="Delete every comment by the authors of the selected comments")
+    def delete_comments_by_authors(self, request, queryset):
+        comments = Comment.objects.filter(user_id__in=queryset.values("user_id"))
+        self.report(request, moderation.delete_comments(comments), "Deleted {count} comments.")
+
+    def delete_queryset(self, request, queryset):
+        moderation.delete_comments(queryset)
+
+
+class LikeAdmin(ModerationAdmin):
+    list_display = [
+        "id",
+        "user",
+        "post",
+        "created_at",
+    ]
+    list_select_related = ["user", "post"]
+    search_fields = ["=id", "=user__email"]
+    raw_id_fields = ["user", "post"]
+    actions = ["delete_likes_by_users"]
+
+    @admin.action(description="Delete every like by the users of the selected likes")
+    def delete_likes_by_users(self, request, queryset):
+        likes = Like.objects.filter(user_id__in=queryset.values("user_id"))
+        self.report(request, moderation.delete_likes(likes), "Deleted {count} likes.")
+
+    def delete_queryset(self, request, queryset):
+        moderation.delete_likes(queryset)
+
+
+class TagAdmin(ModerationAdmin):
+    list_display = [
+        "name",
+        "slug",
+        "posts_count",
+        "published_posts_count",
+    ]
+    search_fields = ["name"]
+    ordering = ["-posts_count", "name"]
+    prepopulated_fields = {"slug": ["name"]}
 
 
 admin.site.register(Post, CustomPostAdminMixin)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Like, LikeAdmin)
+admin.site.register(Tag, TagAdmin)
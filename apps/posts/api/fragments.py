@@ -0,0 +1,63 @@
+"""Serialized post fragments shared by every response listing posts.
+
+The JSON of every post is cached per serializer under the post's version, see apps.posts.cache,
+so warm posts are assembled from one multi-get instead of being queried and serialized again.
+Fragments are built from the primary, see apps.posts.cache. Fields depending on the viewer are cached with their anonymous value and filled in per request.
+The counters of the embedded tags are refreshed when the fragment expires.
+"""
+
+from django.core.cache import cache
+
+from apps.posts.cache import FRAGMENT_CACHE_TIMEOUT, get_post_versions, post_fragment_key
+from apps.posts.models import Like, Post
+from core.routers import reading_from_primary
+from core.singleflight import flight
+
+from .serializers import PostListSerializer
+
+
+def serialize_posts(post_ids, request, serializer_class=PostListSerializer) -> dict:
+    """Return the serialized posts of `post_ids` that exist, by id and in the order of `post_ids`."""
+    post_ids = list(dict.fromkeys(post_ids))
+    versions = get_post_versions(post_ids)
+    keys = {post_id: post_fragment_key(post_id, versions[post_id], serializer_class.__name__) for post_id in post_ids}
+    stored = cache.get_many(keys.values())
+    fragments = {post_id: stored[key] for post_id, key in keys.items() if key in stored}
+    # Posts whose like by the viewer is still to be queried.
+    likes_unknown = set(fragments)
+
+    liked = set()
+    missing = [post_id for post_id in post_ids if post_id not in fragments]
+    if missing:
+
+        def build():
+            queryset = Post.objects.with_listing_data(request.user).filter(pk__in=missing)
+            if serializer_class is PostListSerializer:
+                queryset = queryset.without_body()
+            with reading_from_primary():
+                posts = list(queryset)
+            built = serializer_class(posts, many=True, context={"request": request}).data
+            built = {post.pk: {**data, "is_liked": False} for post, data in zip(posts, built)}
+            cache.set_many({keys[post_id]: data for post_id, data in built.items()}, FRAGMENT_CACHE_TIMEOUT)
+            return built, {post.pk for post in posts if post.is_liked}
+
+        # Concurrent requests missing the same posts wait for one query and serialization.
+        (built, built_liked), shared = flight.do(tuple(keys[post_id] for post_id in missing), build)
+        fragments.update(built)
+        if shared:
+            # Built for another viewer, whose likes say nothing about this one's.
+            likes_unknown.update(built)
+        else:
+            # The viewer's likes of the missing posts came with them, only cached posts need a query.
+            liked.update(built_liked)
+
+    liked_candidates = [
+        post_id for post_id in post_ids if post_id in likes_unknown and fragments[post_id]["likes_count"]
+    ]
+    if liked_candidates and request.user.is_authenticated:
+        liked.update(
+            Like.objects.filter(user=request.user, post_id__in=liked_candidates).values_list("post_id", flat=True)
+        )
+    return {
+        post_id: {**fragments[post_id], "is_liked": post_id in liked} for post_id in post_ids if post_id in fragments
+    }
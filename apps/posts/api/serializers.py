@@ -1,13 +1,13 @@
 from rest_framework import serializers
 
 from apps.posts.models import Comment, Like, Post, Tag
+from core.images import variant_urls
 
 
 class TagSerializer(serializers.ModelSerializer):
     """Serializer definition for the Tag model."""
 
     url = serializers.HyperlinkedIdentityField(view_name="tag-detail", lookup_field="pk", read_only=True)
-    posts_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Tag
@@ -19,11 +19,9 @@ class TagSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "posts_count",
+            "published_posts_count",
         ]
 
-    def get_posts_count(self, obj):
-        return obj.posts.count()
-
 
 class TagCreateSerializer(serializers.ModelSerializer):
     """Serializer definition for creating a Tag."""
@@ -42,7 +40,10 @@ class PostSerializer(serializers.ModelSerializer):
     comments_count = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
+    views = serializers.SerializerMethodField()
+    unique_views = serializers.SerializerMethodField()
     tags = TagSerializer(many=True, read_only=True)
+    featured_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -52,6 +53,12 @@ class PostSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "content",
+            "content_html",
+            "excerpt",
+            "word_count",
+            "reading_time",
+            "featured_image",
+            "featured_image_variants",
             "created_at",
             "updated_at",
             "status",
@@ -59,22 +66,50 @@ class PostSerializer(serializers.ModelSerializer):
             "comments_count",
             "likes_count",
             "is_liked",
+            "views",
+            "unique_views",
             "tags",
         ]
 
     def get_comments_count(self, obj):
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
         return obj.comments.count()
 
     def get_likes_count(self, obj):
+        if hasattr(obj, "likes_count"):
+            return obj.likes_count
         return obj.post_likes.count()
 
+    def get_views(self, obj):
+        if hasattr(obj, "views_count"):
+            return obj.views_count
+        return getattr(getattr(obj, "view_stats", None), "total_views", 0)
+
+    def get_unique_views(self, obj):
+        if hasattr(obj, "unique_views_count"):
+            return obj.unique_views_count
+        return getattr(getattr(obj, "view_stats", None), "unique_views", 0)
+
+    def get_featured_image_variants(self, obj):
+        return variant_urls(obj.featured_image_variants, self.context.get("request"))
+
     def get_is_liked(self, obj):
+        if hasattr(obj, "is_liked"):
+            return obj.is_liked
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return obj.post_likes.filter(user=request.user).exists()
         return False
 
 
+class PostListSerializer(PostSerializer):
+    """Serializer definition for Post listings, which ship the excerpt instead of the body."""
+
+    class Meta(PostSerializer.Meta):
+        fields = [field for field in PostSerializer.Meta.fields if field not in ("content", "content_html")]
+
+
 class PostCreateSerializer(serializers.ModelSerializer):
     """Serializer definition for the Post model."""
 
@@ -84,6 +119,7 @@ class PostCreateSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "content",
+            "featured_image",
             "status",
             "tags",
         ]
@@ -112,6 +148,8 @@ class CommentSerializer(serializers.ModelSerializer):
         ]
 
     def get_replies_count(self, obj):
+        if hasattr(obj, "replies_count"):
+            return obj.replies_count
         return obj.replies.count()
 
 
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import CommentViewSet, LikeViewSet, PostViewSet, TagViewSet
+from .views import CommentViewSet, LikeViewSet, PostViewSet, SyncViewSet, TagViewSet, post_events
 
 post_list = PostViewSet.as_view(
     {
@@ -24,6 +24,30 @@ recent_posts = PostViewSet.as_view(
     }
 )
 
+trending_posts = PostViewSet.as_view(
+    {
+        "get": "trending",
+    }
+)
+
+batch_posts = PostViewSet.as_view(
+    {
+        "get": "batch",
+    }
+)
+
+post_page = PostViewSet.as_view(
+    {
+        "get": "page",
+    }
+)
+
+post_feed = PostViewSet.as_view(
+    {
+        "get": "feed",
+    }
+)
+
 my_posts = PostViewSet.as_view(
     {
         "get": "my_posts",
@@ -73,6 +97,12 @@ tag_list = TagViewSet.as_view(
     }
 )
 
+tag_autocomplete = TagViewSet.as_view(
+    {
+        "get": "autocomplete",
+    }
+)
+
 tag_detail = TagViewSet.as_view(
     {
         "get": "retrieve",
@@ -82,16 +112,37 @@ tag_detail = TagViewSet.as_view(
     }
 )
 
+tag_follow = TagViewSet.as_view(
+    {
+        "post": "follow",
+        "delete": "unfollow",
+    }
+)
+
+sync_changes = SyncViewSet.as_view(
+    {
+        "get": "changes",
+    }
+)
+
 urlpatterns = [
     path("posts/", post_list, name="post-list"),
     path("posts/recent/", recent_posts, name="post-recent"),
+    path("posts/trending/", trending_posts, name="post-trending"),
     path("posts/my/", my_posts, name="post-my"),
+    path("posts/feed/", post_feed, name="post-feed"),
+    path("posts/batch/", batch_posts, name="post-batch"),
+    path("posts/events/", post_events, name="post-events"),
     path("posts/<uuid:pk>/", post_detail, name="post-detail"),
+    path("posts/<uuid:pk>/page/", post_page, name="post-page"),
     path("comments/", comment_list, name="comment-list"),
     path("comments/<uuid:pk>/", comment_detail, name="comment-detail"),
     path("comments/<uuid:pk>/replies/", comment_replies, name="comment-replies"),
     path("likes/", like_list, name="like-list"),
     path("likes/<uuid:pk>/", like_detail, name="like-detail"),
     path("tags/", tag_list, name="tag-list"),
+    path("tags/autocomplete/", tag_autocomplete, name="tag-autocomplete"),
     path("tags/<uuid:pk>/", tag_detail, name="tag-detail"),
+    path("tags/<uuid:pk>/follow/", tag_follow, name="tag-follow"),
+    path("sync/changes/", sync_changes, name="sync-changes"),
 ]
@@ -1,14 +1,27 @@
+import hashlib
+from copy import copy
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-from django.db.models import Q
+from django.core.signing import BadSignature
+from django.db.models import Count, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_list_or_404, get_object_or_404
+from django.urls import reverse
+from django.utils.http import urlencode
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
+from apps.accounts.authentication import CustomJWTAuthentication
+from apps.posts.api.fragments import serialize_posts
 from apps.posts.api.serializers import (
     CommentCreateSerializer,
     CommentSerializer,
@@ -18,7 +31,47 @@ from apps.posts.api.serializers import (
     TagCreateSerializer,
     TagSerializer,
 )
-from apps.posts.models import Comment, Like, Post, Status, Tag
+from apps.posts.archive import get_archived_post, restore_post
+from apps.posts.autocomplete import autocomplete as autocomplete_tags
+from apps.posts.cache import PAGE_CACHE_TIMEOUT, get_post_version, post_page_key
+from apps.posts.changes import ExpiredToken, changes_since, head, make_token, read_token
+from apps.posts.deletion import schedule_post_deletion
+from apps.posts.feed import feed_page, follow_tag, unfollow_tag
+from apps.posts.live import COUNTS_EVENT, channel, get_counts
+from apps.posts.models import ChangeKind, Comment, Like, Post, Status, Tag
+from apps.posts.moderation import delete_comments
+from apps.posts.tag_cache import resolve_slugs
+from apps.posts.view_counts import view_tracker, viewer_key
+from core.pubsub import format_event
+from core.pubsub import get_setting as get_live_setting
+from core.pubsub import hub
+from core.routers import ReplicaReadMixin, reading_from_primary
+from core.singleflight import cached
+
+BATCH_MAX_IDS = 50
+PAGE_MAX_COMMENTS = 50
+PAGE_LOCK_TIMEOUT = 5
+RECENT_POSTS_TIMEOUT = 15
+RECENT_POSTS_LOCK_TIMEOUT = 5
+FEED_PAGE_SIZE = 10
+FEED_MAX_PAGE_SIZE = 50
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGE_SIZE = 500
+# Replies shipped inline with every root comment of a post page, the oldest first.
+REPLY_PREVIEWS = 3
+
+
+def replies_count_subquery():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(parent=OuterRef("pk"))
+            .order_by()
+            .values("parent")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
 
 
 class IsOwnerOrReadOnly:
@@ -31,13 +84,18 @@ class IsOwnerOrReadOnly:
         return obj.user == request.user
 
 
-class PostViewSet(ViewSet):
+class PostViewSet(ReplicaReadMixin, ViewSet):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     serializer_class = PostSerializer
 
     def get_queryset(self):
         return Post.objects.all()
 
+    def get_paginated_posts(self, paginator: PageNumberPagination, queryset, request: Request) -> Response:
+        """Paginate the ids of `queryset` and assemble the page from cached post fragments."""
+        post_ids = paginator.paginate_queryset(queryset.values_list("pk", flat=True), request)
+        return paginator.get_paginated_response(list(serialize_posts(post_ids, request).values()))
+
     def list(self, request: Request) -> Response:
         paginator = PageNumberPagination()
         if request.query_params.get("page_size"):
@@ -46,7 +104,9 @@ class PostViewSet(ViewSet):
             paginator.page_size = 10
 
         search_query = request.query_params.get("search")
-        tag_slug = request.query_params.get("tag")
+        # ?tag=a,b or ?tag=a&tag=b, matching any of the tags unless ?tag_match=all.
+        tag_slugs = {slug for value in request.query_params.getlist("tag") for slug in value.split(",") if slug}
+        match_all = request.query_params.get("tag_match") == "all"
         
         queryset = self.get_queryset()
         
@@ -54,18 +114,20 @@ class PostViewSet(ViewSet):
             queryset = queryset.filter(
                 Q(title__icontains=search_query) | 
                 Q(content__icontains=search_query)
-            ).order_by("-updated_at")
-        elif tag_slug:
-            queryset = queryset.filter(tags__slug=tag_slug).order_by("-updated_at")
-        else:
-            queryset = queryset.order_by("-updated_at")
+            )
+        if tag_slugs:
+            tag_ids = resolve_slugs(tag_slugs)
+            if not tag_ids or (match_all and len(tag_ids) < len(tag_slugs)):
+                queryset = queryset.none()
+            else:
+                queryset = queryset.with_tags(tag_ids.values(), match_all=match_all)
+        queryset = queryset.order_by("-updated_at")
 
-        instance = paginator.paginate_queryset(queryset, request)
-        serializer = PostSerializer(instance=instance, many=True, context={"request": request})
-        return paginator.get_paginated_response(serializer.data)
+        return self.get_paginated_posts(paginator, queryset, request)
 
     def create(self, request: Request) -> Response:
-        data = request.data.copy()
+        # A shallow copy, uploaded files can't be deep copied.
+        data = copy(request.data)
         data['user'] = request.user.id
         serializer = PostSerializer(data=data, context={"request": request})
         if serializer.is_valid():
@@ -73,20 +135,46 @@ class PostViewSet(ViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def get_post_for_update(self, request: Request, pk) -> Post:
+        """Return the live post `pk`, restoring it from cold storage when it is set back to draft."""
+        instance = self.get_queryset().filter(pk=pk).first()
+        if instance is not None:
+            return instance
+
+        archived = get_archived_post(pk)
+        if archived is None:
+            raise Http404
+        if archived.user != request.user:
+            return archived
+        if request.data.get("status") == Status.DRAFT.value:
+            return restore_post(pk)
+        if request.data.get("status") in (None, Status.ARCHIVED.value):
+            raise ValidationError({"status": "Archived posts must be set back to draft before they are edited"})
+        # Any other transition is rejected by the caller.
+        return archived
+
     def retrieve(self, request, pk=None):
-        instance = get_object_or_404(self.get_queryset(), pk=pk)
+        fragment = serialize_posts([pk], request, PostSerializer).get(pk)
+        if fragment is not None:
+            view_tracker.record(pk, viewer_key(request))
+            return Response(fragment, status=status.HTTP_200_OK)
+
+        # Archived posts moved to cold storage, see apps.posts.archive.
+        instance = get_archived_post(pk, request.user)
+        if instance is None:
+            raise Http404
         serializer = PostSerializer(instance, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, pk=None):
-        instance = get_object_or_404(self.get_queryset(), pk=pk)
+        instance = self.get_post_for_update(request, pk)
         if instance.user != request.user:
             return Response(
                 {"detail": "You do not have permission to perform this action."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        data = request.data.copy()
+        data = copy(request.data)
         data['user'] = request.user.id
         
         # Validate status transitions
@@ -104,14 +192,14 @@ class PostViewSet(ViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def partial_update(self, request, pk=None):
-        instance = get_object_or_404(self.get_queryset(), pk=pk)
+        instance = self.get_post_for_update(request, pk)
         if instance.user != request.user:
             return Response(
                 {"detail": "You do not have permission to perform this action."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        data = request.data.copy()
+        data = copy(request.data)
         if 'user' in data:
             data['user'] = request.user.id
         
@@ -136,7 +224,7 @@ class PostViewSet(ViewSet):
                 {"detail": "You do not have permission to perform this action."},
                 status=status.HTTP_403_FORBIDDEN
             )
-        instance.delete()
+        schedule_post_deletion(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=["get"], detail=False)
@@ -148,9 +236,133 @@ class PostViewSet(ViewSet):
             paginator.page_size = 10
 
         queryset = self.get_queryset().filter(status=Status.PUBLISHED.value).order_by("-updated_at")
-        instance = paginator.paginate_queryset(queryset, request)
-        serializer = PostSerializer(instance, many=True, context={"request": request})
-        return paginator.get_paginated_response(serializer.data)
+
+        def build():
+            post_ids = paginator.paginate_queryset(queryset.values_list("pk", flat=True), request)
+            return {
+                "count": paginator.page.paginator.count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "ids": post_ids,
+            }
+
+        # Every client polls the same few pages, their ids are shared and refreshed by one request.
+        cache_key = f"posts:recent:{hashlib.md5(request.build_absolute_uri().encode()).hexdigest()}"
+        page = cached(cache_key, build, RECENT_POSTS_TIMEOUT, lock_timeout=RECENT_POSTS_LOCK_TIMEOUT)
+        return Response(
+            {
+                "count": page["count"],
+                "next": page["next"],
+                "previous": page["previous"],
+                "results": list(serialize_posts(page["ids"], request).values()),
+            }
+        )
+
+    @action(methods=["get"], detail=False)
+    def trending(self, request: Request) -> Response:
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Ranked by the precomputed scores, which only exist for published posts.
+        queryset = self.get_queryset().filter(trending__isnull=False).order_by("-trending__score")
+        post_ids = queryset.values_list("pk", flat=True)[:limit]
+        return Response(list(serialize_posts(post_ids, request).values()), status=status.HTTP_200_OK)
+
+    @action(methods=["get"], detail=False)
+    def batch(self, request: Request) -> Response:
+        # ?ids=a,b or ?ids=a&ids=b, answered in the requested order.
+        values = [value for param in request.query_params.getlist("ids") for value in param.split(",") if value]
+        try:
+            ids = list(dict.fromkeys(UUID(value) for value in values))
+        except ValueError:
+            return Response({"ids": "Must be a list of post ids."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > BATCH_MAX_IDS:
+            return Response(
+                {"ids": f"At most {BATCH_MAX_IDS} posts can be fetched at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        posts = serialize_posts(ids, request, PostSerializer)
+        return Response(
+            {"results": list(posts.values()), "missing": [str(post_id) for post_id in ids if post_id not in posts]},
+            status=status.HTTP_200_OK,
+        )
+
+    def build_page(self, request: Request, pk, page_size: int) -> dict | None:
+        """Assemble the viewer independent part of a post page from a fixed number of queries."""
+        post = self.get_queryset().with_listing_data().filter(pk=pk).first()
+        if post is None:
+            return None
+
+        replies_count = replies_count_subquery()
+        roots = Comment.objects.visible().filter(post_id=post.pk, parent=None)
+        comments_count = roots.count()
+        comments = list(
+            roots.select_related("user").annotate(replies_count=replies_count).order_by("-created_at")[:page_size]
+        )
+        previews = (
+            Comment.objects.visible()
+            .filter(parent__in=[comment.pk for comment in comments])
+            .select_related("user")
+            .annotate(
+                replies_count=replies_count,
+                position=Window(RowNumber(), partition_by=F("parent_id"), order_by=F("created_at").asc()),
+            )
+            .filter(position__lte=REPLY_PREVIEWS)
+            .order_by("created_at")
+        )
+        replies = {}
+        for reply in previews if comments else []:
+            replies.setdefault(reply.parent_id, []).append(reply)
+
+        context = {"request": request}
+        results = CommentSerializer(comments, many=True, context=context).data
+        for result, comment in zip(results, comments):
+            result["replies"] = CommentSerializer(replies.get(comment.pk, []), many=True, context=context).data
+
+        next_url = None
+        if comments_count > page_size:
+            query = urlencode({"post": post.pk, "page": 2, "page_size": page_size})
+            next_url = request.build_absolute_uri(f"{reverse('comment-list')}?{query}")
+
+        return {
+            "post": PostSerializer(post, context=context).data,
+            "comments": {"count": comments_count, "next": next_url, "results": results},
+            "likes": {"count": post.likes_count},
+        }
+
+    @action(methods=["get"], detail=True)
+    def page(self, request: Request, pk=None) -> Response:
+        """The post, its first page of root comments with reply previews and its likes, in one call."""
+        try:
+            page_size = min(int(request.query_params.get("page_size", 10)), PAGE_MAX_COMMENTS)
+        except ValueError:
+            return Response({"page_size": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build():
+            # Cached under the version read below, which replicas may not have caught up with.
+            with reading_from_primary():
+                payload = self.build_page(request, pk, page_size)
+            if payload is None:
+                raise Http404
+            return payload
+
+        # Read the version before building, so a change made meanwhile is never cached as current.
+        cache_key = post_page_key(pk, get_post_version(pk), page_size)
+        payload = cached(cache_key, build, PAGE_CACHE_TIMEOUT, lock_timeout=PAGE_LOCK_TIMEOUT)
+
+        is_liked = request.user.is_authenticated and Like.objects.filter(post_id=pk, user=request.user).exists()
+        view_tracker.record(pk, viewer_key(request))
+        return Response(
+            {
+                **payload,
+                "post": {**payload["post"], "is_liked": is_liked},
+                "likes": {**payload["likes"], "is_liked": is_liked},
+            },
+            status=status.HTTP_200_OK,
+        )
 
     @action(methods=["get"], detail=False)
     def my_posts(self, request: Request) -> Response:
@@ -161,17 +373,40 @@ class PostViewSet(ViewSet):
             paginator.page_size = 10
 
         queryset = self.get_queryset().filter(user=request.user).order_by("-updated_at")
-        instance = paginator.paginate_queryset(queryset, request)
-        serializer = PostSerializer(instance, many=True, context={"request": request})
-        return paginator.get_paginated_response(serializer.data)
+        return self.get_paginated_posts(paginator, queryset, request)
 
-
-class CommentViewSet(ViewSet):
+    @action(methods=["get"], detail=False)
+    def feed(self, request: Request) -> Response:
+        """Published posts of the tags the user follows, newest first, see apps.posts.feed.
+
+        Pages are keyset paginated, `next` links to the page after the last post of this one.
+        """
+        try:
+            page_size = min(int(request.query_params.get("page_size", FEED_PAGE_SIZE)), FEED_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({"page_size": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            post_ids, cursor = feed_page(request.user, page_size, request.query_params.get("cursor"))
+        except BadSignature:
+            return Response({"cursor": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_url = None
+        if cursor:
+            query = urlencode({"cursor": cursor, "page_size": page_size})
+            next_url = request.build_absolute_uri(f"{reverse('post-feed')}?{query}")
+        posts = serialize_posts(post_ids, request)
+        return Response(
+            {"next": next_url, "results": [posts[post_id] for post_id in post_ids if post_id in posts]},
+            status=status.HTTP_200_OK,
+        )
+
+
+class CommentViewSet(ReplicaReadMixin, ViewSet):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     serializer_class = CommentSerializer
 
     def get_queryset(self):
-        return Comment.objects.all()
+        return Comment.objects.visible()
 
     def list(self, request: Request) -> Response:
         paginator = PageNumberPagination()
@@ -253,7 +488,8 @@ class CommentViewSet(ViewSet):
                 {"detail": "You do not have permission to perform this action."},
                 status=status.HTTP_403_FORBIDDEN
             )
-        instance.delete()
+        # With its replies, recounting the notifications that go with them.
+        delete_comments(Comment.objects.filter(pk=instance.pk))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=["get"], detail=True)
@@ -271,12 +507,12 @@ class CommentViewSet(ViewSet):
         return paginator.get_paginated_response(serializer.data)
 
 
-class LikeViewSet(ViewSet):
+class LikeViewSet(ReplicaReadMixin, ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = LikeSerializer
 
     def get_queryset(self):
-        return Like.objects.all()
+        return Like.objects.visible()
 
     def list(self, request: Request) -> Response:
         paginator = PageNumberPagination()
@@ -326,7 +562,7 @@ class LikeViewSet(ViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class TagViewSet(ViewSet):
+class TagViewSet(ReplicaReadMixin, ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = TagSerializer
 
@@ -345,11 +581,26 @@ class TagViewSet(ViewSet):
             queryset = self.get_queryset().filter(name__icontains=search_query)
         else:
             queryset = self.get_queryset()
+
+        if request.query_params.get("ordering") == "popular":
+            queryset = queryset.order_by("-posts_count", "name")
+        else:
+            queryset = queryset.order_by("name")
             
         instance = paginator.paginate_queryset(queryset, request)
         serializer = TagSerializer(instance=instance, many=True, context={"request": request})
         return paginator.get_paginated_response(serializer.data)
 
+    @action(methods=["get"], detail=False)
+    def autocomplete(self, request: Request) -> Response:
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 25)
+        except ValueError:
+            return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = autocomplete_tags(request.query_params.get("q", ""), limit)
+        return Response(results, status=status.HTTP_200_OK)
+
     def create(self, request: Request) -> Response:
         serializer = TagCreateSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
@@ -382,3 +633,147 @@ class TagViewSet(ViewSet):
         instance = get_object_or_404(self.get_queryset(), pk=pk)
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=["post"], detail=True)
+    def follow(self, request: Request, pk=None) -> Response:
+        """Follow the tag, its posts then appear in the feed of the user."""
+        instance = get_object_or_404(self.get_queryset(), pk=pk)
+        created = follow_tag(request.user, instance)
+        return Response({"following": True}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @follow.mapping.delete
+    def unfollow(self, request: Request, pk=None) -> Response:
+        instance = get_object_or_404(self.get_queryset(), pk=pk)
+        unfollow_tag(request.user, instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SyncViewSet(ViewSet):
+    # Read from the primary: a lagging replica would let the token move past changes it has not
+    # replayed yet, and serve stale objects for the changes it has.
+    permission_classes = [IsAuthenticated]
+
+    @action(methods=["get"], detail=False)
+    def changes(self, request: Request) -> Response:
+        """Posts, comments, likes and tags written or deleted since the sync token, see apps.posts.changes.
+
+        Without a token, returns the token to start from once everything was downloaded.
+        """
+        try:
+            limit = min(int(request.query_params.get("limit", SYNC_PAGE_SIZE)), SYNC_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        token = request.query_params.get("token")
+        if not token:
+            return Response({"token": make_token(head()), "has_more": False, "changes": []}, status=status.HTTP_200_OK)
+        try:
+            position = read_token(token)
+        except ExpiredToken:
+            return Response(
+                {"token": "Expired, download everything again and sync without a token."},
+                status=status.HTTP_410_GONE,
+            )
+        except BadSignature:
+            return Response({"token": "Invalid sync token."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, cursor, has_more = changes_since(position, limit)
+        return Response(
+            {"token": make_token(cursor), "has_more": has_more, "changes": self.serialize_changes(rows, request)},
+            status=status.HTTP_200_OK,
+        )
+
+    def serialize_changes(self, rows, request: Request) -> list[dict]:
+        """Serialize the current state of the written objects, with one query or fragment lookup per kind."""
+        context = {"request": request}
+        written = {}
+        for row in rows:
+            if not row.deleted:
+                written.setdefault(row.kind, []).append(row.object_id)
+
+        current = {}
+        if ChangeKind.POST.value in written:
+            posts = serialize_posts(written[ChangeKind.POST.value], request, PostSerializer)
+            current.update(((ChangeKind.POST.value, post_id), data) for post_id, data in posts.items())
+        for kind, queryset, serializer_class in (
+            (
+                ChangeKind.COMMENT,
+                Comment.objects.select_related("user").annotate(replies_count=replies_count_subquery()),
+                CommentSerializer,
+            ),
+            (ChangeKind.LIKE, Like.objects.select_related("user", "post"), LikeSerializer),
+            (ChangeKind.TAG, Tag.objects.all(), TagSerializer),
+        ):
+            if kind.value in written:
+                objects = list(queryset.filter(pk__in=written[kind.value]))
+                data = serializer_class(objects, many=True, context=context).data
+                current.update(((kind.value, obj.pk), item) for obj, item in zip(objects, data))
+
+        results = []
+        for row in rows:
+            data = current.get((row.kind, row.object_id))
+            results.append(
+                {
+                    "seq": row.seq,
+                    "kind": row.kind,
+                    "id": str(row.object_id),
+                    # Written, then deleted by a change further down the log.
+                    "deleted": data is None,
+                    "data": data,
+                }
+            )
+        return results
+
+
+def authenticate_stream(request):
+    """Return the user of a plain Django request, authenticated like the API views."""
+    try:
+        result = CustomJWTAuthentication().authenticate(Request(request))
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+async def post_events(request):
+    """Stream the like and comment counts of ?posts=<id>,<id> as server-sent events.
+
+    A `counts` event is sent for every post on connect, then whenever its counts change. The
+    stream never ends, so the view must be served by an ASGI server (`make run-asgi`); under WSGI
+    Django reads the whole response before sending any of it.
+    """
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    values = [value for param in request.GET.getlist("posts") for value in param.split(",") if value]
+    try:
+        post_ids = list(dict.fromkeys(UUID(value) for value in values))
+    except ValueError:
+        return JsonResponse({"posts": "Must be a list of post ids."}, status=400)
+    if not post_ids or len(post_ids) > get_live_setting("MAX_CHANNELS"):
+        return JsonResponse(
+            {"posts": f"Between 1 and {get_live_setting('MAX_CHANNELS')} posts can be followed at once."},
+            status=400,
+        )
+
+    async def stream():
+        # Subscribed before the snapshot is read, so no change falls in between.
+        subscription = hub.subscribe([channel(post_id) for post_id in post_ids])
+        try:
+            yield "retry: 5000\n\n"
+            for data in (await sync_to_async(get_counts)(post_ids)).values():
+                yield format_event(COUNTS_EVENT, data)
+            while True:
+                pending = await subscription.get(get_live_setting("HEARTBEAT_INTERVAL"))
+                if not pending:
+                    yield ": heartbeat\n\n"
+                for data in pending.values():
+                    yield format_event(COUNTS_EVENT, data)
+        finally:
+            hub.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.posts"
+
+    def ready(self):
+        import apps.posts.signals  # noqa
+        from core.images import register_image_variants
+
+        from .models import Post
+
+        register_image_variants(Post, "featured_image", "featured_image_variants")
@@ -0,0 +1,153 @@
+"""Hot/cold split of archived posts.
+
+`move_archived_posts()` moves archived posts, with their comments, likes and view counts, from
+the live tables into the `Archived*` tables, one post per transaction. `restore_post()` moves one
+back as a draft, which the post API does when an archived post is set back to draft. Archived
+posts no longer count towards `Tag.posts_count` while they are cold.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications.counters import recounting
+from apps.notifications.models import Notification
+
+from . import changes, tag_counts
+from .cache import bump_post_version
+from .models import (
+    ArchivedComment,
+    ArchivedLike,
+    ArchivedPost,
+    ChangeKind,
+    Comment,
+    Like,
+    Post,
+    PostViews,
+    Status,
+    Tag,
+)
+
+# Post columns copied as they are, both ways.
+POST_FIELDS = [
+    "id",
+    "user_id",
+    "title",
+    "content",
+    "excerpt",
+    "word_count",
+    "reading_time",
+    "content_html",
+    "featured_image_variants",
+    "created_at",
+    "updated_at",
+    "likes",
+]
+
+
+def archive_post(post_id) -> bool:
+    """Move the archived post `post_id` to cold storage and return whether it was moved."""
+    with transaction.atomic():
+        post = Post.objects.select_for_update().filter(pk=post_id, status=Status.ARCHIVED.value).first()
+        if post is None:
+            return False
+
+        views = PostViews.objects.filter(post_id=post_id).first()
+        tag_ids = tag_counts.tag_ids_of(post)
+        ArchivedPost.objects.create(
+            **{field: getattr(post, field) for field in POST_FIELDS},
+            featured_image=post.featured_image.name or "",
+            tag_ids=[str(tag_id) for tag_id in tag_ids],
+            total_views=views.total_views if views else 0,
+            unique_views=views.unique_views if views else 0,
+            views_sketch=bytes(views.sketch) if views else b"",
+        )
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**values)
+            for values in Comment.objects.filter(post_id=post_id).values(
+                "id", "post_id", "user_id", "parent_id", "content", "created_at", "updated_at"
+            )
+        )
+        ArchivedLike.objects.bulk_create(
+            ArchivedLike(**values)
+            for values in Like.objects.filter(post_id=post_id).values("id", "post_id", "user_id", "created_at")
+        )
+
+        # The cascade removes the comments, likes, views, tag links and notifications.
+        with tag_counts.suspended(), recounting(Notification.objects.filter(post_id=post_id)):
+            post.delete()
+        tag_counts.recount(tag_ids)
+    return True
+
+
+def move_archived_posts(min_age: timedelta = None, limit: int = None) -> int:
+    """Move archived posts, optionally only those untouched for `min_age`, and return how many moved."""
+    queryset = Post.objects.filter(status=Status.ARCHIVED.value)
+    if min_age is not None:
+        # Post.created_at is stamped on every save.
+        queryset = queryset.filter(created_at__lte=timezone.now() - min_age)
+    post_ids = list(queryset.order_by().values_list("pk", flat=True)[:limit])
+    return sum(archive_post(post_id) for post_id in post_ids)
+
+
+def restore_post(post_id, status: str = Status.DRAFT.value) -> Post | None:
+    """Move the cold post `post_id` back to the live tables with `status` and return it."""
+    with transaction.atomic():
+        archived = ArchivedPost.objects.select_for_update().filter(pk=post_id).first()
+        if archived is None:
+            return None
+
+        post = Post(**{field: getattr(archived, field) for field in POST_FIELDS}, status=status)
+        post.featured_image.name = archived.featured_image or None
+        post.save(force_insert=True)
+        post.tags.set(Tag.objects.filter(pk__in=archived.tag_ids))
+
+        comment_rows = list(
+            archived.comments.values("id", "post_id", "user_id", "parent_id", "content", "created_at", "updated_at")
+        )
+        like_rows = list(archived.archived_likes.values("id", "post_id", "user_id", "created_at"))
+        comments = Comment.objects.bulk_create(Comment(**row) for row in comment_rows)
+        likes = Like.objects.bulk_create(Like(**row) for row in like_rows)
+
+        # Creating rows stamps them with the current time, put the original timestamps back.
+        Post.objects.filter(pk=post.pk).update(created_at=archived.created_at, updated_at=archived.updated_at)
+        for comment, row in zip(comments, comment_rows):
+            comment.created_at, comment.updated_at = row["created_at"], row["updated_at"]
+        Comment.objects.bulk_update(comments, ["created_at", "updated_at"])
+        changes.record_changes(ChangeKind.COMMENT, [comment.pk for comment in comments])
+        for like, row in zip(likes, like_rows):
+            like.created_at = row["created_at"]
+        Like.objects.bulk_update(likes, ["created_at"])
+        changes.record_changes(ChangeKind.LIKE, [like.pk for like in likes])
+        if archived.total_views:
+            PostViews.objects.create(
+                post=post,
+                total_views=archived.total_views,
+                unique_views=archived.unique_views,
+                sketch=bytes(archived.views_sketch),
+            )
+
+        archived.delete()
+    # Comments and likes were bulk created after the post was saved.
+    bump_post_version(post.pk)
+    post.refresh_from_db()
+    return post
+
+
+def get_archived_post(post_id, user=None) -> Post | None:
+    """Return the cold post `post_id` as an unsaved `Post`, annotated like `with_listing_data()`."""
+    archived = ArchivedPost.objects.select_related("user").filter(pk=post_id).first()
+    if archived is None:
+        return None
+
+    post = Post(**{field: getattr(archived, field) for field in POST_FIELDS}, status=Status.ARCHIVED.value)
+    post.user = archived.user
+    post.featured_image.name = archived.featured_image or None
+    post.comments_count = archived.comments.count()
+    post.likes_count = archived.archived_likes.count()
+    post.views_count = archived.total_views
+    post.unique_views_count = archived.unique_views
+    post.is_liked = bool(user and user.is_authenticated and archived.archived_likes.filter(user=user).exists())
+    post._prefetched_objects_cache = {"tags": Tag.objects.filter(pk__in=archived.tag_ids)}
+    return post
@@ -0,0 +1,118 @@
+"""Tag autocomplete for the editor's tag picker.
+
+On PostgreSQL candidates come from the trigram GIN index on UPPER(name) and are ranked by
+similarity. Other databases are served from an in-process prefix trie over every word of every
+tag name, rebuilt from `Tag` when tags change or the trie gets older than `TRIE_MAX_AGE`.
+"""
+
+import threading
+import time
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connections
+
+from .models import Tag
+
+TRIE_MAX_AGE = 60
+# Candidates kept on every trie node, the most used tags first.
+TRIE_NODE_CANDIDATES = 50
+# Short prefixes are what most keystrokes send, their results are cached for everyone.
+CACHED_PREFIX_LENGTH = 3
+CACHE_TIMEOUT = 30
+
+FIELDS = ("id", "name", "slug", "posts_count")
+
+
+class TagTrie:
+    """Prefix trie over tag names keeping the most used tags under every node."""
+
+    def __init__(self, tags):
+        self.tags = tags
+        self.root = {}
+        self.built_at = time.monotonic()
+
+        # Insert the most used tags first so every node's candidates stay sorted.
+        order = sorted(range(len(tags)), key=lambda index: (-tags[index]["posts_count"], tags[index]["name"]))
+        for index in order:
+            name = tags[index]["name"].lower()
+            words = name.split()
+            # The whole name and every later word, so "learn" finds "Machine Learning".
+            keys = {name} | {" ".join(words[start:]) for start in range(1, len(words))}
+            for key in keys:
+                self._insert(key, index)
+
+    def _insert(self, key, index):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            candidates = node.setdefault("", [])
+            if len(candidates) < TRIE_NODE_CANDIDATES and index not in candidates:
+                candidates.append(index)
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        prefix = prefix.lower()
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        def rank(index):
+            name = self.tags[index]["name"].lower()
+            # Exact matches first, then names starting with the prefix, then later words.
+            similarity = 2 if name == prefix else 1 if name.startswith(prefix) else 0
+            return (-similarity, -self.tags[index]["posts_count"], name)
+
+        return [self.tags[index] for index in sorted(node.get("", []), key=rank)[:limit]]
+
+
+_trie = None
+_trie_lock = threading.Lock()
+
+
+def get_trie() -> TagTrie:
+    global _trie
+    trie = _trie
+    if trie is None or time.monotonic() - trie.built_at > TRIE_MAX_AGE:
+        with _trie_lock:
+            if _trie is trie:
+                _trie = TagTrie(list(Tag.objects.values(*FIELDS)))
+            trie = _trie
+    return trie
+
+
+def invalidate_trie() -> None:
+    global _trie
+    _trie = None
+
+
+def search_database(query: str, limit: int) -> list[dict]:
+    queryset = (
+        Tag.objects.filter(name__icontains=query)
+        .annotate(similarity=TrigramSimilarity("name", query))
+        .order_by("-similarity", "-posts_count", "name")
+    )
+    return list(queryset.values(*FIELDS)[:limit])
+
+
+def autocomplete(query: str, limit: int = 10) -> list[dict]:
+    """Return up to `limit` tags matching `query`, best matches first."""
+    query = query.strip()
+    if not query:
+        return []
+
+    cache_key = f"tags:autocomplete:{limit}:{query.lower()}" if len(query) <= CACHED_PREFIX_LENGTH else None
+    if cache_key:
+        results = cache.get(cache_key)
+        if results is not None:
+            return results
+
+    if connections[Tag.objects.all().db].vendor == "postgresql":
+        results = search_database(query, limit)
+    else:
+        results = get_trie().search(query, limit)
+
+    if cache_key:
+        cache.set(cache_key, results, CACHE_TIMEOUT)
+    return results
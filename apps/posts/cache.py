@@ -0,0 +1,64 @@
+"""Versioned caching of per-post payloads.
+
+Every post has a version in the cache, replaced whenever the post, its tags, its comments, its
+likes or its view counts change. Payloads are cached under the version they were built from, so
+a change makes every cached payload of the post unreachable at once, without knowing their keys.
+Versions are replaced once the change commits, and payloads are built from the primary, so no
+payload read before a change is cached under the version replacing it.
+"""
+
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+PAGE_CACHE_TIMEOUT = 5 * 60
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+# An expired version is replaced by a newer one, which only costs a rebuild of the payloads.
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def version_key(post_id) -> str:
+    return f"post:version:{post_id}"
+
+
+def get_post_versions(post_ids) -> dict:
+    """Return the current version of every post in `post_ids`."""
+    keys = {post_id: version_key(post_id) for post_id in post_ids}
+    stored = cache.get_many(keys.values())
+    missing = [key for key in keys.values() if key not in stored]
+    if missing:
+        # add() never replaces a version bumped meanwhile, which fresh payloads would then hide.
+        for key in missing:
+            cache.add(key, time.time_ns(), VERSION_TIMEOUT)
+        stored.update(cache.get_many(missing))
+    return {post_id: stored.get(key, 0) for post_id, key in keys.items()}
+
+
+def get_post_version(post_id) -> int:
+    return get_post_versions([post_id])[post_id]
+
+
+def set_post_versions(post_ids) -> None:
+    version = time.time_ns()
+    cache.set_many({version_key(post_id): version for post_id in post_ids}, VERSION_TIMEOUT)
+
+
+def bump_post_versions(post_ids) -> None:
+    """Replace the versions of `post_ids` once the current transaction commits."""
+    post_ids = list(post_ids)
+    if post_ids:
+        transaction.on_commit(partial(set_post_versions, post_ids))
+
+
+def bump_post_version(post_id) -> None:
+    bump_post_versions([post_id])
+
+
+def post_page_key(post_id, version: int, page_size: int) -> str:
+    return f"post:page:{post_id}:{version}:{page_size}"
+
+
+def post_fragment_key(post_id, version: int, kind: str) -> str:
+    return f"post:fragment:{kind}:{post_id}:{version}"
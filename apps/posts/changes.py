@@ -0,0 +1,100 @@
+"""Delta sync of posts, comments, likes and tags.
+
+Every write or deletion appends a row to the `Change` log, from signals or from the bulk paths
+that bypass them. Clients keep a signed sync token holding the last sequence number they saw and
+ask for the changes after it, so a sync reads the log by its primary key and costs what changed
+since, whatever the size of the tables. Counters updated in place, such as the post counts of
+tags, are not logged.
+
+Sequence numbers are allocated when rows are inserted but become visible when their transaction
+commits, in whatever order transactions commit. On PostgreSQL every row also records the id of
+its transaction, the log is read in (transaction id, sequence) order and rows of transactions at
+or above the xmin of the current snapshot, which may still be running, are held back: once a
+transaction id is below it, that transaction wrote every row it ever will. SQLite runs one write
+transaction at a time, so rows are committed in sequence order there. The log is always read from
+the primary, a replica may not have replayed the rows of committed transactions yet.
+"""
+
+from datetime import timedelta
+
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .models import Change, ChangeKind
+
+SIGNING_SALT = "posts.changes"
+# Tokens older than this are refused, clients then download everything again.
+TOKEN_MAX_AGE = timedelta(days=30)
+# Changes are pruned once every token that could ask for them has expired.
+RETENTION = TOKEN_MAX_AGE + timedelta(days=1)
+
+
+class ExpiredToken(Exception):
+    pass
+
+
+def record_changes(kind: ChangeKind, object_ids, deleted: bool = False) -> None:
+    Change.objects.bulk_create(
+        [Change(kind=kind.value, object_id=object_id, deleted=deleted) for object_id in object_ids]
+    )
+
+
+def record_change(kind: ChangeKind, object_id, deleted: bool = False) -> None:
+    record_changes(kind, [object_id], deleted)
+
+
+def make_token(position: tuple[int, int]) -> str:
+    xid, seq = position
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign_object({"xid": xid, "seq": seq})
+
+
+def read_token(token: str) -> tuple[int, int]:
+    """Return the log position of `token`, raising `ExpiredToken` or `signing.BadSignature`."""
+    try:
+        data = signing.TimestampSigner(salt=SIGNING_SALT).unsign_object(token, max_age=TOKEN_MAX_AGE)
+    except signing.SignatureExpired as exc:
+        raise ExpiredToken from exc
+    return data["xid"], data["seq"]
+
+
+def committed_changes():
+    """Changes of the transactions that can no longer add rows to the log, read from the primary."""
+    queryset = Change.objects.using(DEFAULT_DB_ALIAS)
+    if connections[DEFAULT_DB_ALIAS].vendor != "postgresql":
+        return queryset
+    return queryset.filter(xid__lt=RawSQL("pg_snapshot_xmin(pg_current_snapshot())::text::bigint", []))
+
+
+def head() -> tuple[int, int]:
+    """Return the log position clients start from after downloading everything."""
+    last = committed_changes().order_by("-xid", "-seq").values_list("xid", "seq").first()
+    return last or (0, 0)
+
+
+def changes_since(position: tuple[int, int], limit: int) -> tuple[list[Change], tuple[int, int], bool]:
+    """Return the latest change of every object changed after `position`, the new position and whether more remain.
+
+    The log is read `limit` rows at a time, an object changed several times within them is
+    returned once.
+    """
+    xid, seq = position
+    after = committed_changes().filter(Q(xid__gt=xid) | Q(xid=xid, seq__gt=seq))
+    rows = list(after.order_by("xid", "seq")[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest = {}
+    for row in rows:
+        latest.pop((row.kind, row.object_id), None)
+        latest[(row.kind, row.object_id)] = row
+    return list(latest.values()), (rows[-1].xid, rows[-1].seq) if rows else position, has_more
+
+
+def prune_changes(now=None) -> int:
+    """Delete the changes no valid token can still ask for and return how many there were."""
+    cutoff = (now or timezone.now()) - RETENTION
+    deleted, _ = Change.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
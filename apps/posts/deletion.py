@@ -0,0 +1,98 @@
+"""Background deletion of accounts and posts.
+
+Deleting a user or a post in one statement cascades through every comment, like and tag link in
+a single long transaction. Instead the row is marked as deleting, which hides it from the default
+managers, and its comments and likes from `visible()`, right away. A job then removes its dependent
+rows in batches of `BATCH_SIZE`, each in a short transaction of its own. Counters the cascade would
+leave stale are recounted in aggregate.
+Jobs are idempotent, so a retried job carries on where the last attempt stopped.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.jobs.queue import enqueue, set_progress
+from apps.jobs.registry import task
+from apps.notifications.counters import recounting
+from apps.notifications.models import Notification
+
+from . import changes, moderation, tag_counts
+from .cache import bump_post_version, bump_post_versions
+from .models import ChangeKind, Comment, Like, Post
+
+BATCH_SIZE = 500
+QUEUE = "deletions"
+
+DELETE_POST_TASK = "posts.delete_post"
+DELETE_USER_TASK = "posts.delete_user"
+
+
+def schedule_post_deletion(post: Post):
+    """Hide `post` and queue the deletion of its rows."""
+    with transaction.atomic():
+        Post._base_manager.filter(pk=post.pk).update(deleting_at=timezone.now())
+        changes.record_change(ChangeKind.POST, post.pk, deleted=True)
+        job = enqueue(DELETE_POST_TASK, {"post_id": str(post.pk)}, queue=QUEUE)
+    bump_post_version(post.pk)
+    return job
+
+
+def schedule_user_deletion(user: User):
+    """Deactivate and hide `user` and their posts, and queue the deletion of their rows."""
+    now = timezone.now()
+    with transaction.atomic():
+        User._base_manager.filter(pk=user.pk).update(deleting_at=now, is_active=False)
+        posts = Post._base_manager.filter(user_id=user.pk, deleting_at__isnull=True)
+        post_ids = list(posts.values_list("pk", flat=True))
+        posts.update(deleting_at=now)
+        changes.record_changes(ChangeKind.POST, post_ids, deleted=True)
+        job = enqueue(DELETE_USER_TASK, {"user_id": str(user.pk)}, queue=QUEUE)
+    bump_post_versions(post_ids)
+    return job
+
+
+def delete_post_rows(post_id, progress: dict) -> None:
+    progress["likes"] += moderation.delete_likes(Like.objects.filter(post_id=post_id), BATCH_SIZE)
+    set_progress(**progress)
+    progress["comments"] += moderation.delete_comments(Comment.objects.filter(post_id=post_id), BATCH_SIZE)
+    set_progress(**progress)
+
+    with transaction.atomic(), tag_counts.suspended(), recounting(Notification.objects.filter(post_id=post_id)):
+        tag_ids = moderation.tag_ids_of_posts([post_id])
+        progress["posts"] += Post._base_manager.filter(pk=post_id).delete()[1].get(Post._meta.label, 0)
+        tag_counts.recount(tag_ids)
+    set_progress(**progress)
+
+
+@task(DELETE_POST_TASK)
+def delete_post(post_id) -> dict:
+    progress = {"posts": 0, "comments": 0, "likes": 0}
+    if Post._base_manager.filter(pk=post_id, deleting_at__isnull=False).exists():
+        delete_post_rows(post_id, progress)
+    set_progress(**progress, done=True)
+    return progress
+
+
+@task(DELETE_USER_TASK)
+def delete_user(user_id) -> dict:
+    progress = {"posts": 0, "comments": 0, "likes": 0}
+    if not User._base_manager.filter(pk=user_id, deleting_at__isnull=False).exists():
+        set_progress(**progress, done=True)
+        return progress
+
+    post_ids = list(Post._base_manager.filter(user_id=user_id).values_list("pk", flat=True))
+    progress["posts_total"] = len(post_ids)
+    for post_id in post_ids:
+        delete_post_rows(post_id, progress)
+
+    # Unlike the cascade, this recounts the likes of the posts the user liked.
+    progress["likes"] += moderation.delete_likes(Like.objects.filter(user_id=user_id), BATCH_SIZE)
+    set_progress(**progress)
+    progress["comments"] += moderation.delete_comments(Comment.objects.filter(user_id=user_id), BATCH_SIZE)
+    set_progress(**progress)
+
+    with transaction.atomic(), recounting(Notification.objects.filter(actor_id=user_id)):
+        User._base_manager.filter(pk=user_id).delete()
+    set_progress(**progress, done=True)
+    return progress
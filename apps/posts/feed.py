@@ -0,0 +1,198 @@
+"""Home feeds of the posts tagged with the tags users follow.
+
+Feeds are precomputed: when a post is published, or a published post is tagged, a job copies it
+into a `TimelineEntry` of every follower of its tags, `BATCH_SIZE` followers per query, and trims
+their timelines back to the newest `TIMELINE_CAP` posts. Entries are keyed by the time the post
+was published, so a post published today tops the feed however long ago it was drafted. A feed
+page is then a single range scan of the (user, published_at, post) index, however many tags the
+user follows.
+
+Tags followed by `POPULAR_TAG_FOLLOWERS` users or more are left out of the fan-out, which would
+write a row per follower for every post. Their posts are read at request time instead and merged
+into the page, with one more query on the posts of those tags.
+
+Pages are keyset paginated: the cursor holds the (published_at, post id) of the last post of the
+page and the next page starts strictly after it, so pages cost the same however deep they are
+and do not shift as new posts arrive.
+"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Window
+from django.db.models.functions import RowNumber
+
+from apps.jobs.queue import enqueue
+from apps.jobs.registry import task
+
+from .models import Post, Status, Tag, TagFollow, TimelineEntry
+from .tag_counts import PostTag
+
+DEFAULTS = {
+    # Posts kept in every timeline, older ones are trimmed as new ones arrive.
+    "TIMELINE_CAP": 800,
+    # Tags with this many followers are merged into feeds when read instead of fanned out.
+    "POPULAR_TAG_FOLLOWERS": 10_000,
+    # Followers written to per query.
+    "BATCH_SIZE": 500,
+    "QUEUE": "feeds",
+}
+
+CURSOR_SALT = "posts.feed"
+
+FAN_OUT_POST_TASK = "posts.fan_out_post"
+BACKFILL_TIMELINE_TASK = "posts.backfill_timeline"
+
+
+def get_setting(name):
+    return getattr(settings, "FEED", {}).get(name, DEFAULTS[name])
+
+
+def popular() -> Q:
+    """Condition on follows of the tags merged into feeds when read."""
+    return Q(tag__followers_count__gte=get_setting("POPULAR_TAG_FOLLOWERS"))
+
+
+def follow_tag(user, tag: Tag) -> bool:
+    """Make `user` follow `tag` and queue filling their timeline with its posts. Return whether it was new."""
+    with transaction.atomic():
+        _, created = TagFollow.objects.get_or_create(user=user, tag=tag)
+        if created:
+            Tag.objects.filter(pk=tag.pk).update(followers_count=F("followers_count") + 1)
+            payload = {"user_id": str(user.pk), "tag_id": str(tag.pk)}
+            enqueue(BACKFILL_TIMELINE_TASK, payload, queue=get_setting("QUEUE"))
+    return created
+
+
+def unfollow_tag(user, tag: Tag) -> bool:
+    """Make `user` stop following `tag` and drop its posts from their timeline. Return whether they followed it."""
+    with transaction.atomic():
+        deleted, _ = TagFollow.objects.filter(user=user, tag=tag).delete()
+        if not deleted:
+            return False
+        Tag.objects.filter(pk=tag.pk).update(followers_count=F("followers_count") - 1)
+        # Posts also tagged with another followed tag stay.
+        still_followed = PostTag.objects.filter(tag__follows__user=user).values("post_id")
+        TimelineEntry.objects.filter(user=user, post_id__in=PostTag.objects.filter(tag=tag).values("post_id")).exclude(
+            post_id__in=still_followed
+        ).delete()
+    return True
+
+
+def schedule_fan_out(post_ids) -> None:
+    for post_id in post_ids:
+        enqueue(FAN_OUT_POST_TASK, {"post_id": str(post_id)}, queue=get_setting("QUEUE"))
+
+
+def remove_posts(post_ids) -> None:
+    """Drop `post_ids`, no longer published, from every timeline."""
+    TimelineEntry.objects.filter(post_id__in=post_ids).delete()
+
+
+def remove_untagged(post_ids, tag_ids) -> None:
+    """Drop `post_ids`, just untagged from `tag_ids`, from the timelines of the followers of those tags.
+
+    Posts stay in the timelines of users who follow another of the tags they still have.
+    """
+    still_followed = PostTag.objects.filter(post_id=OuterRef("post_id"), tag__follows__user_id=OuterRef("user_id"))
+    TimelineEntry.objects.filter(
+        post_id__in=post_ids, user_id__in=TagFollow.objects.filter(tag_id__in=tag_ids).values("user_id")
+    ).exclude(Exists(still_followed)).delete()
+
+
+def trim_timelines(user_ids) -> int:
+    """Delete the entries of the timelines of `user_ids` past the newest `TIMELINE_CAP` and return how many."""
+    ranked = TimelineEntry.objects.filter(user_id__in=user_ids).annotate(
+        rank=Window(RowNumber(), partition_by=F("user_id"), order_by=[F("published_at").desc(), F("post_id").desc()])
+    )
+    overflow = list(ranked.filter(rank__gt=get_setting("TIMELINE_CAP")).values_list("pk", flat=True))
+    if not overflow:
+        return 0
+    return TimelineEntry.objects.filter(pk__in=overflow).delete()[0]
+
+
+@task(FAN_OUT_POST_TASK)
+def fan_out_post(post_id) -> int:
+    """Copy a published post into the timelines of the followers of its tags and return how many."""
+    post = Post.objects.filter(pk=post_id, status=Status.PUBLISHED.value).values("pk", "published_at").first()
+    if post is None:
+        return 0
+
+    follows = TagFollow.objects.filter(tag_id__in=PostTag.objects.filter(post_id=post_id).values("tag_id"))
+    follower_ids = follows.exclude(popular()).order_by("user_id").values_list("user_id", flat=True).distinct()
+
+    written, last_user_id = 0, None
+    while True:
+        batch = follower_ids if last_user_id is None else follower_ids.filter(user_id__gt=last_user_id)
+        user_ids = list(batch[: get_setting("BATCH_SIZE")])
+        if not user_ids:
+            return written
+        with transaction.atomic():
+            entries = [
+                TimelineEntry(user_id=user_id, post_id=post["pk"], published_at=post["published_at"])
+                for user_id in user_ids
+            ]
+            TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            trim_timelines(user_ids)
+        written += len(user_ids)
+        last_user_id = user_ids[-1]
+
+
+@task(BACKFILL_TIMELINE_TASK)
+def backfill_timeline(user_id, tag_id) -> int:
+    """Copy the newest published posts of a tag just followed into the timeline of the user."""
+    if not TagFollow.objects.filter(user_id=user_id, tag_id=tag_id).exclude(popular()).exists():
+        return 0
+    posts = (
+        Post.objects.filter(status=Status.PUBLISHED.value)
+        .with_tags([tag_id])
+        .order_by("-published_at", "-pk")
+        .values_list("pk", "published_at")[: get_setting("TIMELINE_CAP")]
+    )
+    with transaction.atomic():
+        entries = [
+            TimelineEntry(user_id=user_id, post_id=post_id, published_at=published_at)
+            for post_id, published_at in posts
+        ]
+        TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        trim_timelines([user_id])
+    return len(entries)
+
+
+def make_cursor(published_at: datetime, post_id) -> str:
+    return signing.dumps({"at": published_at.isoformat(), "id": str(post_id)}, salt=CURSOR_SALT, compress=True)
+
+
+def read_cursor(cursor: str) -> tuple[datetime, str]:
+    """Return the position of `cursor`, raising `signing.BadSignature` for forged ones."""
+    data = signing.loads(cursor, salt=CURSOR_SALT)
+    return datetime.fromisoformat(data["at"]), data["id"]
+
+
+def feed_page(user, size: int, cursor: str = None) -> tuple[list, str | None]:
+    """Return the ids of the next `size` posts of the feed of `user` after `cursor`, and the cursor after them."""
+    after = Q()
+    if cursor:
+        published_at, post_id = read_cursor(cursor)
+        after = Q(published_at__lt=published_at) | Q(published_at=published_at, post_id__lt=post_id)
+
+    entries = (
+        TimelineEntry.objects.filter(after, user=user)
+        .order_by("-published_at", "-post_id")
+        .values_list("published_at", "post_id")[: size + 1]
+    )
+    rows = set(entries)
+
+    popular_tag_ids = list(TagFollow.objects.filter(popular(), user=user).values_list("tag_id", flat=True))
+    if popular_tag_ids:
+        posts = Post.objects.filter(status=Status.PUBLISHED.value).with_tags(popular_tag_ids)
+        if cursor:
+            posts = posts.filter(Q(published_at__lt=published_at) | Q(published_at=published_at, pk__lt=post_id))
+        rows.update(posts.order_by("-published_at", "-pk").values_list("published_at", "pk")[: size + 1])
+
+    rows = sorted(rows, reverse=True)
+    page = rows[:size]
+    next_cursor = make_cursor(*page[-1]) if len(rows) > size else None
+    return [post_id for _, post_id in page], next_cursor
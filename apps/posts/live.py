@@ -0,0 +1,75 @@
+"""Live like and comment counts of posts, streamed as server-sent events.
+
+Likes and comments mark their post changed once their transaction commits. Every
+`COALESCE_INTERVAL` a background thread counts the likes and comments of all the posts marked
+since, in one query, and publishes a single batch to the broker, see core.pubsub. A post liked a
+hundred times in a second is therefore counted and sent once.
+"""
+
+import logging
+import threading
+
+from django.db import connections
+
+from core.pubsub import get_broker, get_setting
+
+logger = logging.getLogger(__name__)
+
+COUNTS_EVENT = "counts"
+
+
+def channel(post_id) -> str:
+    return f"post:{post_id}"
+
+
+def get_counts(post_ids) -> dict:
+    """Return the like and comment counts of the posts of `post_ids` that exist, by post id."""
+    from .models import Post
+
+    rows = Post.objects.filter(pk__in=post_ids).with_counts().values("pk", "likes_count", "comments_count")
+    return {
+        row["pk"]: {"post": str(row["pk"]), "likes_count": row["likes_count"], "comments_count": row["comments_count"]}
+        for row in rows
+    }
+
+
+class CountsPublisher:
+    """Gathers the posts whose counts changed and publishes them in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._timer = None
+
+    def mark(self, post_id) -> None:
+        with self._lock:
+            self._changed.add(post_id)
+            if self._timer is None:
+                self._timer = threading.Timer(get_setting("COALESCE_INTERVAL"), self._publish_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _publish_in_thread(self) -> None:
+        try:
+            self.publish()
+        except Exception:
+            logger.exception("Could not publish live counts")
+        finally:
+            # The connections this thread opened.
+            connections.close_all()
+
+    def publish(self) -> int:
+        """Publish the counts of the posts marked so far and return how many were sent."""
+        with self._lock:
+            post_ids, self._changed = self._changed, set()
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+        if not post_ids:
+            return 0
+        counts = get_counts(post_ids)
+        get_broker().publish([{"channel": channel(post_id), "data": data} for post_id, data in counts.items()])
+        return len(counts)
+
+
+publisher = CountsPublisher()
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.posts.cache import bump_post_version
+from apps.posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Compares loading a post page through the separate endpoints against the composite page endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--post", help="Id of the post to load, the most commented one by default")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=10)
+
+    def handle(self, *args, **options):
+        post = Post.objects.filter(pk=options["post"]).first() if options["post"] else self.most_commented_post()
+        if post is None:
+            raise CommandError("No post to load, seed the database first.")
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.first())
+        page_size = options["page_size"]
+
+        def separate_calls():
+            # What a client does today: the post, the root comments, the replies of each, the likes.
+            client.get(reverse("post-detail", args=[post.pk]))
+            comments = client.get(reverse("comment-list"), {"post": post.pk, "page_size": page_size}).json()
+            requests = 2
+            for comment in comments["results"]:
+                if comment["replies_count"]:
+                    client.get(reverse("comment-replies", args=[comment["id"]]), {"page_size": 3})
+                    requests += 1
+            client.get(reverse("like-list"), {"post": post.pk, "page_size": 1})
+            return requests + 1
+
+        def page_call():
+            client.get(reverse("post-page", args=[post.pk]), {"page_size": page_size})
+            return 1
+
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for label, flow, cached in (
+                ("Separate endpoints", separate_calls, False),
+                ("Page endpoint, cold", page_call, False),
+                ("Page endpoint, warm", page_call, True),
+            ):
+                self.report(label, post, flow, cached, options["iterations"])
+
+    def most_commented_post(self):
+        return Post.objects.with_listing_data().order_by("-comments_count").first()
+
+    def report(self, label, post, flow, cached, iterations):
+        timings = []
+        for _ in range(iterations):
+            if cached:
+                flow()
+            else:
+                # Makes the cached page unreachable without clearing the rest of the cache.
+                bump_post_version(post.pk)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                requests = flow()
+                timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{label:<22} {requests:>3} requests {len(queries):>4} queries "
+            f"{statistics.median(timings):8.2f} ms (median of {iterations})"
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.view_counts import persist_views
+
+
+class Command(BaseCommand):
+    help = "Persists the post views buffered in the cache to the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = persist_views(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Persisted views of {count} posts"))
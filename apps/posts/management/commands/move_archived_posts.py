@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.posts.archive import move_archived_posts
+
+
+class Command(BaseCommand):
+    help = "Moves archived posts with their comments and likes out of the live tables into cold storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-age-days", type=int, default=0, help="Only move posts at least this old")
+        parser.add_argument("--limit", type=int, default=None, help="Move at most this many posts")
+
+    def handle(self, *args, **options):
+        min_age = timedelta(days=options["min_age_days"]) if options["min_age_days"] else None
+        moved = move_archived_posts(min_age=min_age, limit=options["limit"])
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} archived posts to cold storage"))
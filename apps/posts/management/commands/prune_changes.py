@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.changes import prune_changes
+
+
+class Command(BaseCommand):
+    help = "Deletes the delta sync changes older than any sync token still accepted"
+
+    def handle(self, *args, **options):
+        deleted = prune_changes()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} changes"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.models import Post
+from apps.posts.rendering import RENDER_ARTIFACT_FIELDS, render_artifacts
+
+
+class Command(BaseCommand):
+    help = "Regenerates the excerpt, word count, reading time and HTML of posts in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every post instead of only the ones that were never rendered",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Post.objects.only("id", "content").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(content_html="").exclude(content="")
+
+        batch = []
+        updated = 0
+        for post in queryset.iterator(chunk_size=batch_size):
+            for field_name, value in render_artifacts(post.content).items():
+                setattr(post, field_name, value)
+            batch.append(post)
+            if len(batch) >= batch_size:
+                updated += Post.objects.bulk_update(batch, RENDER_ARTIFACT_FIELDS)
+                batch = []
+        if batch:
+            updated += Post.objects.bulk_update(batch, RENDER_ARTIFACT_FIELDS)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt render artifacts of {updated} posts"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.trending import recompute_scores
+
+
+class Command(BaseCommand):
+    help = "Recomputes the trending score of every published post from recent likes and comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = recompute_scores(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed trending scores of {count} posts"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.tag_counts import recount
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized post counters of every tag"
+
+    def handle(self, *args, **options):
+        count = recount()
+        self.stdout.write(self.style.SUCCESS(f"Recounted posts of {count} tags"))
@@ -0,0 +1,76 @@
+from django.db import models
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(queryset):
+    return Subquery(
+        queryset.order_by().values("post").annotate(count=Count("pk")).values("count"),
+        output_field=models.IntegerField(),
+    )
+
+
+class PostQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate the number of comments and likes of every post."""
+        from .models import Comment, Like
+
+        return self.annotate(
+            comments_count=Coalesce(_count_subquery(Comment.objects.filter(post=OuterRef("pk"))), 0),
+            likes_count=Coalesce(_count_subquery(Like.objects.filter(post=OuterRef("pk"))), 0),
+        )
+
+    def with_listing_data(self, user=None):
+        """Annotate the counters and viewer state serialized with every post, without N+1 queries."""
+        from .models import Like
+
+        queryset = (
+            self.with_counts()
+            .annotate(
+                views_count=Coalesce(F("view_stats__total_views"), 0),
+                unique_views_count=Coalesce(F("view_stats__unique_views"), 0),
+            )
+            .prefetch_related("tags")
+        )
+
+        if user is not None and user.is_authenticated:
+            return queryset.annotate(is_liked=Exists(Like.objects.filter(post=OuterRef("pk"), user=user)))
+        return queryset.annotate(is_liked=Value(False))
+
+    def with_tags(self, tag_ids, match_all=False):
+        """Filter to posts tagged with any, or with `match_all` every one, of `tag_ids`.
+
+        Both are semi-joins on the through table, so posts are never duplicated and need no DISTINCT.
+        """
+        tag_ids = list(tag_ids)
+        links = self.model.tags.through.objects.filter(tag_id__in=tag_ids)
+        if match_all and len(tag_ids) > 1:
+            matching = links.values("post_id").annotate(matched=Count("tag_id")).filter(matched=len(tag_ids))
+            return self.filter(pk__in=matching.values("post_id"))
+        return self.filter(Exists(links.filter(post_id=OuterRef("pk"))))
+
+    def without_body(self):
+        """Defer the columns only the detail view needs."""
+        return self.defer("content", "content_html")
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    def get_queryset(self):
+        # Posts being deleted in the background are hidden everywhere, see apps.posts.deletion.
+        return super().get_queryset().filter(deleting_at__isnull=True)
+
+
+class PostContentQuerySet(models.QuerySet):
+    def visible(self):
+        """Leave out the comments or likes of posts and users being deleted, see apps.posts.deletion.
+
+        Excludes the ids of the few rows being deleted, found through partial indexes, so serving
+        comments and likes never joins posts and users.
+        """
+        from apps.accounts.models import User
+
+        from .models import Post
+
+        return self.exclude(post_id__in=Post._base_manager.filter(deleting_at__isnull=False).values("pk")).exclude(
+            user_id__in=User._base_manager.filter(deleting_at__isnull=False).values("pk")
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:20
+
+import core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_tag_comment_post_tags_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='featured_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='featured image variants'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='featured_image',
+            field=models.ImageField(blank=True, null=True, upload_to='images', validators=[core.images.validate_image_upload], verbose_name='featured image'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_render_artifacts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='posts.post')),
+                ('score', models.FloatField(default=0.0, verbose_name='score')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+            ],
+            options={
+                'verbose_name': 'Trending score',
+                'verbose_name_plural': 'Trending scores',
+                'indexes': [models.Index(fields=['-score'], name='posts_trending_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tag_posts(apps, schema_editor):
+    Tag = apps.get_model("posts", "Tag")
+    PostTag = apps.get_model("posts", "Post").tags.through
+
+    def count_of(condition=Q()):
+        links = PostTag.objects.filter(condition, tag_id=OuterRef("pk")).order_by()
+        return Coalesce(Subquery(links.values("tag_id").annotate(count=Count("pk")).values("count")), 0)
+
+    Tag.objects.update(
+        posts_count=count_of(),
+        published_posts_count=count_of(Q(post__status="published")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_trendingscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='posts count'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='published posts count'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-posts_count', 'name'], name='posts_tag_popularity_idx'),
+        ),
+        migrations.RunPython(count_tag_posts, migrations.RunPython.noop),
+    ]
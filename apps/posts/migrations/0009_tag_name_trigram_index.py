@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:31
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Matches the UPPER("name"::text) LIKE UPPER(...) that icontains and istartswith compile to.
+CREATE_INDEX = 'CREATE INDEX IF NOT EXISTS posts_tag_name_trgm_idx ON posts_tag USING gin ((UPPER("name"::text)) gin_trgm_ops)'
+DROP_INDEX = "DROP INDEX IF EXISTS posts_tag_name_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_tag_posts_count'),
+    ]
+
+    operations = [
+        # Both operations are no-ops on other databases, which use the in-process trie instead.
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_tag_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViews',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='view_stats', serialize=False, to='posts.post')),
+                ('total_views', models.PositiveBigIntegerField(default=0, verbose_name='total views')),
+                ('unique_views', models.PositiveIntegerField(default=0, verbose_name='unique views')),
+                ('sketch', models.BinaryField(default=bytes, verbose_name='sketch')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+            ],
+            options={
+                'verbose_name': 'Post views',
+                'verbose_name_plural': 'Post views',
+            },
+        ),
+    ]
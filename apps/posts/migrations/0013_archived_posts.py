@@ -0,0 +1,72 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_deleting_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False, verbose_name='id')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('content', models.TextField(verbose_name='content')),
+                ('excerpt', models.CharField(blank=True, default='', max_length=300, verbose_name='excerpt')),
+                ('word_count', models.PositiveIntegerField(default=0, verbose_name='word count')),
+                ('reading_time', models.PositiveSmallIntegerField(default=0, verbose_name='reading time')),
+                ('content_html', models.TextField(blank=True, default='', verbose_name='content html')),
+                ('featured_image', models.CharField(blank=True, default='', max_length=100, verbose_name='featured image')),
+                ('featured_image_variants', models.JSONField(blank=True, default=dict, verbose_name='featured image variants')),
+                ('created_at', models.DateTimeField(verbose_name='created at')),
+                ('updated_at', models.DateTimeField(verbose_name='updated at')),
+                ('likes', models.IntegerField(default=0, verbose_name='likes')),
+                ('tag_ids', models.JSONField(blank=True, default=list, verbose_name='tag ids')),
+                ('total_views', models.PositiveBigIntegerField(default=0, verbose_name='total views')),
+                ('unique_views', models.PositiveIntegerField(default=0, verbose_name='unique views')),
+                ('views_sketch', models.BinaryField(default=bytes, verbose_name='views sketch')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='archived at')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived post',
+                'verbose_name_plural': 'Archived posts',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedLike',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False, verbose_name='id')),
+                ('created_at', models.DateTimeField(verbose_name='created at')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_likes', to='posts.archivedpost')),
+            ],
+            options={
+                'verbose_name': 'Archived like',
+                'verbose_name_plural': 'Archived likes',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False, verbose_name='id')),
+                ('parent_id', models.UUIDField(blank=True, null=True, verbose_name='parent id')),
+                ('content', models.TextField(verbose_name='content')),
+                ('created_at', models.DateTimeField(verbose_name='created at')),
+                ('updated_at', models.DateTimeField(verbose_name='updated at')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.archivedpost')),
+            ],
+            options={
+                'verbose_name': 'Archived comment',
+                'verbose_name_plural': 'Archived comments',
+            },
+        ),
+    ]
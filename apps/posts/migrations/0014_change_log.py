@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_archived_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('post', 'POST'), ('comment', 'COMMENT'), ('like', 'LIKE'), ('tag', 'TAG')], max_length=10, verbose_name='kind')),
+                ('object_id', models.UUIDField(verbose_name='object id')),
+                ('deleted', models.BooleanField(default=False, verbose_name='deleted')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'Change',
+                'verbose_name_plural': 'Changes',
+            },
+        ),
+    ]
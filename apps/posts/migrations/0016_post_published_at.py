@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    # `updated_at` is only set when a post is created, the closest record of when it was published.
+    Post.objects.filter(status="published").update(published_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_tag_follows_and_timelines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='published at'),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+    ]
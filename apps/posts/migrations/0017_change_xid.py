@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:30
+
+import apps.posts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_post_published_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='xid',
+            field=models.BigIntegerField(db_default=apps.posts.models.CurrentTransactionId(), editable=False, verbose_name='transaction id'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['xid', 'seq'], name='posts_change_xid_seq_idx'),
+        ),
+    ]
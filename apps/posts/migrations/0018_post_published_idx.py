@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_change_xid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-published_at'], name='posts_post_published_idx'),
+        ),
+    ]
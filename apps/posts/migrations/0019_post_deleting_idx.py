@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_post_published_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleting_at__isnull', False)), fields=['deleting_at'], name='posts_post_deleting_idx'),
+        ),
+    ]
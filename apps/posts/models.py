@@ -2,9 +2,14 @@ from enum import Enum
 from uuid import uuid4
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.accounts.models import User
+from core.images import validate_image_upload
+
+from .managers import PostContentQuerySet, PostManager
+from .rendering import RENDER_ARTIFACT_FIELDS, render_artifacts
 
 
 class Status(Enum):
@@ -30,6 +35,11 @@ class Tag(models.Model):
     )
     name = models.CharField(_("name"), max_length=50, unique=True, db_index=True)
     slug = models.SlugField(_("slug"), unique=True, db_index=True)
+    # Maintained by the Post.tags signals in apps.posts.signals, see apps.posts.tag_counts.
+    posts_count = models.PositiveIntegerField(_("posts count"), default=0, editable=False)
+    published_posts_count = models.PositiveIntegerField(_("published posts count"), default=0, editable=False)
+    # Maintained by apps.posts.feed as users follow and unfollow the tag.
+    followers_count = models.PositiveIntegerField(_("followers count"), default=0, editable=False)
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
@@ -38,6 +48,9 @@ class Tag(models.Model):
 
         verbose_name = "Tag"
         verbose_name_plural = "Tags"
+        indexes = [
+            models.Index(fields=["-posts_count", "name"], name="posts_tag_popularity_idx"),
+        ]
 
     def __str__(self):
         """Unicode representation of Tag."""
@@ -58,7 +71,18 @@ class Post(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(_("title"), max_length=255, db_index=True)
     content = models.TextField(_("content"))
-    featured_image = models.ImageField(_("featured image"), upload_to="images", blank=True, null=True)
+    excerpt = models.CharField(_("excerpt"), max_length=300, blank=True, default="", editable=False)
+    word_count = models.PositiveIntegerField(_("word count"), default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(_("reading time"), default=0, editable=False)
+    content_html = models.TextField(_("content html"), blank=True, default="", editable=False)
+    featured_image = models.ImageField(
+        _("featured image"),
+        upload_to="images",
+        blank=True,
+        null=True,
+        validators=[validate_image_upload],
+    )
+    featured_image_variants = models.JSONField(_("featured image variants"), default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(_("created at"), auto_now=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now_add=True)
     status = models.CharField(
@@ -67,19 +91,70 @@ class Post(models.Model):
         choices=Status.choices(),
         default=Status.DRAFT,
     )
+    # Set whenever the post becomes published, the time trending scores and feeds rank it by.
+    published_at = models.DateTimeField(_("published at"), null=True, blank=True, editable=False)
     likes = models.IntegerField(_("likes"), default=0)
     tags = models.ManyToManyField(Tag, related_name="posts", blank=True)
+    # Set while the post is deleted in the background, see apps.posts.deletion.
+    deleting_at = models.DateTimeField(_("deleting at"), null=True, blank=True, editable=False)
+
+    objects = PostManager()
 
     class Meta:
         """Meta definition for Post."""
 
         verbose_name = "Post"
         verbose_name_plural = "Posts"
+        indexes = [
+            # Newest first listings, of every post and of the published ones.
+            models.Index(fields=["-updated_at"], name="posts_post_updated_idx"),
+            models.Index(fields=["status", "-updated_at"], name="posts_post_status_idx"),
+            # Published posts by publication time, merged into feeds and scored for trending.
+            models.Index(fields=["status", "-published_at"], name="posts_post_published_idx"),
+            # The few posts being deleted, excluded from the comments and likes served.
+            models.Index(
+                fields=["deleting_at"], name="posts_post_deleting_idx", condition=models.Q(deleting_at__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         """Unicode representation of Post."""
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so saves can tell which fields changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def has_changed(self, field_name):
+        """Return whether `field_name` differs from the value loaded from the database."""
+        loaded_values = getattr(self, "_loaded_values", {})
+        if self._state.adding or field_name not in loaded_values:
+            return True
+        return loaded_values[field_name] != getattr(self, field_name)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if self.has_changed("content") and (update_fields is None or "content" in update_fields):
+            for field_name, value in render_artifacts(self.content).items():
+                setattr(self, field_name, value)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *RENDER_ARTIFACT_FIELDS}
+        update_fields = kwargs.get("update_fields")
+        if self.status == Status.PUBLISHED.value and (self.published_at is None or self.has_changed("status")):
+            self.published_at = timezone.now()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "published_at"}
+        super().save(*args, **kwargs)
+        deferred_fields = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred_fields
+        }
+
 
 class Comment(models.Model):
     """Model definition for Comment."""
@@ -105,12 +180,15 @@ class Comment(models.Model):
         related_name="replies",
     )
 
+    objects = PostContentQuerySet.as_manager()
+
     class Meta:
         """Meta definition for Comment."""
 
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"], name="posts_comment_created_idx")]
 
     def __str__(self):
         """Unicode representation of Comment."""
@@ -132,6 +210,8 @@ class Like(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="post_likes")
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    objects = PostContentQuerySet.as_manager()
+
     class Meta:
         """Meta definition for Like."""
 
@@ -153,3 +233,239 @@ class Like(models.Model):
         self.post.likes -= 1
         self.post.save()
         super().delete(*args, **kwargs)
+
+
+class TrendingScore(models.Model):
+    """Model definition for TrendingScore.
+
+    `score` is the natural log of the post's time-decayed engagement, measured against a fixed
+    epoch so rows never need decaying in place (see apps.posts.trending).
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trending",
+    )
+    score = models.FloatField(_("score"), default=0.0)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        """Meta definition for TrendingScore."""
+
+        verbose_name = "Trending score"
+        verbose_name_plural = "Trending scores"
+        indexes = [models.Index(fields=["-score"], name="posts_trending_score_idx")]
+
+    def __str__(self):
+        """Unicode representation of TrendingScore."""
+        return f"{self.post_id}: {self.score:.3f}"
+
+
+class PostViews(models.Model):
+    """Model definition for PostViews.
+
+    Persisted by apps.posts.view_counts from the view counts buffered in the cache.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="view_stats",
+    )
+    total_views = models.PositiveBigIntegerField(_("total views"), default=0)
+    unique_views = models.PositiveIntegerField(_("unique views"), default=0)
+    # HyperLogLog registers of the viewers, a fixed 2 ** precision bytes per post.
+    sketch = models.BinaryField(_("sketch"), default=bytes)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        """Meta definition for PostViews."""
+
+        verbose_name = "Post views"
+        verbose_name_plural = "Post views"
+
+    def __str__(self):
+        """Unicode representation of PostViews."""
+        return f"{self.post_id}: {self.unique_views} unique of {self.total_views}"
+
+
+class ArchivedPost(models.Model):
+    """Model definition for ArchivedPost.
+
+    Cold storage of archived posts, moved out of the `Post` table with their comments, likes and
+    view counts so the live tables and their indexes only hold live content (see apps.posts.archive).
+    """
+
+    id = models.UUIDField(_("id"), primary_key=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    title = models.CharField(_("title"), max_length=255)
+    content = models.TextField(_("content"))
+    excerpt = models.CharField(_("excerpt"), max_length=300, blank=True, default="")
+    word_count = models.PositiveIntegerField(_("word count"), default=0)
+    reading_time = models.PositiveSmallIntegerField(_("reading time"), default=0)
+    content_html = models.TextField(_("content html"), blank=True, default="")
+    featured_image = models.CharField(_("featured image"), max_length=100, blank=True, default="")
+    featured_image_variants = models.JSONField(_("featured image variants"), default=dict, blank=True)
+    created_at = models.DateTimeField(_("created at"))
+    updated_at = models.DateTimeField(_("updated at"))
+    likes = models.IntegerField(_("likes"), default=0)
+    tag_ids = models.JSONField(_("tag ids"), default=list, blank=True)
+    total_views = models.PositiveBigIntegerField(_("total views"), default=0)
+    unique_views = models.PositiveIntegerField(_("unique views"), default=0)
+    views_sketch = models.BinaryField(_("views sketch"), default=bytes)
+    archived_at = models.DateTimeField(_("archived at"), auto_now_add=True)
+
+    class Meta:
+        """Meta definition for ArchivedPost."""
+
+        verbose_name = "Archived post"
+        verbose_name_plural = "Archived posts"
+
+    def __str__(self):
+        """Unicode representation of ArchivedPost."""
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """Model definition for ArchivedComment."""
+
+    id = models.UUIDField(_("id"), primary_key=True, editable=False)
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE, related_name="comments")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    # Plain ids, replies may be archived before the comments they answer are.
+    parent_id = models.UUIDField(_("parent id"), null=True, blank=True)
+    content = models.TextField(_("content"))
+    created_at = models.DateTimeField(_("created at"))
+    updated_at = models.DateTimeField(_("updated at"))
+
+    class Meta:
+        """Meta definition for ArchivedComment."""
+
+        verbose_name = "Archived comment"
+        verbose_name_plural = "Archived comments"
+
+    def __str__(self):
+        """Unicode representation of ArchivedComment."""
+        return self.content[:50]
+
+
+class ArchivedLike(models.Model):
+    """Model definition for ArchivedLike."""
+
+    id = models.UUIDField(_("id"), primary_key=True, editable=False)
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE, related_name="archived_likes")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField(_("created at"))
+
+    class Meta:
+        """Meta definition for ArchivedLike."""
+
+        verbose_name = "Archived like"
+        verbose_name_plural = "Archived likes"
+
+    def __str__(self):
+        """Unicode representation of ArchivedLike."""
+        return f"{self.user_id} liked {self.post_id}"
+
+
+class TagFollow(models.Model):
+    """Model definition for TagFollow."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tag_follows")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="follows")
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        """Meta definition for TagFollow."""
+
+        verbose_name = "Tag follow"
+        verbose_name_plural = "Tag follows"
+        unique_together = ["user", "tag"]
+        indexes = [
+            # The fan-out walks the followers of a tag in user order.
+            models.Index(fields=["tag", "user"], name="posts_tagfollow_tag_idx"),
+        ]
+
+    def __str__(self):
+        """Unicode representation of TagFollow."""
+        return f"{self.user_id} follows {self.tag_id}"
+
+
+class TimelineEntry(models.Model):
+    """Model definition for TimelineEntry.
+
+    A post in the precomputed home feed of a user, written when the post is published to the
+    followers of its tags (see apps.posts.feed).
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    # Copy of `Post.published_at`, the order posts are listed in, so feeds never join the posts.
+    published_at = models.DateTimeField(_("published at"))
+
+    class Meta:
+        """Meta definition for TimelineEntry."""
+
+        verbose_name = "Timeline entry"
+        verbose_name_plural = "Timeline entries"
+        unique_together = ["user", "post"]
+        indexes = [
+            models.Index(fields=["user", "-published_at", "-post"], name="posts_timeline_feed_idx"),
+        ]
+
+    def __str__(self):
+        """Unicode representation of TimelineEntry."""
+        return f"{self.post_id} in the feed of {self.user_id}"
+
+
+class ChangeKind(Enum):
+    POST = "post"
+    COMMENT = "comment"
+    LIKE = "like"
+    TAG = "tag"
+
+    @classmethod
+    def choices(cls):
+        return [(key.value, key.name) for key in cls]
+
+
+class CurrentTransactionId(models.Func):
+    """Id of the transaction running the statement on PostgreSQL, 0 on databases without one."""
+
+    function = "pg_current_xact_id"
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return "0", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return "pg_current_xact_id()::text::bigint", []
+
+
+class Change(models.Model):
+    """Model definition for Change.
+
+    Append-only log of the posts, comments, likes and tags written or deleted, read by the delta
+    sync endpoint in (transaction, sequence) order (see apps.posts.changes).
+    """
+
+    seq = models.BigAutoField(primary_key=True)
+    xid = models.BigIntegerField(_("transaction id"), db_default=CurrentTransactionId(), editable=False)
+    kind = models.CharField(_("kind"), max_length=10, choices=ChangeKind.choices())
+    object_id = models.UUIDField(_("object id"))
+    deleted = models.BooleanField(_("deleted"), default=False)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        """Meta definition for Change."""
+
+        verbose_name = "Change"
+        verbose_name_plural = "Changes"
+        indexes = [models.Index(fields=["xid", "seq"], name="posts_change_xid_seq_idx")]
+
+    def __str__(self):
+        """Unicode representation of Change."""
+        return f"{self.seq}: {'deleted' if self.deleted else 'wrote'} {self.kind} {self.object_id}"
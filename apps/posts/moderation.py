@@ -0,0 +1,87 @@
+"""Bulk moderation, run as chunked UPDATE and DELETE statements.
+
+Bulk statements skip the model methods and signals that maintain denormalized counters, so every
+chunk recounts the counters it touched in aggregate instead.
+"""
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.notifications.counters import recounting
+from apps.notifications.models import Notification
+
+from . import changes, feed, tag_counts
+from .cache import bump_post_versions
+from .models import ChangeKind, Comment, Like, Post, Status, TrendingScore
+
+CHUNK_SIZE = 1000
+
+
+def chunks(queryset, chunk_size: int):
+    pks = list(queryset.order_by().values_list("pk", flat=True))
+    for start in range(0, len(pks), chunk_size):
+        yield pks[start : start + chunk_size]
+
+
+def tag_ids_of_posts(post_ids) -> list:
+    return list(
+        tag_counts.PostTag.objects.filter(post_id__in=post_ids).order_by().values_list("tag_id", flat=True).distinct()
+    )
+
+
+def recount_likes(post_ids) -> int:
+    """Recompute `Post.likes` of `post_ids` from their likes."""
+    likes = Like.objects.filter(post_id=OuterRef("pk")).order_by().values("post_id").annotate(count=Count("pk"))
+    return Post.objects.filter(pk__in=post_ids).update(likes=Coalesce(Subquery(likes.values("count")), 0))
+
+
+def archive_posts(queryset, chunk_size: int = CHUNK_SIZE) -> int:
+    """Archive the posts of `queryset` and return how many were archived."""
+    archived = 0
+    for chunk in chunks(queryset.exclude(status=Status.ARCHIVED.value), chunk_size):
+        with transaction.atomic():
+            tag_ids = tag_ids_of_posts(chunk)
+            archived += Post.objects.filter(pk__in=chunk).update(status=Status.ARCHIVED.value)
+            TrendingScore.objects.filter(post_id__in=chunk).delete()
+            feed.remove_posts(chunk)
+            tag_counts.recount(tag_ids)
+            changes.record_changes(ChangeKind.POST, chunk)
+        bump_post_versions(chunk)
+    return archived
+
+
+def delete_posts(queryset, chunk_size: int = CHUNK_SIZE) -> int:
+    """Delete the posts of `queryset` with their comments and likes and return how many were deleted."""
+    deleted = 0
+    for chunk in chunks(queryset, chunk_size):
+        notifications = Notification.objects.filter(post_id__in=chunk)
+        with transaction.atomic(), tag_counts.suspended(), recounting(notifications):
+            tag_ids = tag_ids_of_posts(chunk)
+            deleted += Post.objects.filter(pk__in=chunk).delete()[1].get(Post._meta.label, 0)
+            tag_counts.recount(tag_ids)
+    return deleted
+
+
+def delete_comments(queryset, chunk_size: int = CHUNK_SIZE) -> int:
+    """Delete the comments of `queryset` with their replies and return how many were deleted."""
+    deleted = 0
+    for chunk in chunks(queryset, chunk_size):
+        comments = Comment.objects.filter(pk__in=chunk)
+        # Replies removed by the cascade are on the same posts.
+        notifications = Notification.objects.filter(post_id__in=comments.values("post_id"))
+        with transaction.atomic(), recounting(notifications):
+            deleted += comments.delete()[1].get(Comment._meta.label, 0)
+    return deleted
+
+
+def delete_likes(queryset, chunk_size: int = CHUNK_SIZE) -> int:
+    """Delete the likes of `queryset` and return how many were deleted."""
+    deleted = 0
+    for chunk in chunks(queryset, chunk_size):
+        with transaction.atomic():
+            likes = Like.objects.filter(pk__in=chunk)
+            post_ids = list(likes.values_list("post_id", flat=True).distinct())
+            deleted += likes.delete()[0]
+            recount_likes(post_ids)
+    return deleted
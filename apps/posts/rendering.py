@@ -0,0 +1,44 @@
+import math
+import re
+
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+# The Post columns derived from its content.
+RENDER_ARTIFACT_FIELDS = ("excerpt", "word_count", "reading_time", "content_html")
+
+_WORD_RE = re.compile(r"\w+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def render_html(content: str) -> str:
+    """Render plain text `content` to escaped HTML paragraphs."""
+    return linebreaks(content, autoescape=True)
+
+
+def render_excerpt(content: str) -> str:
+    text = _WHITESPACE_RE.sub(" ", strip_tags(content)).strip()
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
+
+def count_words(content: str) -> int:
+    return len(_WORD_RE.findall(strip_tags(content)))
+
+
+def reading_time(word_count: int) -> int:
+    """Return the reading time in minutes for `word_count` words, at least one for any text."""
+    return math.ceil(word_count / WORDS_PER_MINUTE)
+
+
+def render_artifacts(content: str) -> dict:
+    """Return the derived fields of a post with the given `content`."""
+    word_count = count_words(content)
+    return {
+        "excerpt": render_excerpt(content),
+        "word_count": word_count,
+        "reading_time": reading_time(word_count),
+        "content_html": render_html(content),
+    }
@@ -0,0 +1,137 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import autocomplete, changes, feed, live, tag_cache, tag_counts, trending
+from .cache import bump_post_version, bump_post_versions
+from .models import ChangeKind, Comment, Like, Post, Status, Tag
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created or instance.has_changed("status"):
+        trending.sync_post(instance)
+
+    if not created and instance.has_changed("status"):
+        was_published = getattr(instance, "_loaded_values", {}).get("status") == Status.PUBLISHED.value
+        is_published = instance.status == Status.PUBLISHED.value
+        if was_published != is_published:
+            tag_ids = tag_counts.tag_ids_of(instance)
+            tag_counts.adjust(tag_ids, 0, 1 if is_published else -1)
+            if not is_published:
+                feed.remove_posts([instance.pk])
+            elif tag_ids:
+                feed.schedule_fan_out([instance.pk])
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if tag_counts.is_suspended():
+        return
+    # The through rows are removed by the cascade, which does not send m2m_changed.
+    is_published = instance.status == Status.PUBLISHED.value
+    tag_counts.adjust(tag_counts.tag_ids_of(instance), -1, -1 if is_published else 0)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # The cleared ids are gone by the time post_clear is sent.
+        instance._cleared_pks = (
+            list(instance.posts.values_list("pk", flat=True)) if reverse else tag_counts.tag_ids_of(instance)
+        )
+        return
+    if action == "pre_remove":
+        # `pk_set` holds the ids passed to remove(), including those that were never linked.
+        if reverse:
+            linked = sender.objects.filter(tag=instance, post_id__in=pk_set).values_list("post_id", flat=True)
+        else:
+            linked = sender.objects.filter(post=instance, tag_id__in=pk_set).values_list("tag_id", flat=True)
+        instance._removed_pks = set(linked)
+        return
+
+    if action == "post_clear":
+        action, pk_set = "post_remove", instance.__dict__.pop("_cleared_pks", [])
+    elif action == "post_remove":
+        pk_set = instance.__dict__.pop("_removed_pks", pk_set)
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    bump_post_versions(list(pk_set) if reverse else [instance.pk])
+    changes.record_changes(ChangeKind.POST, list(pk_set) if reverse else [instance.pk])
+    sign = 1 if action == "post_add" else -1
+    if reverse:
+        tag_counts.adjust_for_tag(instance.pk, list(pk_set), sign)
+    else:
+        is_published = instance.status == Status.PUBLISHED.value
+        tag_counts.adjust(list(pk_set), sign, sign if is_published else 0)
+
+    if action == "post_add":
+        # Published posts reach the followers of the tags they gained.
+        if not reverse:
+            published = [instance.pk] if instance.status == Status.PUBLISHED.value else []
+        else:
+            published = Post.objects.filter(pk__in=pk_set, status=Status.PUBLISHED.value).values_list("pk", flat=True)
+        feed.schedule_fan_out(published)
+    elif reverse:
+        feed.remove_untagged(list(pk_set), [instance.pk])
+    else:
+        feed.remove_untagged([instance.pk], list(pk_set))
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def tag_changed(sender, instance, **kwargs):
+    autocomplete.invalidate_trie()
+    tag_cache.invalidate()
+
+
+@receiver(post_save, sender=Like)
+def like_saved(sender, instance, created, **kwargs):
+    if created:
+        trending.record_like(instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        trending.record_comment(instance)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_post_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Like)
+def post_engagement_changed(sender, instance, **kwargs):
+    bump_post_version(instance.post_id)
+
+
+@receiver([post_save, pre_delete], sender=Tag)
+def tag_posts_changed(sender, instance, **kwargs):
+    # Renamed or deleted tags are embedded in the cached payloads of their posts.
+    bump_post_versions(Post.tags.through.objects.filter(tag_id=instance.pk).values_list("post_id", flat=True))
+
+
+CHANGE_KINDS = {Post: ChangeKind.POST, Comment: ChangeKind.COMMENT, Like: ChangeKind.LIKE, Tag: ChangeKind.TAG}
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Like)
+@receiver([post_save, post_delete], sender=Tag)
+def record_change(sender, instance, signal, **kwargs):
+    changes.record_change(CHANGE_KINDS[sender], instance.pk, deleted=signal is post_delete)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Like)
+def publish_counts(sender, instance, signal, created=False, **kwargs):
+    if created or signal is post_delete:
+        # Counted from another connection, which only sees the row once committed.
+        transaction.on_commit(partial(live.publisher.mark, instance.post_id))
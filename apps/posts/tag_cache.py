@@ -0,0 +1,46 @@
+"""Cached mapping of tag slugs to ids.
+
+Post listings filter by tag slug on every request. Resolving slugs here lets the filter run
+directly against the Post.tags through table instead of joining Tag. Slugs are cached in the shared
+cache under a generation, which the Tag signals in apps.posts.signals replace once a tag is saved or
+deleted, so renamed, deleted and re-created tags stop resolving to their old ids in every process.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Tag
+
+GENERATION_KEY = "tags:slugs:generation"
+SLUG_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def get_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def resolve_slugs(slugs) -> dict:
+    """Return a mapping of the known tags among `slugs` to their ids."""
+    generation = get_generation()
+    keys = {slug: f"tags:slug:{generation}:{slug}" for slug in set(slugs)}
+    stored = cache.get_many(keys.values())
+    resolved = {slug: stored[key] for slug, key in keys.items() if key in stored}
+    missing = keys.keys() - resolved.keys()
+    if missing:
+        loaded = dict(Tag.objects.filter(slug__in=missing).values_list("slug", "id"))
+        # add() leaves the stamp of the prefix alone, so other processes keep their local copies.
+        for slug, tag_id in loaded.items():
+            cache.add(keys[slug], tag_id, SLUG_CACHE_TIMEOUT)
+        resolved.update(loaded)
+    return resolved
+
+
+def invalidate() -> None:
+    """Start a new generation of slugs once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, time.time_ns(), None))
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Post, Status, Tag
+
+PostTag = Post.tags.through
+
+_suspended = ContextVar("tag_counts_suspended", default=False)
+
+
+@contextmanager
+def suspended():
+    """Skip the per-post counter updates of bulk changes, which `recount()` the tags afterwards."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def is_suspended() -> bool:
+    return _suspended.get()
+
+
+def adjust(tag_ids, posts_delta: int, published_delta: int = 0) -> None:
+    """Shift the post counters of `tag_ids` in one UPDATE."""
+    changes = {}
+    if posts_delta:
+        changes["posts_count"] = F("posts_count") + posts_delta
+    if published_delta:
+        changes["published_posts_count"] = F("published_posts_count") + published_delta
+    if tag_ids and changes and not is_suspended():
+        Tag.objects.filter(pk__in=tag_ids).update(**changes)
+
+
+def adjust_for_tag(tag_id, post_ids, sign: int) -> None:
+    """Shift the counters of one tag that gained (+1) or lost (-1) `post_ids`."""
+    published = Post.objects.filter(pk__in=post_ids, status=Status.PUBLISHED.value).count()
+    adjust([tag_id], sign * len(post_ids), sign * published)
+
+
+def tag_ids_of(post) -> list:
+    return list(PostTag.objects.filter(post_id=post.pk).values_list("tag_id", flat=True))
+
+
+def recount(tag_ids=None) -> int:
+    """Recompute the counters of `tag_ids`, or of every tag, from the through table."""
+
+    def count_of(condition=Q()):
+        links = PostTag.objects.filter(condition, tag_id=OuterRef("pk")).order_by()
+        return Coalesce(Subquery(links.values("tag_id").annotate(count=Count("pk")).values("count")), 0)
+
+    queryset = Tag.objects.all() if tag_ids is None else Tag.objects.filter(pk__in=tag_ids)
+    return queryset.update(
+        posts_count=count_of(),
+        published_posts_count=count_of(Q(post__status=Status.PUBLISHED.value)),
+    )
@@ -0,0 +1,85 @@
+import pytest
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.posts.models import Comment, Like, Post, Status, Tag, TrendingScore
+
+from .factories import CommentFactory, PostFactory, TagFactory, UserFactory
+
+
+@pytest.fixture()
+def admin_client(client):
+    admin = User.objects.create_superuser(
+        email="admin@example.com",
+        password="admin-password",
+        first_name="Admin",
+        last_name="User",
+    )
+    client.force_login(admin)
+    return client
+
+
+def run_action(admin_client, model, action, objects):
+    url = reverse(f"admin:posts_{model._meta.model_name}_changelist")
+    return admin_client.post(url, {"action": action, "_selected_action": [obj.pk for obj in objects]})
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("model", [Post, Comment, Like, Tag])
+def test_changelists_render(admin_client, model):
+    post = PostFactory(tags=[TagFactory()])
+    CommentFactory(post=post)
+    Like.objects.create(user=post.user, post=post)
+
+    response = admin_client.get(reverse(f"admin:posts_{model._meta.model_name}_changelist"))
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db()
+def test_archive_action_updates_counters(admin_client):
+    tag = TagFactory()
+    posts = [PostFactory(tags=[tag]) for _ in range(3)]
+
+    run_action(admin_client, Post, "archive_posts", posts[:2])
+
+    assert Post.objects.filter(status=Status.ARCHIVED.value).count() == 2
+    assert not TrendingScore.objects.filter(post__in=posts[:2]).exists()
+    tag.refresh_from_db()
+    assert (tag.posts_count, tag.published_posts_count) == (3, 1)
+
+
+@pytest.mark.django_db()
+def test_delete_posts_by_authors(admin_client):
+    tag = TagFactory()
+    author = UserFactory()
+    posts = [PostFactory(user=author, tags=[tag]) for _ in range(3)]
+    other = PostFactory(tags=[tag])
+    CommentFactory(post=posts[0])
+
+    run_action(admin_client, Post, "delete_posts_by_authors", posts[:1])
+
+    assert list(Post.objects.all()) == [other]
+    assert not Comment.objects.exists()
+    tag.refresh_from_db()
+    assert (tag.posts_count, tag.published_posts_count) == (1, 1)
+
+
+@pytest.mark.django_db()
+def test_delete_likes_by_users_recounts_likes(admin_client):
+    post = PostFactory()
+    liker = UserFactory()
+    likes = [Like.objects.create(user=liker, post=post), Like.objects.create(user=UserFactory(), post=post)]
+    Like.objects.create(user=liker, post=PostFactory())
+
+    run_action(admin_client, Like, "delete_likes_by_users", likes[:1])
+
+    assert list(Like.objects.all()) == likes[1:]
+    post.refresh_from_db()
+    assert post.likes == 1
+
+
+@pytest.mark.django_db()
+def test_post_change_form_renders(admin_client):
+    post = PostFactory(tags=[TagFactory()])
+    response = admin_client.get(reverse("admin:posts_post_change", args=[post.pk]))
+    assert response.status_code == 200
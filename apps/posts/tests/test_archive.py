@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.archive import archive_post
+from apps.posts.models import ArchivedPost, Comment, Like, Post, PostViews, Status, Tag
+
+from .factories import CommentFactory, PostFactory, TagFactory, UserFactory
+
+
+@pytest.fixture()
+def archived_post(user):
+    tag = TagFactory()
+    post = PostFactory(user=user, status=Status.ARCHIVED.value, tags=[tag])
+    parent = CommentFactory(post=post)
+    CommentFactory(post=post, parent=parent)
+    Like.objects.create(user=UserFactory(), post=post)
+    PostViews.objects.create(post=post, total_views=7, unique_views=5)
+    return Post.objects.get(pk=post.pk)
+
+
+@pytest.mark.django_db()
+def test_archived_posts_move_to_cold_storage(archived_post):
+    live = PostFactory(tags=list(archived_post.tags.all()))
+    call_command("move_archived_posts")
+
+    assert list(Post.objects.all()) == [live]
+    assert not Comment.objects.filter(post_id=archived_post.pk).exists()
+    cold = ArchivedPost.objects.get(pk=archived_post.pk)
+    assert cold.comments.count() == 2
+    assert cold.archived_likes.count() == 1
+    assert cold.total_views == 7
+    assert Tag.objects.get(pk=cold.tag_ids[0]).posts_count == 1
+
+
+@pytest.mark.django_db()
+def test_cold_posts_can_still_be_retrieved(api_client, archived_post):
+    archive_post(archived_post.pk)
+
+    response = api_client.get(reverse("post-detail", kwargs={"pk": archived_post.pk}))
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == Status.ARCHIVED.value
+    assert data["comments_count"] == 2
+    assert data["views"] == 7
+    assert len(data["tags"]) == 1
+
+
+@pytest.mark.django_db()
+def test_setting_a_cold_post_back_to_draft_restores_it(api_client, archived_post):
+    published_at = archived_post.updated_at
+    archive_post(archived_post.pk)
+
+    response = api_client.patch(
+        reverse("post-detail", kwargs={"pk": archived_post.pk}),
+        {"status": Status.DRAFT.value},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    post = Post.objects.get(pk=archived_post.pk)
+    assert post.status == Status.DRAFT.value
+    assert post.updated_at == published_at
+    assert post.comments.count() == 2
+    assert post.post_likes.count() == 1
+    assert post.view_stats.total_views == 7
+    assert post.tags.get().posts_count == 1
+    assert not ArchivedPost.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_cold_posts_reject_other_updates(api_client, other_user, archived_post):
+    archive_post(archived_post.pk)
+    url = reverse("post-detail", kwargs={"pk": archived_post.pk})
+
+    response = api_client.patch(url, {"status": Status.PUBLISHED.value}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.patch(url, {"title": "Edited"}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    api_client.force_authenticate(user=other_user)
+    response = api_client.patch(url, {"status": Status.DRAFT.value}, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert ArchivedPost.objects.exists()
@@ -0,0 +1,46 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.autocomplete import TagTrie, get_trie
+
+from .factories import PostFactory, TagFactory
+
+
+def make_tag(name, posts_count=0):
+    return {"id": name, "name": name, "slug": name.lower().replace(" ", "-"), "posts_count": posts_count}
+
+
+def test_trie_ranks_by_match_then_popularity():
+    trie = TagTrie(
+        [
+            make_tag("Python", 3),
+            make_tag("PyTorch", 10),
+            make_tag("Py", 0),
+            make_tag("Machine Learning", 7),
+            make_tag("Django", 50),
+        ]
+    )
+    assert [tag["name"] for tag in trie.search("py", 10)] == ["Py", "PyTorch", "Python"]
+    assert [tag["name"] for tag in trie.search("learn", 10)] == ["Machine Learning"]
+    assert trie.search("rust", 10) == []
+    assert len(trie.search("p", 1)) == 1
+
+
+@pytest.mark.django_db()
+def test_trie_is_rebuilt_when_tags_change():
+    TagFactory(name="Django", slug="django")
+    assert [tag["name"] for tag in get_trie().search("dj", 10)] == ["Django"]
+    TagFactory(name="Djoser", slug="djoser")
+    assert [tag["name"] for tag in get_trie().search("djo", 10)] == ["Djoser"]
+
+
+@pytest.mark.django_db()
+def test_autocomplete_endpoint(api_client):
+    rust, ruby = TagFactory(name="Rust", slug="rust"), TagFactory(name="Ruby", slug="ruby")
+    PostFactory.create_batch(2, tags=[ruby])
+    PostFactory(tags=[rust])
+
+    response = api_client.get(reverse("tag-autocomplete"), {"q": "Ru"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [tag["name"] for tag in response.json()] == ["Ruby", "Rust"]
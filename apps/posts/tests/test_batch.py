@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.api.views import BATCH_MAX_IDS
+from apps.posts.models import Like
+
+from .factories import CommentFactory, PostFactory, TagFactory
+
+
+@pytest.mark.django_db()
+def test_batch_returns_posts_in_requested_order(api_client, user):
+    posts = [PostFactory(tags=[TagFactory()]) for _ in range(3)]
+    CommentFactory(post=posts[0])
+    Like.objects.create(user=user, post=posts[2])
+    missing = uuid.uuid4()
+    ids = [posts[2].pk, missing, posts[0].pk, posts[1].pk, posts[2].pk]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("post-batch"), {"ids": ",".join(str(post_id) for post_id in ids)})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [post["id"] for post in data["results"]] == [str(posts[2].pk), str(posts[0].pk), str(posts[1].pk)]
+    assert data["missing"] == [str(missing)]
+    assert data["results"][0]["is_liked"] is True
+    assert data["results"][1]["comments_count"] == 1
+    # The posts with their annotations, then their tags.
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db()
+def test_batch_validates_ids(api_client):
+    response = api_client.get(reverse("post-batch"), {"ids": "not-a-uuid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    ids = ",".join(str(uuid.uuid4()) for _ in range(BATCH_MAX_IDS + 1))
+    response = api_client.get(reverse("post-batch"), {"ids": ids})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
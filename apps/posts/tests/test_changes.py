@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.posts import changes
+from apps.posts.deletion import schedule_post_deletion
+from apps.posts.models import Change, Like
+
+from .factories import CommentFactory, PostFactory, TagFactory
+
+
+def sync(api_client, token=None, **params):
+    response = api_client.get(reverse("sync-changes"), {**({"token": token} if token else {}), **params})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.django_db()
+def test_changes_since_token(api_client, user):
+    PostFactory()
+    token = sync(api_client)["token"]
+
+    tag = TagFactory()
+    post = PostFactory(tags=[tag])
+    comment = CommentFactory(post=post)
+    Like.objects.create(user=user, post=post)
+    with CaptureQueriesContext(connection) as queries:
+        data = sync(api_client, token)
+
+    assert data["has_more"] is False
+    latest = {(change["kind"], change["id"]): change for change in data["changes"]}
+    assert set(latest) == {
+        ("tag", str(tag.pk)),
+        ("post", str(post.pk)),
+        ("comment", str(comment.pk)),
+        ("like", str(Like.objects.get().pk)),
+    }
+    # Every object once, however often it was written.
+    assert len(data["changes"]) == 4
+    assert latest[("post", str(post.pk))]["data"]["likes_count"] == 1
+    assert latest[("comment", str(comment.pk))]["data"]["replies_count"] == 0
+    # The log, then the posts with their tags, the comments, the likes and the tags.
+    assert len(queries) == 6
+
+    assert sync(api_client, data["token"])["changes"] == []
+
+
+@pytest.mark.django_db()
+def test_deletions_are_tombstones(api_client):
+    post, other = PostFactory(), PostFactory()
+    comment = CommentFactory(post=other)
+    token = sync(api_client)["token"]
+
+    comment_id = comment.pk
+    schedule_post_deletion(post)
+    comment.delete()
+    data = sync(api_client, token)
+
+    assert {(change["kind"], change["id"], change["deleted"]) for change in data["changes"]} >= {
+        ("post", str(post.pk), True),
+        ("comment", str(comment_id), True),
+    }
+    assert all(change["data"] is None for change in data["changes"] if change["deleted"])
+
+
+@pytest.mark.django_db()
+def test_changes_are_paginated_by_sequence(api_client):
+    token = sync(api_client)["token"]
+    TagFactory.create_batch(5)
+
+    first = sync(api_client, token, limit=3)
+    second = sync(api_client, first["token"], limit=3)
+
+    assert first["has_more"] is True
+    assert second["has_more"] is False
+    seqs = [change["seq"] for change in first["changes"] + second["changes"]]
+    assert seqs == sorted(seqs) and len(seqs) == 5
+
+
+@pytest.mark.django_db()
+def test_invalid_and_expired_tokens(api_client, monkeypatch):
+    response = api_client.get(reverse("sync-changes"), {"token": "forged"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    token = sync(api_client)["token"]
+    monkeypatch.setattr(changes, "TOKEN_MAX_AGE", timedelta(seconds=-1))
+    response = api_client.get(reverse("sync-changes"), {"token": token})
+    assert response.status_code == status.HTTP_410_GONE
+
+
+@pytest.mark.django_db()
+def test_prune_changes():
+    TagFactory.create_batch(2)
+    Change.objects.filter(seq=Change.objects.order_by("seq").first().seq).update(
+        created_at=timezone.now() - changes.RETENTION - timedelta(days=1)
+    )
+
+    call_command("prune_changes")
+
+    assert Change.objects.count() == 1
+
+
+@pytest.mark.django_db()
+def test_changes_are_read_in_transaction_order(api_client):
+    token = sync(api_client)["token"]
+    first, second = TagFactory(), TagFactory()
+    # The transaction of the second tag started first, its row was inserted last.
+    Change.objects.filter(object_id=second.pk).update(xid=1)
+    Change.objects.filter(object_id=first.pk).update(xid=2)
+
+    page = sync(api_client, token, limit=1)
+    assert [change["id"] for change in page["changes"]] == [str(second.pk)]
+    page = sync(api_client, page["token"], limit=1)
+    assert [change["id"] for change in page["changes"]] == [str(first.pk)]
+    assert sync(api_client, page["token"])["changes"] == []
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_changes_are_read_from_the_primary(api_client, settings):
+    settings.REPLICA_DATABASES = ["replica"]
+    token = sync(api_client)["token"]
+    TagFactory()
+
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        assert len(sync(api_client, token)["changes"]) == 1
+    assert len(replica_queries) == 0
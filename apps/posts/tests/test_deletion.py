@@ -0,0 +1,84 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.accounts.models import User
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import run_pending
+from apps.posts import deletion
+from apps.posts.models import Comment, Like, Post, Tag
+
+from .factories import CommentFactory, PostFactory, TagFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(deletion, "BATCH_SIZE", 2)
+
+
+@pytest.mark.django_db()
+def test_deleting_a_post_hides_it_and_removes_its_rows_in_the_background(api_client, user):
+    tag = TagFactory()
+    post = PostFactory(user=user, tags=[tag])
+    for _ in range(3):
+        Like.objects.create(user=UserFactory(), post=post)
+        CommentFactory(post=post)
+
+    response = api_client.delete(reverse("post-detail", kwargs={"pk": post.pk}))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert api_client.get(reverse("post-detail", kwargs={"pk": post.pk})).status_code == status.HTTP_404_NOT_FOUND
+    assert not Comment.objects.visible().filter(post_id=post.pk).exists()
+    assert not Like.objects.visible().filter(post_id=post.pk).exists()
+    assert Comment.objects.filter(post_id=post.pk).count() == 3
+    assert api_client.get(reverse("comment-list"), {"post": post.pk}).json()["count"] == 0
+    assert api_client.get(reverse("like-list"), {"post": post.pk}).json()["count"] == 0
+
+    run_pending()
+
+    assert not Post._base_manager.filter(pk=post.pk).exists()
+    assert not Comment.objects.exists()
+    assert not Like.objects.exists()
+    assert Tag.objects.get(pk=tag.pk).posts_count == 0
+    job = Job.objects.get(task=deletion.DELETE_POST_TASK)
+    assert job.status == JobStatus.DONE.value
+    assert job.progress == {"posts": 1, "comments": 3, "likes": 3, "done": True}
+
+
+@pytest.mark.django_db()
+def test_post_stays_visible_when_its_deletion_cannot_be_queued(monkeypatch):
+    post = PostFactory()
+
+    def enqueue(*args, **kwargs):
+        raise RuntimeError("Queue is unavailable")
+
+    monkeypatch.setattr(deletion, "enqueue", enqueue)
+    with pytest.raises(RuntimeError):
+        deletion.schedule_post_deletion(post)
+    assert Post.objects.filter(pk=post.pk).exists()
+
+
+@pytest.mark.django_db()
+def test_deleting_a_user_removes_their_content_and_recounts_likes():
+    author = UserFactory()
+    posts = [PostFactory(user=author) for _ in range(3)]
+    other_post = PostFactory()
+    Like.objects.create(user=author, post=other_post)
+    Like.objects.create(user=UserFactory(), post=other_post)
+    CommentFactory(user=author, post=other_post)
+
+    deletion.schedule_user_deletion(author)
+    assert not User.objects.filter(pk=author.pk).exists()
+    assert not Post.objects.filter(pk__in=[post.pk for post in posts]).exists()
+    assert not Comment.objects.visible().filter(post=other_post).exists()
+    assert Like.objects.visible().filter(post=other_post).count() == 1
+
+    run_pending()
+
+    assert not User._base_manager.filter(pk=author.pk).exists()
+    assert list(Post._base_manager.all()) == [other_post]
+    assert not Comment.objects.exists()
+    other_post.refresh_from_db()
+    assert other_post.likes == 1
+    job = Job.objects.get(task=deletion.DELETE_USER_TASK)
+    assert job.progress["posts"] == job.progress["posts_total"] == 3
@@ -0,0 +1,40 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.models import Comment, Tag
+
+from .factories import CommentFactory, TagFactory
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_authors_can_edit_their_comments(api_client, user, method):
+    comment = CommentFactory(user=user)
+
+    response = getattr(api_client, method)(
+        reverse("comment-detail", kwargs={"pk": comment.pk}), {"content": "Edited"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert Comment.objects.get(pk=comment.pk).content == "Edited"
+
+
+@pytest.mark.django_db()
+def test_comments_of_others_cannot_be_edited(api_client):
+    comment = CommentFactory()
+
+    response = api_client.patch(reverse("comment-detail", kwargs={"pk": comment.pk}), {"content": "Edited"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert Comment.objects.get(pk=comment.pk).content == comment.content
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_tags_can_be_edited(api_client, method):
+    tag = TagFactory()
+
+    response = getattr(api_client, method)(
+        reverse("tag-detail", kwargs={"pk": tag.pk}), {"name": "Renamed", "slug": "renamed"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert Tag.objects.get(pk=tag.pk).name == "Renamed"
@@ -0,0 +1,169 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.jobs.queue import run_pending
+from apps.posts import moderation
+from apps.posts.models import Post, Status, Tag, TimelineEntry
+
+from .factories import PostFactory, TagFactory
+
+
+def follow(api_client, tag):
+    return api_client.post(reverse("tag-follow", args=[tag.pk]))
+
+
+def feed_ids(api_client, **params):
+    response = api_client.get(reverse("post-feed"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return [post["id"] for post in response.json()["results"]], response.json()["next"]
+
+
+@pytest.mark.django_db()
+def test_followed_tags_fill_the_feed(api_client, user):
+    django, python = TagFactory(), TagFactory()
+    older = PostFactory(tags=[django])
+    PostFactory(tags=[TagFactory()])
+    assert follow(api_client, django).status_code == status.HTTP_201_CREATED
+    assert follow(api_client, django).status_code == status.HTTP_200_OK
+    follow(api_client, python)
+    assert Tag.objects.get(pk=django.pk).followers_count == 1
+
+    newer = PostFactory(tags=[django, python])
+    draft = PostFactory(tags=[python], status=Status.DRAFT.value)
+    run_pending(batch_size=20)
+
+    assert feed_ids(api_client)[0] == [str(newer.pk), str(older.pk)]
+
+    draft.status = Status.PUBLISHED.value
+    draft.save()
+    run_pending(batch_size=20)
+    assert feed_ids(api_client)[0] == [str(draft.pk), str(newer.pk), str(older.pk)]
+
+
+@pytest.mark.django_db()
+def test_feed_is_keyset_paginated(api_client):
+    tag = TagFactory()
+    follow(api_client, tag)
+    posts = PostFactory.create_batch(5, tags=[tag])
+    run_pending(batch_size=20)
+    expected = [str(post.pk) for post in sorted(posts, key=lambda post: (post.updated_at, post.pk), reverse=True)]
+
+    first, next_url = feed_ids(api_client, page_size=3)
+    # A post published meanwhile does not shift the next page.
+    PostFactory(tags=[tag])
+    run_pending(batch_size=20)
+    second = api_client.get(next_url).json()
+
+    assert first + [post["id"] for post in second["results"]] == expected
+    assert second["next"] is None
+    response = api_client.get(reverse("post-feed"), {"cursor": "forged"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db()
+def test_feed_reads_do_not_grow_with_followed_tags(api_client):
+    def read_queries():
+        api_client.get(reverse("post-feed"))
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(reverse("post-feed"))
+        return len(queries)
+
+    tags = TagFactory.create_batch(6)
+    follow(api_client, tags[0])
+    PostFactory(tags=[tags[0]])
+    run_pending(batch_size=20)
+    one_tag = read_queries()
+
+    for tag in tags[1:]:
+        follow(api_client, tag)
+        PostFactory(tags=[tag])
+    run_pending(batch_size=50)
+
+    assert read_queries() == one_tag
+    # The popular follows and the timeline, the posts come from their cached fragments.
+    assert one_tag == 2
+
+
+@pytest.mark.django_db()
+def test_timelines_are_capped(api_client, user, settings):
+    settings.FEED = {"TIMELINE_CAP": 3}
+    tag = TagFactory()
+    follow(api_client, tag)
+    run_pending()
+    posts = PostFactory.create_batch(5, tags=[tag])
+    run_pending(batch_size=20)
+
+    newest = sorted(posts, key=lambda post: (post.updated_at, post.pk), reverse=True)[:3]
+    assert set(TimelineEntry.objects.filter(user=user).values_list("post_id", flat=True)) == {
+        post.pk for post in newest
+    }
+
+
+@pytest.mark.django_db()
+def test_popular_tags_are_merged_when_read(api_client, user):
+    popular, quiet = TagFactory(), TagFactory()
+    follow(api_client, popular)
+    follow(api_client, quiet)
+    Tag.objects.filter(pk=popular.pk).update(followers_count=10_000)
+    fanned_out = PostFactory(tags=[quiet])
+    merged = PostFactory(tags=[popular])
+    both = PostFactory(tags=[popular, quiet])
+    run_pending(batch_size=20)
+
+    assert set(TimelineEntry.objects.filter(user=user).values_list("post_id", flat=True)) == {fanned_out.pk, both.pk}
+    assert feed_ids(api_client)[0] == [str(both.pk), str(merged.pk), str(fanned_out.pk)]
+
+
+@pytest.mark.django_db()
+def test_unfollowed_and_unpublished_posts_leave_the_feed(api_client):
+    django, python = TagFactory(), TagFactory()
+    follow(api_client, django)
+    follow(api_client, python)
+    only_django = PostFactory(tags=[django])
+    both = PostFactory(tags=[django, python])
+    archived = PostFactory(tags=[python])
+    run_pending(batch_size=20)
+
+    response = api_client.delete(reverse("tag-follow", args=[django.pk]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    moderation.archive_posts(Post.objects.filter(pk=archived.pk))
+
+    assert feed_ids(api_client)[0] == [str(both.pk)]
+    assert not TimelineEntry.objects.filter(post_id=only_django.pk).exists()
+
+
+@pytest.mark.django_db()
+def test_drafts_enter_the_feed_when_published(api_client):
+    django = TagFactory()
+    follow(api_client, django)
+    draft = PostFactory(tags=[django], status=Status.DRAFT.value)
+    published = PostFactory(tags=[django])
+    run_pending(batch_size=20)
+    first_page, _ = feed_ids(api_client)
+
+    draft.status = Status.PUBLISHED.value
+    draft.save()
+    run_pending(batch_size=20)
+
+    assert first_page == [str(published.pk)]
+    assert feed_ids(api_client)[0] == [str(draft.pk), str(published.pk)]
+
+
+@pytest.mark.django_db()
+def test_untagged_posts_leave_the_feed(api_client, user):
+    django, python = TagFactory(), TagFactory()
+    follow(api_client, django)
+    follow(api_client, python)
+    untagged = PostFactory(tags=[django])
+    still_tagged = PostFactory(tags=[django, python])
+    run_pending(batch_size=20)
+
+    untagged.tags.remove(django)
+    still_tagged.tags.remove(django)
+    assert feed_ids(api_client)[0] == [str(still_tagged.pk)]
+
+    python.posts.remove(still_tagged)
+    assert feed_ids(api_client)[0] == []
@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.api.serializers import PostListSerializer
+from apps.posts.cache import get_post_version
+from apps.posts.models import Like
+
+from .factories import PostFactory, TagFactory
+
+
+@pytest.mark.django_db()
+def test_warm_listing_skips_serialization(api_client, monkeypatch):
+    PostFactory.create_batch(3, tags=[TagFactory()])
+    cold = api_client.get(reverse("post-list")).json()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Cached posts were serialized again")
+
+    monkeypatch.setattr(PostListSerializer, "to_representation", fail)
+    with CaptureQueriesContext(connection) as queries:
+        warm = api_client.get(reverse("post-list")).json()
+
+    assert warm == cold
+    # The count and the page ids.
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db()
+def test_viewer_fields_are_filled_per_request(api_client, other_user):
+    post = PostFactory()
+    Like.objects.create(user=other_user, post=post)
+    assert api_client.get(reverse("post-detail", args=[post.pk])).json()["is_liked"] is False
+
+    api_client.force_authenticate(user=other_user)
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("post-detail", args=[post.pk]))
+    assert response.json()["is_liked"] is True
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db()
+def test_fragments_follow_post_and_tag_changes(api_client, django_capture_on_commit_callbacks):
+    tag = TagFactory(name="Django")
+    post = PostFactory()
+    url = reverse("post-detail", args=[post.pk])
+    assert api_client.get(url).json()["tags"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.tags.add(tag)
+    assert [tag["name"] for tag in api_client.get(url).json()["tags"]] == ["Django"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tag.name = "Python"
+        tag.save()
+    assert [tag["name"] for tag in api_client.get(url).json()["tags"]] == ["Python"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Renamed"
+        post.save()
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Renamed"
+
+
+@pytest.mark.django_db()
+def test_versions_change_once_the_change_commits(django_capture_on_commit_callbacks):
+    post = PostFactory()
+    version = get_post_version(post.pk)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        post.title = "Renamed"
+        post.save()
+        assert get_post_version(post.pk) == version
+    for callback in callbacks:
+        callback()
+    assert get_post_version(post.pk) != version
+
+
+@pytest.mark.django_db()
+def test_recent_posts_pages_are_shared(api_client, other_user):
+    PostFactory.create_batch(3)
+    first = api_client.get(reverse("post-recent"), {"page_size": 2}).json()
+    assert first["count"] == 3
+    assert first["next"]
+
+    api_client.force_authenticate(user=other_user)
+    with CaptureQueriesContext(connection) as queries:
+        second = api_client.get(reverse("post-recent"), {"page_size": 2}).json()
+    assert second == first
+    assert len(queries) == 0
@@ -0,0 +1,55 @@
+from io import BytesIO
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+
+from apps.posts.models import Post
+from core.images import validate_image_upload
+
+
+def make_image(size=(1200, 800), image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(200, 30, 30)).save(buffer, image_format)
+    return SimpleUploadedFile("photo.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_VARIANTS_ASYNC = False
+
+
+def test_validate_rejects_non_images():
+    with pytest.raises(ValidationError):
+        validate_image_upload(SimpleUploadedFile("photo.jpg", b"not an image"))
+
+
+def test_validate_rejects_oversized_images(settings):
+    settings.IMAGE_MAX_PIXELS = 100 * 100
+    with pytest.raises(ValidationError):
+        validate_image_upload(make_image())
+
+
+@pytest.mark.django_db()
+def test_upload_generates_variants(api_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse("post-list"),
+            {"title": "Photo", "content": "Body", "featured_image": make_image()},
+            format="multipart",
+        )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    post = Post.objects.get(pk=response.json()["id"])
+    assert post.featured_image_variants["source"] == post.featured_image.name
+    assert post.featured_image_variants["thumbnail"]["width"] == 160
+    assert post.featured_image_variants["card"]["width"] == 640
+    assert post.featured_image_variants["full"]["width"] == 1200
+
+    response = api_client.get(reverse("post-detail", kwargs={"pk": post.pk}))
+    variants = response.json()["featured_image_variants"]
+    assert variants["card"]["webp"].endswith("/variants/card.webp")
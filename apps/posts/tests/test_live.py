@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.posts.live import publisher
+from apps.posts.models import Like
+from core.pubsub import hub
+
+from .factories import CommentFactory, PostFactory
+
+
+def bearer(user):
+    return {"authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+
+@pytest.fixture(autouse=True)
+def reset_publisher():
+    yield
+    publisher.publish()
+
+
+@pytest.mark.django_db()
+def test_likes_and_comments_mark_their_post(user, django_capture_on_commit_callbacks, monkeypatch):
+    marked = []
+    monkeypatch.setattr(publisher, "mark", marked.append)
+    post = PostFactory()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        like = Like.objects.create(user=user, post=post)
+        CommentFactory(post=post)
+        like.delete()
+
+    assert marked == [post.pk] * 3
+
+
+@pytest.mark.django_db()
+def test_publish_coalesces_changes(user, monkeypatch):
+    published = []
+    monkeypatch.setattr("apps.posts.live.get_broker", lambda: type("Broker", (), {"publish": published.append})())
+    post, other = PostFactory(), PostFactory()
+    Like.objects.create(user=user, post=post)
+    for post_id in (post.pk, post.pk, other.pk):
+        publisher.mark(post_id)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert publisher.publish() == 2
+
+    assert len(queries) == 1
+    assert len(published) == 1
+    counts = {message["channel"]: message["data"] for message in published[0]}
+    assert counts[f"post:{post.pk}"]["likes_count"] == 1
+    assert counts[f"post:{other.pk}"]["likes_count"] == 0
+
+
+@pytest.mark.django_db()
+def test_stream_sends_snapshot_then_changes(user):
+    post = PostFactory()
+    client = AsyncClient()
+
+    async def scenario():
+        response = await client.get(reverse("post-events"), {"posts": str(post.pk)}, headers=bearer(user))
+        assert response["Content-Type"] == "text/event-stream"
+        events = aiter(response.streaming_content)
+        assert await anext(events) == b"retry: 5000\n\n"
+        assert b'"likes_count":0' in await anext(events)
+        assert hub.subscriber_count() == 1
+
+        await sync_to_async(Like.objects.create)(user=user, post=post)
+        await sync_to_async(publisher.mark)(post.pk)
+        await sync_to_async(publisher.publish)()
+        event = await anext(events)
+        assert event.startswith(b"event: counts\n")
+        assert b'"likes_count":1' in event
+
+        # A client disconnecting cancels the stream while it waits.
+        waiting = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert hub.subscriber_count() == 0
+
+    async_to_sync(scenario)()
+
+
+@pytest.mark.django_db()
+def test_stream_requires_authentication_and_posts(user):
+    client = AsyncClient()
+    response = async_to_sync(client.get)(reverse("post-events"), {"posts": "x"})
+    assert response.status_code == 401
+
+    response = async_to_sync(client.get)(reverse("post-events"), {"posts": "not-a-uuid"}, headers=bearer(user))
+    assert response.status_code == 400
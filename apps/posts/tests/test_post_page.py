@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.api.views import REPLY_PREVIEWS
+from apps.posts.models import Like
+
+from .factories import CommentFactory, PostFactory, TagFactory
+
+
+@pytest.mark.django_db()
+def test_page_returns_post_comments_and_likes(api_client, user):
+    post = PostFactory(tags=[TagFactory()])
+    roots = [CommentFactory(post=post) for _ in range(3)]
+    replies = [CommentFactory(post=post, parent=roots[0]) for _ in range(REPLY_PREVIEWS + 2)]
+    Like.objects.create(user=user, post=post)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("post-page", args=[post.pk]), {"page_size": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["post"]["id"] == str(post.pk)
+    assert data["post"]["is_liked"] is True
+    assert data["likes"] == {"count": 1, "is_liked": True}
+    assert data["comments"]["count"] == 3
+    assert "page=2" in data["comments"]["next"]
+    results = data["comments"]["results"]
+    assert [comment["id"] for comment in results] == [str(roots[2].pk), str(roots[1].pk)]
+    assert results[0]["replies"] == results[1]["replies"] == []
+    # The post, its tags, the comment count, the comments, the replies and the viewer's like.
+    assert len(queries) == 6
+
+    response = api_client.get(reverse("post-page", args=[post.pk]), {"page_size": 3})
+    first = response.json()["comments"]["results"][2]
+    # Only the oldest replies are inlined.
+    assert first["replies_count"] == len(replies)
+    assert [reply["id"] for reply in first["replies"]] == [str(reply.pk) for reply in replies[:REPLY_PREVIEWS]]
+
+
+@pytest.mark.django_db()
+def test_page_is_cached_until_the_post_changes(api_client, other_user, django_capture_on_commit_callbacks):
+    post = PostFactory()
+    CommentFactory(post=post)
+    url = reverse("post-page", args=[post.pk])
+    api_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url)
+    assert response.json()["comments"]["count"] == 1
+    # Only the viewer's like state is read.
+    assert len(queries) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        CommentFactory(post=post)
+        Like.objects.create(user=other_user, post=post)
+    data = api_client.get(url).json()
+    assert data["comments"]["count"] == 2
+    assert data["likes"] == {"count": 1, "is_liked": False}
+
+
+@pytest.mark.django_db()
+def test_page_of_missing_post(api_client):
+    response = api_client.get(reverse("post-page", args=[uuid.uuid4()]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
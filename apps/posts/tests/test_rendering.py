@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.models import Post
+from apps.posts.rendering import render_artifacts
+
+from .factories import PostFactory
+
+
+def test_render_artifacts_escape_html():
+    artifacts = render_artifacts("Hello <script>alert(1)</script>\n\nSecond paragraph")
+    assert "<script>" not in artifacts["content_html"]
+    assert artifacts["content_html"].count("<p>") == 2
+    assert artifacts["word_count"] == 5
+    assert artifacts["reading_time"] == 1
+
+
+@pytest.mark.django_db()
+def test_artifacts_follow_content_changes():
+    post = PostFactory(content="one two three")
+    assert post.word_count == 3
+    assert post.excerpt == "one two three"
+
+    Post.objects.filter(pk=post.pk).update(content_html="stale")
+    post = Post.objects.get(pk=post.pk)
+    post.title = "Renamed"
+    post.save()
+    assert Post.objects.get(pk=post.pk).content_html == "stale"
+
+    post.content = "four five"
+    post.save(update_fields=["content"])
+    post.refresh_from_db()
+    assert post.word_count == 2
+    assert post.content_html == "<p>four five</p>"
+
+
+@pytest.mark.django_db()
+def test_rebuild_post_artifacts_backfills():
+    post = PostFactory(content="backfilled words")
+    Post.objects.filter(pk=post.pk).update(content_html="", excerpt="", word_count=0)
+    call_command("rebuild_post_artifacts")
+    post.refresh_from_db()
+    assert post.word_count == 2
+    assert post.content_html == "<p>backfilled words</p>"
+
+
+@pytest.mark.django_db()
+def test_listing_ships_excerpt_without_body(api_client, django_assert_max_num_queries):
+    PostFactory.create_batch(5)
+    # The count and the page ids, then the posts and their tags which are cached afterwards.
+    with django_assert_max_num_queries(4):
+        response = api_client.get(reverse("post-list"))
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()["results"][0]
+    assert "content" not in result
+    assert result["excerpt"]
+    assert result["reading_time"] >= 1
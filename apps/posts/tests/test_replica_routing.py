@@ -0,0 +1,44 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from core.routers import PIN_COOKIE_NAME, PrimaryReplicaRouter, is_user_pinned
+
+from .factories import PostFactory
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.REPLICA_DATABASES = ["replica"]
+
+
+def test_router_defaults_to_primary():
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(None) == "default"
+    assert router.db_for_write(None) == "default"
+    assert router.allow_migrate("replica", "posts") is False
+
+
+def test_list_reads_from_replica(api_client):
+    PostFactory()
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        response = api_client.get(reverse("post-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 1
+    assert len(replica_queries) > 0
+
+
+def test_write_pins_client_to_primary(api_client, user):
+    response = api_client.post(reverse("tag-list"), {"name": "Django"}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert PIN_COOKIE_NAME in response.cookies
+    assert is_user_pinned(user.pk)
+
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        response = api_client.get(reverse("tag-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(replica_queries) == 0
@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts.models import Status, Tag
+
+from .factories import PostFactory, TagFactory
+
+
+def counts(tag):
+    tag = Tag.objects.get(pk=tag.pk)
+    return tag.posts_count, tag.published_posts_count
+
+
+@pytest.mark.django_db()
+def test_counts_follow_tagging_and_status():
+    python, django = TagFactory(), TagFactory()
+    post = PostFactory(tags=[python, django])
+    draft = PostFactory(status=Status.DRAFT.value, tags=[python])
+    assert counts(python) == (2, 1)
+    assert counts(django) == (1, 1)
+
+    post.tags.remove(django)
+    assert counts(django) == (0, 0)
+
+    draft.status = Status.PUBLISHED.value
+    draft.save()
+    assert counts(python) == (2, 2)
+
+    python.posts.clear()
+    assert counts(python) == (0, 0)
+
+    django.posts.add(post, draft)
+    assert counts(django) == (2, 2)
+
+    post.delete()
+    assert counts(django) == (1, 1)
+
+
+@pytest.mark.django_db()
+def test_removing_unattached_tags_leaves_counts_alone():
+    python, unused = TagFactory(), TagFactory()
+    post, other = PostFactory(tags=[python]), PostFactory(tags=[python])
+
+    post.tags.remove(unused)
+    unused.posts.remove(post)
+    assert counts(unused) == (0, 0)
+
+    other.tags.remove(python)
+    post.tags.remove(python, unused)
+    python.posts.remove(other)
+    assert counts(python) == (0, 0)
+
+
+@pytest.mark.django_db()
+def test_recount_repairs_drift():
+    tag = TagFactory()
+    PostFactory.create_batch(3, tags=[tag])
+    Tag.objects.update(posts_count=0, published_posts_count=0)
+    call_command("recount_tag_posts")
+    assert counts(tag) == (3, 3)
+
+
+@pytest.mark.django_db()
+def test_tags_sorted_by_popularity(api_client, django_assert_max_num_queries):
+    quiet, popular = TagFactory(), TagFactory()
+    PostFactory.create_batch(2, tags=[popular])
+    PostFactory(tags=[quiet])
+
+    with django_assert_max_num_queries(2):
+        response = api_client.get(reverse("tag-list"), {"ordering": "popular"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [tag["posts_count"] for tag in response.json()["results"]] == [2, 1]
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.posts import tag_cache
+from apps.posts.models import Tag
+
+from .factories import PostFactory, TagFactory
+
+
+def listed_ids(response):
+    assert response.status_code == status.HTTP_200_OK
+    return {post["id"] for post in response.json()["results"]}
+
+
+@pytest.fixture()
+def tagged_posts():
+    python, django, rust = TagFactory(slug="python"), TagFactory(slug="django"), TagFactory(slug="rust")
+    return {
+        "both": PostFactory(tags=[python, django]),
+        "python": PostFactory(tags=[python]),
+        "rust": PostFactory(tags=[rust]),
+    }
+
+
+@pytest.mark.django_db()
+def test_single_tag_filter(api_client, tagged_posts):
+    response = api_client.get(reverse("post-list"), {"tag": "python"})
+    assert listed_ids(response) == {str(tagged_posts["both"].pk), str(tagged_posts["python"].pk)}
+
+
+@pytest.mark.django_db()
+def test_any_and_all_tag_filters(api_client, tagged_posts):
+    response = api_client.get(reverse("post-list"), {"tag": "django,rust"})
+    assert listed_ids(response) == {str(tagged_posts["both"].pk), str(tagged_posts["rust"].pk)}
+    assert response.json()["count"] == 2
+
+    response = api_client.get(reverse("post-list"), {"tag": ["python", "django"], "tag_match": "all"})
+    assert listed_ids(response) == {str(tagged_posts["both"].pk)}
+
+    response = api_client.get(reverse("post-list"), {"tag": "python,unknown", "tag_match": "all"})
+    assert listed_ids(response) == set()
+
+
+@pytest.mark.django_db()
+def test_slugs_resolved_once_until_tags_change(tagged_posts, django_capture_on_commit_callbacks):
+    tag_cache.resolve_slugs(["python"])
+    with CaptureQueriesContext(connection) as queries:
+        tag_cache.resolve_slugs(["python"])
+    assert len(queries) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TagFactory(slug="go")
+    with CaptureQueriesContext(connection) as queries:
+        tag_cache.resolve_slugs(["python"])
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db()
+def test_recreated_slugs_resolve_to_the_new_tag(tagged_posts, django_capture_on_commit_callbacks):
+    python = tag_cache.resolve_slugs(["python"])["python"]
+    with django_capture_on_commit_callbacks(execute=True):
+        Tag.objects.get(pk=python).delete()
+        TagFactory(slug="python")
+
+    assert tag_cache.resolve_slugs(["python"])["python"] != python
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.posts import trending
+from apps.posts.models import Like, Post, Status, TrendingScore
+
+from .factories import CommentFactory, PostFactory, UserFactory
+
+
+def test_newer_events_outweigh_older_ones():
+    now = timezone.now()
+    assert trending.event_score(1.0, now) > trending.event_score(1.0, now - timedelta(days=1))
+    # One half-life later an event of half the weight scores the same.
+    assert trending.event_score(1.0, now - timedelta(days=1)) == pytest.approx(trending.event_score(0.5, now))
+
+
+@pytest.mark.django_db()
+def test_scores_follow_status_and_events():
+    quiet, busy = PostFactory(), PostFactory()
+    draft = PostFactory(status=Status.DRAFT.value)
+    assert not TrendingScore.objects.filter(post=draft).exists()
+
+    Like.objects.create(user=UserFactory(), post=busy)
+    CommentFactory(post=busy)
+    quiet_score = TrendingScore.objects.get(post=quiet).score
+    busy_score = TrendingScore.objects.get(post=busy).score
+    assert busy_score > quiet_score
+
+    busy.status = Status.ARCHIVED.value
+    busy.save()
+    assert not TrendingScore.objects.filter(post=busy).exists()
+
+
+@pytest.mark.django_db()
+def test_recompute_matches_incremental_scores():
+    post = PostFactory()
+    for _ in range(3):
+        Like.objects.create(user=UserFactory(), post=post)
+    CommentFactory(post=post)
+    incremental_score = TrendingScore.objects.get(post=post).score
+    TrendingScore.objects.all().delete()
+
+    call_command("recompute_trending")
+    assert TrendingScore.objects.get(post=post).score == pytest.approx(incremental_score, abs=1e-3)
+
+
+@pytest.mark.django_db()
+def test_trending_endpoint_orders_by_score(api_client, django_assert_max_num_queries):
+    quiet, busy = PostFactory(), PostFactory()
+    Like.objects.create(user=UserFactory(), post=busy)
+    CommentFactory(post=busy)
+
+    with django_assert_max_num_queries(3):
+        response = api_client.get(reverse("post-trending"))
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in response.json()] == [str(busy.pk), str(quiet.pk)]
+
+
+@pytest.mark.django_db()
+def test_scores_rank_posts_by_publication_time():
+    draft = PostFactory(status=Status.DRAFT.value)
+    Post.objects.filter(pk=draft.pk).update(updated_at=timezone.now() - timedelta(days=3))
+    draft.refresh_from_db()
+    draft.status = Status.PUBLISHED.value
+    draft.save()
+    published_score = TrendingScore.objects.get(post=draft).score
+
+    call_command("recompute_trending")
+
+    assert draft.published_at > draft.updated_at
+    assert TrendingScore.objects.get(post=draft).score == pytest.approx(published_score, abs=1e-3)
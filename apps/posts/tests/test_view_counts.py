@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.posts import view_counts
+from apps.posts.models import PostViews
+from apps.posts.view_counts import (
+    DIRTY_KEY,
+    DIRTY_LOCK_KEY,
+    SKETCH_LOCK_KEY,
+    HyperLogLog,
+    ViewTracker,
+    sketch_key,
+    total_key,
+    view_tracker,
+)
+
+from .factories import PostFactory, UserFactory
+
+
+def test_hyperloglog_estimates_cardinality():
+    sketch = HyperLogLog(precision=10)
+    for index in range(20000):
+        sketch.add(f"viewer-{index % 10000}")
+    assert abs(sketch.count() - 10000) / 10000 < 0.1
+    assert len(sketch.to_bytes()) == 1024
+
+
+def test_hyperloglog_merge_is_a_union():
+    first, second = HyperLogLog(precision=10), HyperLogLog(precision=10)
+    for index in range(300):
+        first.add(f"viewer-{index}")
+        second.add(f"viewer-{index + 150}")
+    first.merge(second)
+    assert abs(first.count() - 450) < 30
+    assert HyperLogLog.from_bytes(first.to_bytes()).count() == first.count()
+
+
+@pytest.mark.django_db()
+def test_views_are_buffered_then_persisted(api_client, settings, django_capture_on_commit_callbacks):
+    settings.POST_VIEWS = {**settings.POST_VIEWS, "FLUSH_INTERVAL": 0}
+    post = PostFactory()
+    viewers = [APIClient() for _ in range(3)]
+    for client in viewers:
+        client.force_authenticate(user=UserFactory())
+    for client in [*viewers, viewers[0]]:
+        client.get(reverse("post-detail", kwargs={"pk": post.pk}))
+
+    view_tracker.flush()
+    assert not PostViews.objects.filter(post=post).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("flush_post_views")
+    stats = PostViews.objects.get(post=post)
+    assert stats.total_views == 4
+    assert stats.unique_views == 3
+
+    response = api_client.get(reverse("post-detail", kwargs={"pk": post.pk}))
+    assert response.json()["views"] == 4
+    assert response.json()["unique_views"] == 3
+
+
+def test_idle_trackers_flush_on_a_timer(settings):
+    settings.POST_VIEWS = {**settings.POST_VIEWS, "FLUSH_INTERVAL": 0.01}
+    tracker = ViewTracker()
+    tracker.record("post", "viewer")
+
+    deadline = time.monotonic() + 2
+    while cache.get(total_key("post")) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get(total_key("post")) == 1
+
+
+def test_sketches_are_merged_under_a_lock(monkeypatch):
+    monkeypatch.setattr(view_counts, "SKETCH_LOCK_WAIT", 0)
+    first, second = ViewTracker(), ViewTracker()
+    first.record("post", "viewer-1")
+    second.record("post", "viewer-2")
+
+    cache.add(SKETCH_LOCK_KEY, True)
+    first.flush()
+    # The lock holder is not overwritten, the sketch is kept for the next flush.
+    assert cache.get(sketch_key("post")) is None
+    cache.delete(SKETCH_LOCK_KEY)
+
+    second.flush()
+    first.flush()
+    assert HyperLogLog.from_bytes(cache.get(sketch_key("post"))).count() == 2
+
+
+def test_contended_dirty_marks_are_retried_on_a_timer(settings):
+    settings.POST_VIEWS = {**settings.POST_VIEWS, "FLUSH_INTERVAL": 0.01}
+    tracker = ViewTracker()
+    tracker.record("post", "viewer")
+
+    cache.add(DIRTY_LOCK_KEY, True)
+    tracker.flush()
+    assert cache.get(DIRTY_KEY) is None
+    cache.delete(DIRTY_LOCK_KEY)
+
+    deadline = time.monotonic() + 2
+    while cache.get(DIRTY_KEY) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get(DIRTY_KEY) == {"post"}
+
+
+@pytest.mark.django_db()
+def test_totals_are_kept_when_persisting_fails(monkeypatch):
+    post = PostFactory()
+    PostViews.objects.create(post=post, total_views=5)
+    view_tracker.record(post.pk, "viewer")
+    view_tracker.flush()
+
+    def fail(*args, **kwargs):
+        raise DatabaseError("Connection lost")
+
+    monkeypatch.setattr(PostViews.objects, "bulk_create", fail)
+    with pytest.raises(DatabaseError):
+        view_counts.persist_views()
+    assert cache.get(total_key(post.pk)) == 1
+
+    monkeypatch.undo()
+    assert view_counts.persist_views() == 1
+    assert PostViews.objects.get(post=post).total_views == 6
+    assert cache.get(total_key(post.pk)) == 0
@@ -0,0 +1,98 @@
+"""Time-decayed popularity of published posts.
+
+Every like, comment and the publication itself is an event of weight `w` at time `t`. A post's
+popularity is the sum of `w * exp(-λ (now - t))` over its events, λ being derived from the
+configured half-life. Since `now` is shared by every post it can be factored out, so the stored
+score is `ln(Σ w * exp(λ (t - EPOCH)))`: it only changes when an event happens, an event is
+folded in with a single atomic log-add-exp UPDATE, and ordering by it orders by popularity.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone as django_timezone
+
+from .models import Comment, Like, Post, Status, TrendingScore
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+DEFAULTS = {
+    "HALF_LIFE_HOURS": 24,
+    "PUBLISH_WEIGHT": 1.0,
+    "LIKE_WEIGHT": 1.0,
+    "COMMENT_WEIGHT": 3.0,
+    # Events older than this are ignored when scores are recomputed in bulk.
+    "WINDOW_DAYS": 14,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "TRENDING", {}).get(name, DEFAULTS[name])
+
+
+def event_score(weight: float, at: datetime) -> float:
+    decay_rate = math.log(2) / (get_setting("HALF_LIFE_HOURS") * 3600)
+    return math.log(weight) + decay_rate * (at - EPOCH).total_seconds()
+
+
+def log_add_exp(a: float, b: float) -> float:
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def record_event(post_id, weight: float, at: datetime) -> None:
+    """Fold an event into the score of `post_id`, if the post is trending at all."""
+    event = Value(event_score(weight, at))
+    TrendingScore.objects.filter(post_id=post_id).update(
+        score=Greatest(F("score"), event) + Ln(Value(1.0) + Exp(-Abs(F("score") - event))),
+    )
+
+
+def record_like(like: Like) -> None:
+    record_event(like.post_id, get_setting("LIKE_WEIGHT"), like.created_at)
+
+
+def record_comment(comment: Comment) -> None:
+    record_event(comment.post_id, get_setting("COMMENT_WEIGHT"), comment.created_at)
+
+
+def sync_post(post: Post) -> None:
+    """Start tracking `post` when it is published and stop once it no longer is."""
+    if post.status == Status.PUBLISHED.value:
+        TrendingScore.objects.get_or_create(
+            post=post,
+            defaults={"score": event_score(get_setting("PUBLISH_WEIGHT"), post.published_at)},
+        )
+    else:
+        TrendingScore.objects.filter(post=post).delete()
+
+
+def recompute_scores(batch_size: int = 1000) -> int:
+    """Rebuild every score from the events in the trending window and return the number of posts."""
+    since = django_timezone.now() - timedelta(days=get_setting("WINDOW_DAYS"))
+    like_weight, comment_weight = get_setting("LIKE_WEIGHT"), get_setting("COMMENT_WEIGHT")
+
+    scores = {
+        post_id: event_score(get_setting("PUBLISH_WEIGHT"), published_at)
+        for post_id, published_at in Post.objects.filter(status=Status.PUBLISHED.value)
+        .values_list("id", "published_at")
+        .iterator(chunk_size=batch_size)
+    }
+    for model, weight in ((Like, like_weight), (Comment, comment_weight)):
+        events = model.objects.filter(created_at__gte=since, post__status=Status.PUBLISHED.value)
+        for post_id, created_at in events.values_list("post_id", "created_at").iterator(chunk_size=batch_size):
+            if post_id in scores:
+                scores[post_id] = log_add_exp(scores[post_id], event_score(weight, created_at))
+
+    TrendingScore.objects.exclude(post__status=Status.PUBLISHED.value).delete()
+    TrendingScore.objects.bulk_create(
+        [TrendingScore(post_id=post_id, score=score) for post_id, score in scores.items()],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["post"],
+        update_fields=["score", "updated_at"],
+    )
+    return len(scores)
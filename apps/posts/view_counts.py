@@ -0,0 +1,289 @@
+"""Post view counting.
+
+Views are recorded in memory, as a HyperLogLog sketch of the viewers plus a total per post,
+and merged into the shared cache by a timer `FLUSH_INTERVAL` seconds after the first view
+buffered, and when the process exits. Totals are merged with atomic increments, sketches under
+`SKETCH_LOCK_KEY` so concurrent workers never overwrite each other's registers. The
+`flush_post_views` command periodically persists what the workers merged into `PostViews` with
+one bulk upsert and adds the totals in the same transaction, so no request ever writes to the
+database to count a view. Totals leave the cache only once they are committed.
+"""
+
+import atexit
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from .cache import bump_post_versions
+
+DEFAULTS = {
+    # Seconds a worker buffers views before merging them into the shared cache.
+    "FLUSH_INTERVAL": 10,
+    # 2 ** PRECISION one byte registers per sketch, for a standard error of 1.04 / sqrt(2 ** PRECISION).
+    "PRECISION": 10,
+    "CACHE_TIMEOUT": 7 * 24 * 60 * 60,
+}
+
+DIRTY_KEY = "views:dirty"
+DIRTY_LOCK_KEY = "views:dirty:lock"
+SKETCH_LOCK_KEY = "views:sketch:lock"
+# Seconds a flush waits for the sketch lock before keeping its sketches for the next one.
+SKETCH_LOCK_WAIT = 1
+# Seconds the lock outlives a worker that died holding it.
+SKETCH_LOCK_TIMEOUT = 10
+PERSIST_LOCK_KEY = "views:persist:lock"
+PERSIST_LOCK_TIMEOUT = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def get_setting(name):
+    return getattr(settings, "POST_VIEWS", {}).get(name, DEFAULTS[name])
+
+
+class HyperLogLog:
+    """A HyperLogLog cardinality sketch with `2 ** precision` registers."""
+
+    def __init__(self, precision: int = None, registers: bytes = None):
+        self.precision = precision or get_setting("PRECISION")
+        self.size = 1 << self.precision
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError("Register count does not match the sketch precision.")
+
+    def add(self, value: str) -> None:
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        remainder = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(max(pair) for pair in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0**-register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        return cls(precision=len(data).bit_length() - 1, registers=data)
+
+
+def sketch_key(post_id) -> str:
+    return f"views:sketch:{post_id}"
+
+
+def total_key(post_id) -> str:
+    return f"views:total:{post_id}"
+
+
+class ViewTracker:
+    """Buffers the views recorded by this worker until they are merged into the cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sketches = {}
+        self._totals = {}
+        self._unmerged = {}
+        self._unmarked = set()
+        self._timer = None
+
+    def record(self, post_id, viewer: str) -> None:
+        with self._lock:
+            if post_id not in self._sketches:
+                self._sketches[post_id] = HyperLogLog()
+                self._totals[post_id] = 0
+            self._sketches[post_id].add(viewer)
+            self._totals[post_id] += 1
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        # Flushed even if no other view arrives, so idle workers do not hold views back.
+        if self._timer is None:
+            self._timer = threading.Timer(get_setting("FLUSH_INTERVAL"), self._flush_in_thread)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_thread(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not flush post views")
+
+    def flush(self) -> None:
+        """Merge the buffered views into the shared cache."""
+        with self._lock:
+            sketches, totals = self._sketches, self._totals
+            self._sketches, self._totals = {}, {}
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            for post_id, sketch in self._unmerged.items():
+                if post_id in sketches:
+                    sketches[post_id].merge(sketch)
+                else:
+                    sketches[post_id] = sketch
+            self._unmerged = {}
+            unmarked, self._unmarked = self._unmarked, set()
+        if not sketches:
+            self._mark_dirty(unmarked)
+            return
+
+        timeout = get_setting("CACHE_TIMEOUT")
+        if not self._merge_sketches(sketches, timeout):
+            # Another worker held the lock for too long, merged on the next flush instead.
+            with self._lock:
+                for post_id, sketch in sketches.items():
+                    if post_id in self._unmerged:
+                        sketch.merge(self._unmerged[post_id])
+                    self._unmerged[post_id] = sketch
+                self._schedule_flush()
+
+        for post_id, total in totals.items():
+            # add() only creates the key, so concurrent workers never overwrite each other's counts.
+            if not cache.add(total_key(post_id), total, timeout):
+                try:
+                    cache.incr(total_key(post_id), total)
+                except ValueError:
+                    # The key expired in between.
+                    cache.set(total_key(post_id), total, timeout)
+
+        self._mark_dirty(set(sketches) | unmarked)
+
+    def _merge_sketches(self, sketches: dict, timeout: int) -> bool:
+        """Merge `sketches` into the cached ones under the sketch lock and return whether it was acquired."""
+        deadline = time.monotonic() + SKETCH_LOCK_WAIT
+        while not cache.add(SKETCH_LOCK_KEY, True, SKETCH_LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        try:
+            stored = cache.get_many([sketch_key(post_id) for post_id in sketches])
+            for post_id, sketch in sketches.items():
+                if sketch_key(post_id) in stored:
+                    sketch.merge(HyperLogLog.from_bytes(stored[sketch_key(post_id)]))
+            cache.set_many({sketch_key(post_id): sketch.to_bytes() for post_id, sketch in sketches.items()}, timeout)
+        finally:
+            cache.delete(SKETCH_LOCK_KEY)
+        return True
+
+    def _mark_dirty(self, post_ids: set) -> None:
+        if not post_ids:
+            return
+        if not mark_dirty(post_ids):
+            # Another worker is updating the set, retried by the next flush even if no view arrives.
+            with self._lock:
+                self._unmarked |= post_ids
+                self._schedule_flush()
+
+
+def mark_dirty(post_ids) -> bool:
+    """Add `post_ids` to the posts whose views are to be persisted, unless the set is being updated."""
+    if not cache.add(DIRTY_LOCK_KEY, True, 5):
+        return False
+    try:
+        cache.set(DIRTY_KEY, set(cache.get(DIRTY_KEY, set())) | set(post_ids), get_setting("CACHE_TIMEOUT"))
+    finally:
+        cache.delete(DIRTY_LOCK_KEY)
+    return True
+
+
+view_tracker = ViewTracker()
+atexit.register(view_tracker.flush)
+
+
+def viewer_key(request) -> str:
+    """Identify the viewer of `request`: the user when signed in, the client address otherwise."""
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"client:{request.META.get('REMOTE_ADDR', '')}:{request.META.get('HTTP_USER_AGENT', '')}"
+
+
+def persist_views(batch_size: int = 500) -> int:
+    """Persist the views merged into the cache since the last run and return the number of posts."""
+    # One run at a time, overlapping runs would both persist the totals they read.
+    if not cache.add(PERSIST_LOCK_KEY, True, PERSIST_LOCK_TIMEOUT):
+        return 0
+    try:
+        if not cache.add(DIRTY_LOCK_KEY, True, 5):
+            return 0
+        try:
+            post_ids = list(cache.get(DIRTY_KEY, set()))
+            cache.delete(DIRTY_KEY)
+        finally:
+            cache.delete(DIRTY_LOCK_KEY)
+        try:
+            return _persist_views(post_ids, batch_size)
+        except Exception:
+            # Persisted again by the next run, their cached totals were left in place.
+            mark_dirty(post_ids)
+            raise
+    finally:
+        cache.delete(PERSIST_LOCK_KEY)
+
+
+def _persist_views(post_ids: list, batch_size: int) -> int:
+    from .models import Post, PostViews
+
+    persisted = 0
+    for start in range(0, len(post_ids), batch_size):
+        batch = post_ids[start : start + batch_size]
+        existing = PostViews.objects.in_bulk(batch)
+        sketches = cache.get_many([sketch_key(post_id) for post_id in batch])
+        totals = cache.get_many([total_key(post_id) for post_id in batch])
+        live_posts = set(Post.objects.filter(pk__in=batch).values_list("pk", flat=True))
+
+        rows, persisted_totals = [], {}
+        for post_id in batch:
+            if post_id not in live_posts:
+                continue
+            row = existing.get(post_id) or PostViews(post_id=post_id)
+            sketch = HyperLogLog.from_bytes(bytes(row.sketch)) if row.sketch else HyperLogLog()
+            # Sketch merges are idempotent, so the cached sketch is left in place for later runs.
+            if sketch_key(post_id) in sketches:
+                sketch.merge(HyperLogLog.from_bytes(sketches[sketch_key(post_id)]))
+            if totals.get(total_key(post_id)):
+                persisted_totals[post_id] = totals[total_key(post_id)]
+            row.sketch = sketch.to_bytes()
+            row.unique_views = sketch.count()
+            rows.append(row)
+
+        with transaction.atomic():
+            PostViews.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["post"],
+                update_fields=["sketch", "unique_views", "updated_at"],
+            )
+            if persisted_totals:
+                added = [When(post_id=post_id, then=Value(total)) for post_id, total in persisted_totals.items()]
+                PostViews.objects.filter(post_id__in=persisted_totals).update(
+                    total_views=F("total_views") + Case(*added, default=Value(0))
+                )
+        # Only the persisted views are taken off the totals, views merged meanwhile are kept.
+        for post_id, total in persisted_totals.items():
+            try:
+                cache.decr(total_key(post_id), total)
+            except ValueError:
+                pass
+        bump_post_versions([row.post_id for row in rows])
+        persisted += len(rows)
+    return persisted
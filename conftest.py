@@ -0,0 +1,32 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.posts.autocomplete import invalidate_trie
+from apps.posts.tests.factories import UserFactory
+from core.throttling import bucket_store
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Process-local caches outlive the per-test database transaction.
+    cache.clear()
+    invalidate_trie()
+    bucket_store.clear()
+
+
+@pytest.fixture()
+def user():
+    return UserFactory()
+
+
+@pytest.fixture()
+def other_user():
+    return UserFactory()
+
+
+@pytest.fixture()
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
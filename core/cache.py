@@ -0,0 +1,307 @@
+"""Two tier cache backend: a bounded in-process LRU in front of a shared cache.
+
+Keys starting with one of `LOCAL_PREFIXES` are also kept in the memory of every process, for at
+most `LOCAL_TIMEOUT` seconds, evicting the least recently used entries beyond `LOCAL_MAX_ENTRIES`
+entries or `LOCAL_MAX_BYTES` pickled bytes. Every other key goes straight to the shared tier, the
+cache alias named by `SHARED`.
+
+Writes reach the local copies of other processes through version stamps. Every local prefix has a
+stamp in the shared tier, replaced on each write of one of its keys; processes re-read the stamps
+at most every `STAMP_INTERVAL` seconds and drop the entries stored under an older stamp, so they
+serve a value overwritten elsewhere for at most that long. Keys under `VERSIONED_PREFIXES` embed
+the version of their value, are never rewritten and need no stamp.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MISSING = object()
+
+STAMP_KEY_PREFIX = "cache:stamp:"
+
+
+class LocalTier:
+    """Thread safe LRU of pickled values, each with an expiry and the stamp it was stored under."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key, stamp):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            pickled, expires_at, entry_stamp = entry
+            if expires_at <= time.monotonic() or entry_stamp != stamp:
+                if entry_stamp != stamp:
+                    self.invalidations += 1
+                else:
+                    self.expirations += 1
+                self.misses += 1
+                self._remove(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout: float, stamp) -> None:
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if timeout <= 0 or len(pickled) > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (pickled, time.monotonic() + timeout, stamp)
+            self.size += len(pickled)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options.get("SHARED", "shared")
+        self.local_prefixes = tuple(options.get("LOCAL_PREFIXES", ()))
+        self.versioned_prefixes = tuple(options.get("VERSIONED_PREFIXES", ()))
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 60)
+        self.stamp_interval = options.get("STAMP_INTERVAL", 1.0)
+        self.local = LocalTier(options.get("LOCAL_MAX_ENTRIES", 10_000), options.get("LOCAL_MAX_BYTES", 64 << 20))
+        self.shared_hits = self.shared_misses = 0
+        self._stamps = {}
+        self._stamps_read_at = float("-inf")
+        self._stamps_lock = threading.Lock()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def _prefix(self, key):
+        """Return the local prefix of `key`, None when it is only kept in the shared tier."""
+        for prefix in self.local_prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return None
+
+    def _local_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _local_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return self.local_timeout if timeout is None else min(timeout - time.time(), self.local_timeout)
+
+    # Stamps
+
+    def _stamp(self, prefix):
+        if prefix in self.versioned_prefixes:
+            return 0
+        if time.monotonic() - self._stamps_read_at >= self.stamp_interval:
+            self._read_stamps()
+        return self._stamps.get(prefix)
+
+    def _read_stamps(self) -> None:
+        prefixes = [prefix for prefix in self.local_prefixes if prefix not in self.versioned_prefixes]
+        with self._stamps_lock:
+            stored = self.shared.get_many([STAMP_KEY_PREFIX + prefix for prefix in prefixes])
+            stamps = {}
+            for prefix in prefixes:
+                stamp = stored.get(STAMP_KEY_PREFIX + prefix)
+                if stamp is None:
+                    # A stamp never seen before, so entries stored under an evicted one are dropped.
+                    self.shared.add(STAMP_KEY_PREFIX + prefix, time.time_ns(), None)
+                    stamp = self.shared.get(STAMP_KEY_PREFIX + prefix)
+                stamps[prefix] = stamp
+            self._stamps = stamps
+            self._stamps_read_at = time.monotonic()
+
+    def _bump_stamps(self, prefixes) -> None:
+        prefixes = {prefix for prefix in prefixes if prefix is not None and prefix not in self.versioned_prefixes}
+        if not prefixes:
+            return
+        stamp = time.time_ns()
+        self.shared.set_many({STAMP_KEY_PREFIX + prefix: stamp for prefix in prefixes}, None)
+        with self._stamps_lock:
+            self._stamps = {**self._stamps, **dict.fromkeys(prefixes, stamp)}
+
+    # Reads
+
+    def get(self, key, default=None, version=None):
+        prefix = self._prefix(key)
+        if prefix is None:
+            return self.shared.get(key, default, version=version)
+
+        local_key = self._local_key(key, version)
+        # Read before the shared value, a write in between then invalidates the copy.
+        stamp = self._stamp(prefix)
+        value = self.local.get(local_key, stamp)
+        if value is not MISSING:
+            return value
+
+        value = self.shared.get(key, MISSING, version=version)
+        if value is MISSING:
+            self.shared_misses += 1
+            return default
+        self.shared_hits += 1
+        self.local.set(local_key, value, self.local_timeout, stamp)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = {}
+        for key in keys:
+            prefix = self._prefix(key)
+            if prefix is None:
+                remote[key] = None
+                continue
+            stamp = self._stamp(prefix)
+            value = self.local.get(self._local_key(key, version), stamp)
+            if value is MISSING:
+                remote[key] = stamp
+            else:
+                found[key] = value
+
+        if remote:
+            stored = self.shared.get_many(remote, version=version)
+            found.update(stored)
+            for key, stamp in remote.items():
+                if self._prefix(key) is None:
+                    continue
+                if key not in stored:
+                    self.shared_misses += 1
+                    continue
+                self.shared_hits += 1
+                self.local.set(self._local_key(key, version), stored[key], self.local_timeout, stamp)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, MISSING, version=version) is not MISSING
+
+    # Writes
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        local = {key: value for key, value in data.items() if self._prefix(key) is not None}
+        self._bump_stamps(self._prefix(key) for key in local)
+        for key, value in local.items():
+            local_key = self._local_key(key, version)
+            if key in failed:
+                self.local.delete(local_key)
+            else:
+                self.local.set(local_key, value, self._local_timeout(timeout), self._stamp(self._prefix(key)))
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        prefix = self._prefix(key)
+        # The key was missing, so no process holds a copy that needs invalidating.
+        if added and prefix is not None:
+            self.local.set(self._local_key(key, version), value, self._local_timeout(timeout), self._stamp(prefix))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.delete(self._local_key(key, version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._forget([key], version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self.shared.decr(key, delta, version=version)
+        self._forget([key], version)
+        return value
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        self._forget([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        self._forget(keys, version)
+
+    def _forget(self, keys, version) -> None:
+        local = [key for key in keys if self._prefix(key) is not None]
+        self._bump_stamps(self._prefix(key) for key in local)
+        for key in local:
+            self.local.delete(self._local_key(key, version))
+
+    def clear(self):
+        self.shared.clear()
+        self.local.clear()
+        # The stamps were cleared too, replace them so copies in other processes are dropped.
+        self._bump_stamps(self.local_prefixes)
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    # Metrics
+
+    def stats(self) -> dict:
+        local = self.local
+        lookups = local.hits + local.misses
+        return {
+            "local": {
+                "entries": len(local),
+                "max_entries": local.max_entries,
+                "bytes": local.size,
+                "max_bytes": local.max_bytes,
+                "hits": local.hits,
+                "misses": local.misses,
+                "hit_rate": round(local.hits / lookups, 4) if lookups else None,
+                "evictions": local.evictions,
+                "expirations": local.expirations,
+                "invalidations": local.invalidations,
+            },
+            "shared": {
+                "alias": self.shared_alias,
+                "backend": f"{type(self.shared).__module__}.{type(self.shared).__name__}",
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+            },
+        }
+
+
+def check_cache(alias: str = "default") -> float:
+    """Write and read back a key through cache `alias` and return the round trip in milliseconds."""
+    cache = caches[alias]
+    probe = str(time.time_ns())
+    started = time.perf_counter()
+    cache.set("health:probe", probe, 10)
+    if cache.get("health:probe") != probe:
+        raise RuntimeError(f"Cache {alias!r} did not return the value just written.")
+    return (time.perf_counter() - started) * 1000
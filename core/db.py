@@ -0,0 +1,55 @@
+import json
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def get_pool_stats(alias: str = DEFAULT_DB_ALIAS) -> dict:
+    """Return connection reuse statistics for the database `alias`.
+
+    When the alias is configured with a psycopg pool the pool's own counters are returned,
+    otherwise the persistent connection settings and the state of this thread's connection.
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    pool = getattr(connection, "pool", None)
+
+    if pool is not None:
+        return {
+            "alias": alias,
+            "mode": "pool",
+            **pool.get_stats(),
+        }
+
+    return {
+        "alias": alias,
+        "mode": "persistent" if settings_dict.get("CONN_MAX_AGE") else "per-request",
+        "vendor": connection.vendor,
+        "conn_max_age": settings_dict.get("CONN_MAX_AGE"),
+        "health_checks": settings_dict.get("CONN_HEALTH_CHECKS", False),
+        "connected": connection.connection is not None,
+        "in_atomic_block": connection.in_atomic_block,
+    }
+
+
+def check_database(alias: str = DEFAULT_DB_ALIAS) -> float:
+    """Run a trivial query against `alias` and return its round trip in milliseconds."""
+    started = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return (time.perf_counter() - started) * 1000
+
+
+def estimate_count(queryset) -> int | None:
+    """Return the planner's row estimate for `queryset`, or None when the database has none."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,160 @@
+import logging
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+from apps.jobs.registry import task
+
+log = logging.getLogger(__name__)
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+# Output formats of every variant, as (extension, Pillow format, save options).
+VARIANT_FORMATS = [
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+]
+
+GENERATE_VARIANTS_TASK = "images.generate_variants"
+
+
+def validate_image_upload(value):
+    """Validate an uploaded image from its header, without decoding the pixel data."""
+    max_size = settings.IMAGE_MAX_UPLOAD_SIZE
+    if value.size is not None and value.size > max_size:
+        raise ValidationError(
+            f"Image files may not be larger than {max_size // (1024 * 1024)} MB.",
+            code="image_too_large",
+        )
+
+    source = value.temporary_file_path() if hasattr(value, "temporary_file_path") else value
+    try:
+        with Image.open(source) as image:
+            image_format, (width, height) = image.format, image.size
+            # verify() walks the file structure but never allocates the decoded bitmap.
+            image.verify()
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise ValidationError("Upload a valid image.", code="invalid_image") from exc
+    finally:
+        if hasattr(value, "seek"):
+            value.seek(0)
+
+    if image_format not in ALLOWED_FORMATS:
+        raise ValidationError(f"Unsupported image format {image_format}.", code="invalid_image_format")
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError("Image dimensions are too large.", code="image_too_large")
+
+
+def _variant_path(name: str, variant: str, extension: str) -> str:
+    stem, _ = os.path.splitext(name)
+    return f"{stem}/variants/{variant}.{extension}"
+
+
+def render_variants(field_file) -> dict:
+    """Write the configured resized variants of `field_file` to its storage.
+
+    Returns a mapping of variant name to the stored path of every output format, along with
+    the source name the variants were generated from.
+    """
+    storage = field_file.storage
+    largest = max(max(size) for size in settings.IMAGE_VARIANTS.values())
+    variants = {"source": field_file.name}
+
+    with field_file.storage.open(field_file.name, "rb") as source, Image.open(source) as image:
+        # Let the JPEG decoder downscale while decoding instead of materialising the original.
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for variant, (width, height) in settings.IMAGE_VARIANTS.items():
+            if variant == "thumbnail":
+                resized = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+            else:
+                resized = image.copy()
+                resized.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+            paths = {}
+            for extension, image_format, options in VARIANT_FORMATS:
+                output = resized.convert("RGB") if image_format == "JPEG" else resized
+                buffer = BytesIO()
+                output.save(buffer, image_format, **options)
+                path = _variant_path(field_file.name, variant, extension)
+                if storage.exists(path):
+                    storage.delete(path)
+                paths[extension] = storage.save(path, ContentFile(buffer.getvalue()))
+            variants[variant] = {**paths, "width": resized.width, "height": resized.height}
+
+    return variants
+
+
+@task(GENERATE_VARIANTS_TASK)
+def generate_variants(model: str, pk, field_name: str, variants_field: str) -> None:
+    model = apps.get_model(model)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return
+
+    variants = render_variants(field_file)
+    # Only record the variants if the image did not change while they were being generated.
+    model._default_manager.filter(pk=pk, **{field_name: field_file.name}).update(**{variants_field: variants})
+
+
+def schedule_variants(model, pk, field_name: str, variants_field: str) -> None:
+    """Generate variants in a background job, or once the current transaction commits."""
+    arguments = {"model": model._meta.label, "pk": str(pk), "field_name": field_name, "variants_field": variants_field}
+    if settings.IMAGE_VARIANTS_ASYNC:
+        from apps.jobs.queue import enqueue
+
+        enqueue(GENERATE_VARIANTS_TASK, arguments)
+        return
+
+    def generate():
+        try:
+            generate_variants(**arguments)
+        except Exception:
+            log.exception("Generating %s variants failed for %s %s", field_name, model.__name__, pk)
+
+    transaction.on_commit(generate)
+
+
+def register_image_variants(model, field_name: str, variants_field: str) -> None:
+    """Regenerate the variants of `model.field_name` whenever a new image is saved."""
+
+    def handler(sender, instance, **kwargs):
+        field_file = getattr(instance, field_name)
+        variants = getattr(instance, variants_field) or {}
+        if field_file and variants.get("source") != field_file.name:
+            schedule_variants(sender, instance.pk, field_name, variants_field)
+
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=f"image-variants-{model._meta.label}")
+
+
+def variant_urls(variants: dict, request=None) -> dict:
+    """Return the URLs of stored `variants`, absolute when a request is available."""
+
+    def build_url(path):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request else url
+
+    return {
+        variant: {
+            "webp": build_url(paths["webp"]),
+            "jpg": build_url(paths["jpg"]),
+            "width": paths["width"],
+            "height": paths["height"],
+        }
+        for variant, paths in (variants or {}).items()
+        if variant != "source"
+    }
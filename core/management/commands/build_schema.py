@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.openapi import RENDERERS, build_schema, get_code_version, schema_path
+
+
+class Command(BaseCommand):
+    help = "Generates the OpenAPI schema served at api/schema/ for the current code version"
+
+    def handle(self, *args, **options):
+        build_schema()
+        for schema_format in RENDERERS:
+            self.stdout.write(self.style.SUCCESS(f"Wrote {schema_path(get_code_version(), schema_format)}"))
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_import_times(output: str) -> list[tuple[str, int, int]]:
+    """Parse `python -X importtime` output into (module, self µs, cumulative µs) rows."""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Profiles the cold start of a management command, reporting the import time of every module"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="configurations",
+            help="Settings class to profile, may be repeated to compare. Defaults to DJANGO_CONFIGURATION",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=3, help="Cold starts per configuration, the fastest is reported"
+        )
+        parser.add_argument("--limit", type=int, default=15, help="Number of packages and modules listed")
+        parser.add_argument("command_args", nargs="*", default=["check"], help="Command to start, check by default")
+
+    def handle(self, *args, **options):
+        configurations = options["configurations"] or [os.environ.get("DJANGO_CONFIGURATION", "Local")]
+        summaries = []
+        for configuration in configurations:
+            wall_ms, rows = self.profile(configuration, options["command_args"], options["runs"])
+            summaries.append((configuration, wall_ms, sum(row[1] for row in rows) / 1000, len(rows)))
+            self.report(configuration, rows, options["limit"])
+
+        self.stdout.write("")
+        for configuration, wall_ms, import_ms, modules in summaries:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{configuration}: cold start {wall_ms:.0f} ms, {import_ms:.0f} ms importing {modules} modules"
+                )
+            )
+
+    def profile(self, configuration, command_args, runs):
+        environment = {**os.environ, "DJANGO_CONFIGURATION": configuration}
+        command = [sys.executable, "-X", "importtime", os.path.join(settings.BASE_DIR, "manage.py"), *command_args]
+        best = None
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run(command, env=environment, capture_output=True, text=True, cwd=settings.BASE_DIR)
+            wall_ms = (time.perf_counter() - started) * 1000
+            if result.returncode:
+                self.stderr.write(result.stderr[-2000:])
+                raise SystemExit(result.returncode)
+            if best is None or wall_ms < best[0]:
+                best = (wall_ms, parse_import_times(result.stderr))
+        return best
+
+    def report(self, configuration, rows, limit):
+        packages = defaultdict(int)
+        for module, self_us, _ in rows:
+            packages[module.split(".")[0]] += self_us
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{configuration}: import time by package"))
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {package}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{configuration}: slowest modules, including their imports"))
+        for module, _, cumulative_us in sorted(rows, key=lambda row: -row[2])[:limit]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module}")
@@ -0,0 +1,131 @@
+"""Precomputed OpenAPI schema.
+
+Introspecting every serializer takes far longer than serving a file, so the schema is generated
+once per code version, by `manage.py build_schema` at build time or by the first request, and
+served from memory afterwards. The code version is `APP_VERSION` when deployed, or a fingerprint
+of the sources otherwise.
+"""
+
+import glob
+import gzip
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+RENDERERS = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+# Packages whose sources make up the code version when APP_VERSION is not set.
+SOURCE_PACKAGES = ("apps", "core", "settings")
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    content: bytes
+    gzipped: bytes
+    etag: str
+    media_type: str
+
+    @classmethod
+    def from_content(cls, content: bytes, schema_format: str) -> "SchemaDocument":
+        return cls(
+            content=content,
+            gzipped=gzip.compress(content, mtime=0),
+            etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+            media_type=RENDERERS[schema_format].media_type,
+        )
+
+
+_code_version = None
+_documents = {}
+_lock = threading.Lock()
+
+
+def get_code_version() -> str:
+    global _code_version
+    if _code_version is None:
+        _code_version = settings.APP_VERSION or fingerprint_sources()
+    return _code_version
+
+
+def fingerprint_sources() -> str:
+    digest = hashlib.sha256()
+    for package in SOURCE_PACKAGES:
+        for path in sorted(glob.glob(os.path.join(settings.BASE_DIR, package, "**", "*.py"), recursive=True)):
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()[:12]
+
+
+def schema_path(version: str, schema_format: str) -> str:
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, f"schema-{version}.{schema_format}")
+
+
+def build_schema(version: str = None) -> dict[str, SchemaDocument]:
+    """Generate the schema in every format, store it for `version` and return the documents."""
+    version = version or get_code_version()
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+
+    os.makedirs(settings.OPENAPI_SCHEMA_DIR, exist_ok=True)
+    documents = {}
+    for schema_format, renderer_class in RENDERERS.items():
+        content = renderer_class().render(schema, renderer_context={})
+        # Written aside and renamed so other processes never load a partial file.
+        path = schema_path(version, schema_format)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+        documents[schema_format] = SchemaDocument.from_content(content, schema_format)
+        _documents[version, schema_format] = documents[schema_format]
+        remove_stale_schemas(path, schema_format)
+    return documents
+
+
+def remove_stale_schemas(path: str, schema_format: str) -> None:
+    """Delete the schemas in `schema_format` of other versions written before `path`.
+
+    Files still being written by other processes end in `.tmp` and are left alone, as are
+    schemas written since, which belong to a newer deploy.
+    """
+    written_at = os.stat(path).st_mtime_ns
+    for other_path in glob.glob(os.path.join(settings.OPENAPI_SCHEMA_DIR, f"schema-*.{schema_format}")):
+        if other_path == path:
+            continue
+        try:
+            if os.stat(other_path).st_mtime_ns <= written_at:
+                os.remove(other_path)
+        except FileNotFoundError:
+            # Removed by a concurrent build.
+            pass
+
+
+def get_schema_document(schema_format: str) -> SchemaDocument:
+    version = get_code_version()
+    document = _documents.get((version, schema_format))
+    if document is not None:
+        return document
+
+    with _lock:
+        document = _documents.get((version, schema_format))
+        if document is None:
+            try:
+                with open(schema_path(version, schema_format), "rb") as file:
+                    document = SchemaDocument.from_content(file.read(), schema_format)
+                _documents[version, schema_format] = document
+            except FileNotFoundError:
+                document = build_schema(version)[schema_format]
+    return document
+
+
+def clear_schema_cache() -> None:
+    global _code_version
+    _code_version = None
+    _documents.clear()
@@ -0,0 +1,23 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from .db import estimate_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts the query planner's estimate for large counts instead of a COUNT(*).
+
+    Counts below `EXACT_COUNT_LIMIT` are cheap enough to be exact, and databases without
+    estimates always count.
+    """
+
+    EXACT_COUNT_LIMIT = 10_000
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > self.EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
@@ -0,0 +1,167 @@
+"""In-process pub/sub for server-sent events, fed by a pluggable broker.
+
+Streaming responses subscribe to channels on the process `hub`. Publishers hand batches of
+messages to the broker, which delivers them to the hub of every process: `LocalBroker` to this
+process only, the stand-in for a single process and tests, `RedisBroker` to every process
+subscribed to the same Redis.
+
+Subscriptions keep only the latest message of each of their channels until they are read, so an
+idle subscription is a set entry per channel and a burst of messages costs one wake up.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "BROKER": "core.pubsub.LocalBroker",
+    "BROKER_OPTIONS": {},
+    # Seconds publishers gather changes before sending them as one batch.
+    "COALESCE_INTERVAL": 0.5,
+    # Seconds between two comments keeping idle streams open through proxies.
+    "HEARTBEAT_INTERVAL": 15,
+    # Channels a single stream may subscribe to.
+    "MAX_CHANNELS": 1000,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "LIVE_EVENTS", {}).get(name, DEFAULTS[name])
+
+
+class Subscription:
+    """Channels a stream listens to, and the latest message of each not read yet."""
+
+    __slots__ = ("channels", "pending", "_loop", "_ready")
+
+    def __init__(self, channels, loop):
+        self.channels = frozenset(channels)
+        self.pending = {}
+        self._loop = loop
+        self._ready = asyncio.Event()
+
+    def _push(self, channel, data):
+        self.pending[channel] = data
+        self._ready.set()
+
+    async def get(self, timeout: float) -> dict:
+        """Wait up to `timeout` seconds for messages and return the latest one by channel."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self._ready.clear()
+        pending, self.pending = self.pending, {}
+        return pending
+
+
+class Hub:
+    """Routes the messages delivered to this process to the subscriptions of their channel."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    def subscribe(self, channels) -> Subscription:
+        """Subscribe to `channels`, from the event loop the subscription will be read in."""
+        get_broker().start()
+        subscription = Subscription(channels, asyncio.get_running_loop())
+        with self._lock:
+            for channel in subscription.channels:
+                self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._channels[channel]
+
+    def deliver(self, messages) -> None:
+        """Hand `messages`, dicts with a channel and data, to their subscribers. Safe from any thread."""
+        with self._lock:
+            targets = [
+                (subscription, message["channel"], message["data"])
+                for message in messages
+                for subscription in self._channels.get(message["channel"], ())
+            ]
+        for subscription, channel, data in targets:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._push, channel, data)
+            except RuntimeError:
+                # The loop of the stream is closed, it unsubscribes as it shuts down.
+                pass
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+hub = Hub()
+
+
+class LocalBroker:
+    """Delivers messages to the hub of this process only."""
+
+    def start(self) -> None:
+        pass
+
+    def publish(self, messages) -> None:
+        hub.deliver(messages)
+
+
+class RedisBroker:
+    """Delivers messages to every process through a Redis pub/sub channel. Needs the redis package."""
+
+    def __init__(self, url: str, channel: str = "pulsepost:live"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="live-events", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for message in pubsub.listen():
+            try:
+                hub.deliver(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Dropped an undeliverable live events batch")
+
+    def publish(self, messages) -> None:
+        self.client.publish(self.channel, json.dumps(messages))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(get_setting("BROKER"))(**get_setting("BROKER_OPTIONS"))
+    return _broker
+
+
+def format_event(event: str, data) -> str:
+    """Encode a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -0,0 +1,103 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# Set for the duration of a request that may be served from a replica.
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+PIN_COOKIE_NAME = "primary_pin"
+
+
+def get_replica_aliases() -> list[str]:
+    return list(getattr(settings, "REPLICA_DATABASES", []))
+
+
+def get_pin_seconds() -> int:
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+def _pin_cache_key(user_id) -> str:
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_user_to_primary(user_id) -> None:
+    """Route `user_id`'s reads to the primary until their writes have replicated."""
+    cache.set(_pin_cache_key(user_id), True, timeout=get_pin_seconds())
+
+
+def is_user_pinned(user_id) -> bool:
+    return bool(cache.get(_pin_cache_key(user_id)))
+
+
+@contextmanager
+def reading_from_primary():
+    """Send the reads of the block to the primary, for results cached beyond the current request."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to a replica while a request has opted in, everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_aliases()
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replica_aliases()
+
+
+class ReplicaReadMixin:
+    """Serve safe requests of a view from the replicas.
+
+    A client that has just written is pinned to the primary for `REPLICA_PIN_SECONDS`, through
+    a cookie and a per-user cache marker, so its own writes are visible on the next read.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ("GET", "HEAD", "OPTIONS") and not self._is_pinned(request):
+            self._replica_token = _read_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _read_from_replica.reset(token)
+            self._replica_token = None
+
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            pin_seconds = get_pin_seconds()
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                str(int(time.time()) + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+            if request.user.is_authenticated:
+                pin_user_to_primary(request.user.pk)
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def _is_pinned(self, request) -> bool:
+        pinned_until = request.COOKIES.get(PIN_COOKIE_NAME)
+        if pinned_until and pinned_until.isdigit() and int(pinned_until) > time.time():
+            return True
+        return request.user.is_authenticated and is_user_pinned(request.user.pk)
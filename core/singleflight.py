@@ -0,0 +1,138 @@
+"""Request coalescing and cache stampede protection.
+
+`SingleFlight` runs one computation per key at a time in a process, concurrent callers of the
+same key wait for it and share its result. `cached` builds on it for cached values: misses are
+coalesced in the process and, with a `lock_timeout`, across processes through a lock key, and
+values are refreshed early with a probability growing as their expiry nears (XFetch), so the
+entries of hot keys are recomputed by one request before they expire for all of them.
+"""
+
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from django.core.cache import cache
+
+# Seconds between two reads of a value another process is computing.
+POLL_INTERVAL = 0.05
+# Above 1 refreshes earlier, below 1 later. See `should_refresh`.
+DEFAULT_BETA = 1.0
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent computations of the same key within the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, compute: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return the result of `compute`, and whether it was shared with a call already running."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = compute()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+flight = SingleFlight()
+
+
+class Entry(NamedTuple):
+    value: Any
+    # Seconds the value took to compute.
+    delta: float
+    expires_at: float
+
+
+def should_refresh(entry: Entry, beta: float = DEFAULT_BETA) -> bool:
+    """Decide whether to recompute `entry` ahead of its expiry.
+
+    The chance grows with the time the value takes to compute and as the expiry nears, so slow
+    values are refreshed earlier and concurrent readers rarely decide to at the same time.
+    """
+    return time.time() - entry.delta * beta * math.log(1 - random.random()) >= entry.expires_at
+
+
+def lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def cached(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int,
+    beta: float = DEFAULT_BETA,
+    lock_timeout: float | None = None,
+):
+    """Return the cached value of `key`, computing it with `compute` when missing or due.
+
+    With a `lock_timeout`, a single process computes the value while the others wait for it up to
+    that many seconds, or keep serving the value they have when it is refreshed early.
+    """
+    entry = cache.get(key)
+    if entry is not None and not should_refresh(entry, beta):
+        return entry.value
+
+    value, _shared = flight.do(key, lambda: _fill(key, compute, timeout, lock_timeout, entry))
+    return value
+
+
+def _fill(key, compute, timeout, lock_timeout, stale: Entry | None):
+    locked = False
+    if lock_timeout:
+        locked = cache.add(lock_key(key), True, math.ceil(lock_timeout))
+        if not locked:
+            if stale is not None:
+                return stale.value
+            entry = _wait_for(key, lock_timeout)
+            if entry is not None:
+                return entry.value
+            # The process holding the lock is slow or gone, compute the value here too.
+
+    try:
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        cache.set(key, Entry(value, delta, time.time() + timeout), timeout)
+        return value
+    finally:
+        if locked:
+            cache.delete(lock_key(key))
+
+
+def _wait_for(key, wait: float) -> Entry | None:
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None or lock_key(key) not in cache:
+            # Computed, or the computation failed and released the lock.
+            return entry
+    return None
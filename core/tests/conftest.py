@@ -0,0 +1,32 @@
+import pytest
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from core.throttling import bucket_store
+
+
+@pytest.fixture(autouse=True)
+def clear_throttles():
+    bucket_store.clear()
+
+
+@pytest.fixture()
+def admin_user():
+    return User.objects.create_superuser(
+        email="admin@example.com",
+        password="admin-password",
+        first_name="Admin",
+        last_name="User",
+    )
+
+
+@pytest.fixture()
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    return client
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
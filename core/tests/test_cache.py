@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+
+from core.cache import MISSING, LocalTier, TieredCache
+
+
+def make_cache(**options):
+    """A tiered cache over the configured shared tier, standing in for another process."""
+    return TieredCache("", {"OPTIONS": {"SHARED": "shared", "LOCAL_PREFIXES": ["local:"], **options}})
+
+
+@pytest.fixture(autouse=True)
+def clear_shared():
+    caches["shared"].clear()
+
+
+def test_local_tier_evicts_least_recently_used():
+    tier = LocalTier(max_entries=2, max_bytes=1024)
+    tier.set("a", 1, 60, None)
+    tier.set("b", 2, 60, None)
+    tier.get("a", None)
+    tier.set("c", 3, 60, None)
+
+    assert tier.get("b", None) is MISSING
+    assert tier.get("a", None) == 1
+    assert tier.evictions == 1
+
+    tier.set("big", "x" * 2000, 60, None)
+    assert tier.get("big", None) is MISSING
+    tier.set("d", "x" * 600, 60, None)
+    tier.set("e", "x" * 600, 60, None)
+    assert tier.size <= 1024
+
+
+def test_local_tier_expires_entries(monkeypatch):
+    tier = LocalTier(max_entries=10, max_bytes=1024)
+    tier.set("a", 1, 5, None)
+    now = time.monotonic()
+    monkeypatch.setattr("core.cache.time.monotonic", lambda: now + 6)
+
+    assert tier.get("a", None) is MISSING
+    assert tier.expirations == 1
+
+
+def test_writes_invalidate_other_processes():
+    writer = make_cache()
+    reader = make_cache(STAMP_INTERVAL=0)
+    writer.set("local:key", "old")
+    assert reader.get("local:key") == "old"
+    assert reader.get("local:key") == "old"
+    assert reader.stats()["local"]["hits"] == 1
+
+    writer.set("local:key", "new")
+    assert reader.get("local:key") == "new"
+    assert reader.stats()["local"]["invalidations"] == 1
+
+    writer.delete("local:key")
+    assert reader.get("local:key") is None
+
+
+def test_stale_copies_are_bounded_by_the_stamp_interval(monkeypatch):
+    writer = make_cache()
+    reader = make_cache(STAMP_INTERVAL=1)
+    writer.set("local:key", "old")
+    assert reader.get("local:key") == "old"
+
+    writer.set("local:key", "new")
+    assert reader.get("local:key") == "old"
+
+    now = time.monotonic()
+    monkeypatch.setattr("core.cache.time.monotonic", lambda: now + 2)
+    assert reader.get("local:key") == "new"
+
+
+def test_versioned_and_shared_only_keys():
+    cache = make_cache(LOCAL_PREFIXES=["local:", "versioned:"], VERSIONED_PREFIXES=["versioned:"])
+    cache.set_many({"versioned:1": "a", "remote": "b"})
+    assert cache.get_many(["versioned:1", "remote", "missing"]) == {"versioned:1": "a", "remote": "b"}
+    assert len(cache.local) == 1
+    assert caches["shared"].get("remote") == "b"
+
+    assert cache.add("local:counter", 1) is True
+    assert cache.add("local:counter", 2) is False
+    assert cache.incr("local:counter") == 2
+    assert cache.get("local:counter") == 2
+
+
+@pytest.mark.django_db()
+def test_cache_health(admin_client):
+    response = admin_client.get(reverse("health-cache"))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["healthy"] is True
+    assert set(data["caches"]["default"]) == {"local", "shared"}
+
+
+@pytest.mark.django_db()
+def test_cache_health_requires_admin(api_client):
+    response = api_client.get(reverse("health-cache"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,34 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from core.db import check_database, get_pool_stats
+
+
+@pytest.mark.django_db()
+def test_pool_stats_without_pool():
+    check_database()
+    stats = get_pool_stats()
+    assert stats["mode"] in ("persistent", "per-request")
+    assert stats["connected"] is True
+
+
+@pytest.mark.django_db()
+def test_database_health_requires_admin(api_client):
+    response = api_client.get(reverse("health-db"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db()
+def test_database_health(admin_client):
+    response = admin_client.get(reverse("health-db"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["healthy"] is True
+    assert "mode" in response.json()["pool"]
+
+
+@pytest.mark.django_db()
+def test_bench_db_connections(capsys):
+    call_command("bench_db_connections", iterations=5)
+    assert "Saved per request" in capsys.readouterr().out
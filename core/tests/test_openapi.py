@@ -0,0 +1,113 @@
+import gzip
+import os
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from core import openapi
+from core.views import accepts_gzip
+
+
+@pytest.fixture(autouse=True)
+def schema_dir(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_DIR = str(tmp_path)
+    settings.APP_VERSION = "test"
+    openapi.clear_schema_cache()
+    yield tmp_path
+    openapi.clear_schema_cache()
+
+
+@pytest.fixture()
+def generations(monkeypatch):
+    calls = []
+    get_schema = openapi.SchemaGenerator.get_schema
+
+    def counting_get_schema(self, *args, **kwargs):
+        calls.append(1)
+        return get_schema(self, *args, **kwargs)
+
+    monkeypatch.setattr(openapi.SchemaGenerator, "get_schema", counting_get_schema)
+    return calls
+
+
+def test_schema_is_generated_once(api_client, generations):
+    first = api_client.get(reverse("schema"))
+    second = api_client.get(reverse("schema"), HTTP_ACCEPT="application/vnd.oai.openapi+json")
+
+    assert first.status_code == 200
+    assert first["Content-Type"] == "application/vnd.oai.openapi"
+    assert b"openapi:" in first.content
+    assert second.json()["info"]["title"] == "PulsePost API"
+    assert len(generations) == 1
+
+
+def test_schema_supports_etags_and_gzip(api_client):
+    response = api_client.get(reverse("schema"), HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "gzip"
+    assert b"openapi:" in gzip.decompress(response.content)
+
+    response = api_client.get(reverse("schema"), HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+def test_schema_is_not_gzipped_when_gzip_is_refused(api_client):
+    response = api_client.get(reverse("schema"), HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+    assert "Content-Encoding" not in response
+    assert b"openapi:" in response.content
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, br", True),
+        ("br;q=1.0, GZIP;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000, *", False),
+        ("*;q=0", False),
+        ("br, identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+def test_built_schema_is_served_from_file(api_client, schema_dir, generations):
+    call_command("build_schema")
+    assert (schema_dir / "schema-test.yaml").exists()
+    openapi.clear_schema_cache()
+
+    assert api_client.get(reverse("schema")).status_code == 200
+    assert len(generations) == 1
+
+
+def test_new_code_version_regenerates_the_schema(api_client, settings, schema_dir, generations):
+    api_client.get(reverse("schema"))
+    settings.APP_VERSION = "next"
+    openapi.clear_schema_cache()
+
+    api_client.get(reverse("schema"))
+    assert len(generations) == 2
+    assert sorted(path.name for path in schema_dir.iterdir()) == ["schema-next.json", "schema-next.yaml"]
+
+
+def test_build_keeps_partial_and_newer_schemas(schema_dir):
+    (schema_dir / "schema-old.yaml").write_text("old")
+    partial = schema_dir / "schema-other.yaml.123.tmp"
+    partial.write_text("partial")
+
+    call_command("build_schema")
+    newer = schema_dir / "schema-newer.yaml"
+    newer.write_text("newer")
+    written_at = (schema_dir / "schema-test.yaml").stat().st_mtime
+    os.utime(newer, (written_at + 60, written_at + 60))
+    openapi.remove_stale_schemas(str(schema_dir / "schema-test.yaml"), "yaml")
+
+    assert sorted(path.name for path in schema_dir.iterdir()) == [
+        "schema-newer.yaml",
+        "schema-other.yaml.123.tmp",
+        "schema-test.json",
+        "schema-test.yaml",
+    ]
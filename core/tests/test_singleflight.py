@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from core import singleflight
+from core.singleflight import Entry, SingleFlight, cached, lock_key, should_refresh
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def run_concurrently(target, count):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as exc:
+            errors[index] = exc
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results, _ = run_concurrently(lambda: flight.do("key", compute), 8)
+
+    assert len(calls) == 1
+    assert [value for value, _shared in results] == ["value"] * 8
+    assert sorted(shared for _value, shared in results) == [False] + [True] * 7
+
+
+def test_errors_reach_every_waiting_caller():
+    flight = SingleFlight()
+
+    def compute():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    _, errors = run_concurrently(lambda: flight.do("key", compute), 4)
+
+    assert all(isinstance(error, ValueError) for error in errors)
+    # Nothing is left behind for the next call.
+    assert flight.do("key", lambda: "retried") == ("retried", False)
+
+
+def test_cached_computes_misses_once():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results, _ = run_concurrently(lambda: cached("hot", compute, 60), 8)
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert cached("hot", compute, 60) == "value"
+    assert len(calls) == 1
+
+
+def test_early_refresh_as_expiry_nears(monkeypatch):
+    fresh = Entry("value", delta=0.5, expires_at=time.time() + 60)
+    due = Entry("value", delta=0.5, expires_at=time.time() + 0.1)
+    monkeypatch.setattr(singleflight.random, "random", lambda: 0.5)
+
+    assert not should_refresh(fresh)
+    assert should_refresh(due)
+
+    cache.set("hot", due, 60)
+    assert cached("hot", lambda: "refreshed", 60) == "refreshed"
+    assert cache.get("hot").value == "refreshed"
+
+
+def test_lock_makes_other_processes_wait(monkeypatch):
+    monkeypatch.setattr(singleflight, "POLL_INTERVAL", 0.01)
+    cache.add(lock_key("hot"), True, 5)
+    threading.Timer(0.1, lambda: cache.set("hot", Entry("theirs", 0, time.time() + 60), 60)).start()
+
+    assert cached("hot", lambda: "ours", 60, lock_timeout=1) == "theirs"
+
+
+def test_lock_holder_refreshes_while_others_serve_stale_values(monkeypatch):
+    monkeypatch.setattr(singleflight, "should_refresh", lambda entry, beta: True)
+    cache.set("hot", Entry("stale", 0, time.time() + 60), 60)
+    cache.add(lock_key("hot"), True, 5)
+
+    assert cached("hot", lambda: "fresh", 60, lock_timeout=1) == "stale"
+
+    cache.delete(lock_key("hot"))
+    assert cached("hot", lambda: "fresh", 60, lock_timeout=1) == "fresh"
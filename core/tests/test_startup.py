@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+
+from core.management.commands.profile_startup import parse_import_times
+from settings.local import LocalWorker
+from settings.worker import WEB_ONLY_APPS
+
+# Prints the models with a foreign key to users, as installed by DJANGO_CONFIGURATION.
+USER_RELATIONS_SCRIPT = """
+import json
+import configurations
+configurations.setup()
+from django.apps import apps
+from django.contrib.auth import get_user_model
+user_model = get_user_model()
+print(json.dumps(sorted(
+    model._meta.label
+    for model in apps.get_models(include_auto_created=True)
+    if any(field.related_model is user_model for field in model._meta.fields)
+)))
+"""
+
+
+def models_referencing_users(configuration: str) -> set[str]:
+    # A process of its own, the app registry of this one is already populated.
+    result = subprocess.run(
+        [sys.executable, "-c", USER_RELATIONS_SCRIPT],
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "settings", "DJANGO_CONFIGURATION": configuration},
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_parse_import_times():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     encodings.aliases",
+            "import time:      1500 |       1620 |   django.urls",
+            "Traceback lines are ignored",
+        ]
+    )
+    assert parse_import_times(output) == [("encodings.aliases", 120, 120), ("django.urls", 1500, 1620)]
+
+
+def test_worker_profile_leaves_out_web_only_apps():
+    assert not set(WEB_ONLY_APPS) & set(LocalWorker.INSTALLED_APPS)
+    assert {"apps.accounts", "apps.posts", "apps.jobs"} <= set(LocalWorker.INSTALLED_APPS)
+    assert LocalWorker.ROOT_URLCONF == "core.worker_urls"
+
+
+def test_worker_profile_keeps_every_app_with_models():
+    # Deleting a user in the worker must cascade to every table that references them.
+    assert not [app.name for app in apps.get_app_configs() if app.models_module and app.name in WEB_ONLY_APPS]
+
+
+def test_worker_profile_keeps_every_model_referencing_users():
+    # Deleting a user in the worker must cascade to every table that references them.
+    web = models_referencing_users("Local")
+    assert {"admin.LogEntry", "social_django.UserSocialAuth"} <= web
+    assert models_referencing_users("LocalWorker") == web
@@ -0,0 +1,96 @@
+import pytest
+from django.urls import reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from apps.posts.tests.factories import UserFactory
+from core.throttling import TokenBucketStore, parse_rate
+
+
+@pytest.fixture()
+def throttle_rates(monkeypatch):
+    for scope in ("search", "writes", "login"):
+        monkeypatch.setitem(api_settings.DEFAULT_THROTTLE_RATES, scope, "2/min")
+
+
+def test_parse_rate():
+    assert parse_rate("30/min") == (30, 0.5)
+    assert parse_rate("10/s") == (10, 10)
+
+
+def test_bucket_allows_bursts_then_waits_for_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("core.throttling.time.monotonic", lambda: now[0])
+    store = TokenBucketStore()
+
+    assert store.consume("key", 2, 0.5) == 0
+    assert store.consume("key", 2, 0.5) == 0
+    assert store.consume("key", 2, 0.5) == pytest.approx(2)
+
+    now[0] += 2
+    assert store.consume("key", 2, 0.5) == 0
+    assert store.consume("other", 2, 0.5) == 0
+
+
+def test_sweep_drops_refilled_buckets_by_their_own_rate(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("core.throttling.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(TokenBucketStore, "MAX_BUCKETS", 2)
+    store = TokenBucketStore()
+
+    store.consume("slow", 2, 0.01)
+    store.consume("fast", 2, 10)
+    now[0] += 1
+    # Sweeping with the rate of the fast scope would drop the slow bucket too.
+    store.consume("another", 2, 10)
+
+    assert list(store._buckets) == ["slow", "another"]
+
+
+@pytest.mark.django_db()
+def test_search_requests_are_throttled_with_retry_after(admin_client, throttle_rates):
+    url = reverse("post-list")
+    for _ in range(2):
+        assert admin_client.get(url, {"search": "django"}).status_code == 200
+
+    response = admin_client.get(url, {"search": "django"})
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) > 0
+
+    # Plain listings are not searches.
+    assert admin_client.get(url).status_code == 200
+
+
+@pytest.mark.django_db()
+def test_login_attempts_are_throttled_per_address(api_client, throttle_rates):
+    url = reverse("account_login")
+    for _ in range(2):
+        assert api_client.post(url, {"email": "nobody@example.com", "password": "wrong"}).status_code == 401
+
+    response = api_client.post(url, {"email": "nobody@example.com", "password": "wrong"})
+    assert response.status_code == 429
+    assert "Retry-After" in response
+
+
+def test_buckets_are_consumed_together(monkeypatch):
+    monkeypatch.setattr("core.throttling.time.monotonic", lambda: 100.0)
+    store = TokenBucketStore()
+
+    assert store.consume_all([("user", 2, 0.5), ("address", 1, 0.5)]) == 0
+    assert store.consume_all([("user", 2, 0.5), ("address", 1, 0.5)]) == pytest.approx(2)
+    # The refused request took no token from the user's bucket.
+    assert store.consume("user", 2, 0.5) == 0
+
+
+@pytest.mark.django_db()
+def test_writes_of_many_accounts_share_their_address_bucket(throttle_rates, monkeypatch):
+    monkeypatch.setitem(api_settings.DEFAULT_THROTTLE_RATES, "writes_address", "3/min")
+    first, second = APIClient(), APIClient()
+    first.force_authenticate(user=UserFactory())
+    second.force_authenticate(user=UserFactory())
+    url = reverse("post-list")
+
+    assert first.post(url, {}).status_code == 400
+    assert first.post(url, {}).status_code == 400
+    assert second.post(url, {}).status_code == 400
+    assert second.post(url, {}).status_code == 429
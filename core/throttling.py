@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """Parse a "<requests>/<period>" rate into a bucket capacity and refill rate per second."""
+    requests, period = rate.split("/")
+    capacity = int(requests)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class TokenBucketStore:
+    """Process-local token buckets, updated atomically under a lock.
+
+    Consuming a token is a dictionary lookup and a little arithmetic, far cheaper than a cache
+    round trip. Limits therefore apply per worker process.
+    """
+
+    # Buckets are swept once there are more than this many, dropping the ones that refilled.
+    MAX_BUCKETS = 100_000
+    # Least recently used buckets a sweep looks at, so no request pays for sweeping them all.
+    SWEEP_BATCH = 100
+
+    def __init__(self):
+        # Least recently used first, each with its own capacity and refill rate.
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Take a token from bucket `key` and return 0, or the seconds until one is available."""
+        return self.consume_all([(key, capacity, refill_rate)])
+
+    def consume_all(self, buckets: list[tuple[str, int, float]]) -> float:
+        """Take a token from every (key, capacity, refill rate) bucket and return 0.
+
+        When one of them is empty no token is taken, and the seconds until all have one are returned.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, capacity, refill_rate in buckets:
+                tokens, updated_at, _, _ = self._buckets.pop(key, (capacity, now, capacity, refill_rate))
+                levels.append((key, min(capacity, tokens + (now - updated_at) * refill_rate), capacity, refill_rate))
+            wait = max(0.0, *((1 - tokens) / refill_rate for _, tokens, _, refill_rate in levels))
+            for key, tokens, capacity, refill_rate in levels:
+                self._buckets[key] = (tokens if wait else tokens - 1, now, capacity, refill_rate)
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._sweep(now)
+        return wait
+
+    def _sweep(self, now):
+        """Drop the refilled buckets among the least recently used, a full bucket is the same as none."""
+        for _ in range(min(self.SWEEP_BATCH, len(self._buckets))):
+            key, bucket = self._buckets.popitem(last=False)
+            tokens, updated_at, capacity, refill_rate = bucket
+            if tokens + (now - updated_at) * refill_rate < capacity:
+                # Still refilling, looked at again once the others were.
+                self._buckets[key] = bucket
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+bucket_store = TokenBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle requests of a scope with a token bucket per user, or per client address.
+
+    The rate of the scope is read from `DEFAULT_THROTTLE_RATES`; "30/min" allows bursts of 30
+    requests and refills one token every two seconds. With an `address_scope` the requests of
+    signed in users also take a token from a bucket of their client address, so one client can not
+    spread its requests over many accounts.
+    """
+
+    scope = None
+    address_scope = None
+
+    def __init__(self):
+        self.wait_time = 0.0
+
+    def applies(self, request, view) -> bool:
+        return True
+
+    def get_bucket_key(self, request) -> str:
+        if request.user and request.user.is_authenticated:
+            return f"{self.scope}:user:{request.user.pk}"
+        return f"{self.scope}:ip:{self.get_ident(request)}"
+
+    def get_buckets(self, request) -> list[tuple[str, int, float]]:
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        buckets = [(self.get_bucket_key(request), *parse_rate(rates[self.scope]))]
+        address_rate = rates.get(self.address_scope) if self.address_scope else None
+        if address_rate and request.user and request.user.is_authenticated:
+            buckets.append((f"{self.address_scope}:ip:{self.get_ident(request)}", *parse_rate(address_rate)))
+        return buckets
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None or not self.applies(request, view):
+            return True
+        self.wait_time = bucket_store.consume_all(self.get_buckets(request))
+        return self.wait_time == 0
+
+    def wait(self):
+        # Sent back as the Retry-After header.
+        return math.ceil(self.wait_time)
+
+
+class SearchThrottle(TokenBucketThrottle):
+    """Throttle full text searches, which scan the posts table."""
+
+    scope = "search"
+
+    def applies(self, request, view):
+        return "search" in request.query_params
+
+
+class WriteThrottle(TokenBucketThrottle):
+    scope = "writes"
+    address_scope = "writes_address"
+
+    def applies(self, request, view):
+        return request.method not in SAFE_METHODS
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """Throttle sign in attempts per client address, whoever they claim to be."""
+
+    scope = "login"
+
+    def get_bucket_key(self, request):
+        return f"{self.scope}:ip:{self.get_ident(request)}"
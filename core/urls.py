@@ -17,18 +17,25 @@ Including another URLconf
 
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
 # from .schema import schema_view
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from .views import CachedSchemaView, CacheHealthView, DatabaseHealthView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/health/db/", DatabaseHealthView.as_view(), name="health-db"),
+    path("api/health/cache/", CacheHealthView.as_view(), name="health-cache"),
     path("api/auth/", include("apps.accounts.api.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSchemaView.as_view(), name="schema"),
     # Optional UI:
     path("", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/schema/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
     path("api/", include("apps.posts.api.urls")),
-]
+    path("api/", include("apps.notifications.api.urls")),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
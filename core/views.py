@@ -0,0 +1,108 @@
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import check_cache
+from .db import check_database, get_pool_stats
+from .openapi import get_schema_document
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether an Accept-Encoding header allows gzip, honouring q=0 and the * wildcard."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+class DatabaseHealthView(APIView):
+    """Report database reachability and connection pool statistics."""
+
+    permission_classes = [IsAdminUser]
+    serializer_class = None
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            latency_ms = check_database()
+        except DatabaseError as exc:
+            return Response(
+                {"healthy": False, "detail": str(exc)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        return Response(
+            {
+                "healthy": True,
+                "latency_ms": round(latency_ms, 3),
+                "pool": get_pool_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CacheHealthView(APIView):
+    """Report the round trip and the hit, miss and eviction counts of every cache of this process."""
+
+    permission_classes = [IsAdminUser]
+    serializer_class = None
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            latency_ms = check_cache()
+        except Exception as exc:
+            return Response(
+                {"healthy": False, "detail": str(exc)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        return Response(
+            {
+                "healthy": True,
+                "latency_ms": round(latency_ms, 3),
+                "caches": {
+                    alias: caches[alias].stats() for alias in caches.settings if hasattr(caches[alias], "stats")
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """Serve the precomputed OpenAPI schema, see core.openapi.
+
+    The format is negotiated like `SpectacularAPIView`, YAML unless JSON is asked for.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request: Request, *args, **kwargs) -> HttpResponse:
+        document = get_schema_document(request.accepted_renderer.format)
+
+        if document.etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        elif accepts_gzip(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(document.gzipped, content_type=document.media_type)
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(document.content, content_type=document.media_type)
+
+        response["ETag"] = document.etag
+        patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+        return response
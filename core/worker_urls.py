@@ -0,0 +1,3 @@
+"""URL configuration of the worker settings profiles, which serve no requests."""
+
+urlpatterns = []
@@ -1,6 +1,6 @@
 from decouple import config
 
 if config(option="DEVELOPMENT_MODE", cast=bool):
-    from .local import Local  # noqa: F401
+    from .local import Local, LocalWorker  # noqa: F401
 else:
-    from .prod import Production  # noqa: F401
+    from .prod import Production, Worker  # noqa: F401
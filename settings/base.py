@@ -33,8 +33,12 @@ class Base(Configuration):
     ]
 
     LOCAL_APPS = [
+        # Project wide management commands.
+        "core",
         "apps.accounts",
         "apps.posts",
+        "apps.jobs",
+        "apps.notifications",
     ]
 
     INSTALLED_APPS = THIRD_PARTY_APPS + DJANGO_APPS + LOCAL_APPS
@@ -138,8 +142,32 @@ class Base(Configuration):
 
     STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
+    MEDIA_URL = "/media/"
+
+    MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+    # Stream every upload to a temporary file instead of buffering small ones in memory.
+    FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
+
+    IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+    IMAGE_MAX_PIXELS = 40_000_000
+    # Resized copies generated for every featured image and avatar, as (width, height) bounds.
+    IMAGE_VARIANTS = {
+        "thumbnail": (160, 160),
+        "card": (640, 640),
+        "full": (1600, 1600),
+    }
+    # Generate variants in a background job rather than on commit of the upload.
+    IMAGE_VARIANTS_ASYNC = True
+
     DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+    # Reads of views using core.routers.ReplicaReadMixin go to these aliases. Clients are pinned
+    # to the primary for REPLICA_PIN_SECONDS after a write so they read their own writes.
+    DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+    REPLICA_DATABASES = []
+    REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+
     REST_FRAMEWORK = {
         "DEFAULT_AUTHENTICATION_CLASSES": [
             "apps.accounts.authentication.CustomJWTAuthentication",
@@ -152,6 +180,82 @@ class Base(Configuration):
             "rest_framework.renderers.BrowsableAPIRenderer",
         ],
         "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+        "DEFAULT_THROTTLE_CLASSES": [
+            "core.throttling.SearchThrottle",
+            "core.throttling.WriteThrottle",
+        ],
+        # Token bucket sizes, refilled evenly over the period. See core.throttling.
+        "DEFAULT_THROTTLE_RATES": {
+            "search": config("THROTTLE_SEARCH_RATE", default="30/min"),
+            "writes": config("THROTTLE_WRITES_RATE", default="60/min"),
+            # Writes of all the users signed in from one client address.
+            "writes_address": config("THROTTLE_WRITES_ADDRESS_RATE", default="300/min"),
+            "login": config("THROTTLE_LOGIN_RATE", default="10/min"),
+        },
+    }
+
+    # Tag follow home feeds, see apps.posts.feed.
+    FEED = {
+        "TIMELINE_CAP": 800,
+        "POPULAR_TAG_FOLLOWERS": 10_000,
+        "BATCH_SIZE": 500,
+        "QUEUE": "feeds",
+    }
+
+    # Buffered view counting, see apps.posts.view_counts.
+    POST_VIEWS = {
+        "FLUSH_INTERVAL": 10,
+        "PRECISION": 10,
+        "CACHE_TIMEOUT": 7 * 24 * 60 * 60,
+    }
+
+    # An in-process LRU in front of the shared cache, see core.cache. Posts' fragments and pages
+    # are keyed by version and never rewritten, tag suggestions are stamped. Post versions change
+    # with every like, comment and view flush, which would keep their stamp changing, so they are
+    # only kept in the shared tier.
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache.TieredCache",
+            "OPTIONS": {
+                "SHARED": "shared",
+                "LOCAL_PREFIXES": ["post:fragment:", "post:page:", "tags:"],
+                "VERSIONED_PREFIXES": ["post:fragment:", "post:page:"],
+                "LOCAL_TIMEOUT": config("CACHE_LOCAL_TIMEOUT", default=60, cast=int),
+                "LOCAL_MAX_ENTRIES": config("CACHE_LOCAL_MAX_ENTRIES", default=10_000, cast=int),
+                "LOCAL_MAX_BYTES": config("CACHE_LOCAL_MAX_BYTES", default=64 * 1024 * 1024, cast=int),
+                "STAMP_INTERVAL": config("CACHE_STAMP_INTERVAL", default=1.0, cast=float),
+            },
+        },
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+
+    # Server-sent events of live post counts, see core.pubsub.
+    LIVE_EVENTS = {
+        "BROKER": "core.pubsub.LocalBroker",
+        "BROKER_OPTIONS": {},
+        "COALESCE_INTERVAL": 0.5,
+        "HEARTBEAT_INTERVAL": 15,
+        "MAX_CHANNELS": 1000,
+    }
+
+    # Background jobs, see apps.jobs.queue.
+    JOBS = {
+        "MAX_ATTEMPTS": 5,
+        "RETRY_BACKOFF": 30,
+        "RETRY_BACKOFF_MAX": 60 * 60,
+        "LOCK_TIMEOUT": 10 * 60,
+        "HEARTBEAT_INTERVAL": 60,
+        "DONE_RETENTION_DAYS": 7,
+        "EMAIL_BACKEND": "sendgrid_backend.SendgridBackend",
+        "EMAIL_QUEUE": "email",
+    }
+
+    # Fan-out of comment, reply and like notifications, see apps.notifications.fanout.
+    NOTIFICATIONS = {
+        "BATCH_SIZE": 500,
+        "QUEUE": "notifications",
     }
 
     AUTH_COOKIE_ACCESS_MAX_AGE = 60 * 60
@@ -189,7 +293,11 @@ class Base(Configuration):
         "TOKEN_MODEL": None,
         "SET_PASSWORD_RETYPE": True,
         "PASSWORD_RESET_CONFIRM_RETYPE": True,
-        "SOCIAL_AUTH_ALLOWED_REDIRECT_URIS": config("SOCIAL_AUTH_ALLOWED_REDIRECT_URIS").split(","),
+        "SOCIAL_AUTH_ALLOWED_REDIRECT_URIS": config(
+            "SOCIAL_AUTH_ALLOWED_REDIRECT_URIS",
+            default="",
+            cast=lambda value: [uri for uri in value.split(",") if uri],
+        ),
     }
 
     AUTHENTICATION_BACKENDS = (
@@ -198,26 +306,32 @@ class Base(Configuration):
         "django.contrib.auth.backends.ModelBackend",
     )
 
-    SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = config("SOCIAL_AUTH_GOOGLE_OAUTH2_KEY")
-    SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = config("SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET")
+    # Only needed by the web process, so workers and management commands boot without them.
+    SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = config("SOCIAL_AUTH_GOOGLE_OAUTH2_KEY", default="")
+    SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = config("SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET", default="")
     SOCIAL_AUTH_GOOGLE_OAUTH2_SCOPE = [
         "email",
         "openid",
         "profile",
     ]
 
-    SOCIAL_AUTH_GITHUB_KEY = config("SOCIAL_AUTH_GITHUB_KEY")
-    SOCIAL_AUTH_GITHUB_SECRET = config("SOCIAL_AUTH_GITHUB_SECRET")
+    SOCIAL_AUTH_GITHUB_KEY = config("SOCIAL_AUTH_GITHUB_KEY", default="")
+    SOCIAL_AUTH_GITHUB_SECRET = config("SOCIAL_AUTH_GITHUB_SECRET", default="")
     SOCIAL_AUTH_GITHUB_SCOPE = [
         "user:email",
         "user",
     ]
 
-    EMAIL_BACKEND = "sendgrid_backend.SendgridBackend"
+    # Emails are queued and delivered by `manage.py run_worker` through JOBS["EMAIL_BACKEND"].
+    EMAIL_BACKEND = "apps.jobs.mail.QueuedEmailBackend"
     DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
     SENDGRID_API_KEY = config("SENDGRID_API_KEY")
     SENDGRID_SANDBOX_MODE_IN_DEBUG = False
 
+    # Identifies the deployed code, e.g. the commit SHA. The OpenAPI schema is rebuilt when it changes.
+    APP_VERSION = config("APP_VERSION", default="")
+    OPENAPI_SCHEMA_DIR = os.path.join(BASE_DIR, "build", "schema")
+
     SPECTACULAR_SETTINGS = {
         "TITLE": "PulsePost API",
         "DESCRIPTION": "PulsePost REST API Documentation.",
@@ -1,6 +1,9 @@
 import os
 
+from decouple import config
+
 from .base import Base
+from .worker import WorkerMixin
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -13,6 +16,36 @@ class Local(Base):
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": os.path.join(Base.BASE_DIR, "db.sqlite3"),
         },
+        # Stand-in for a read replica. Point DB_REPLICA_NAME at a copy of the primary database
+        # to exercise replica lag locally; tests mirror it onto the primary.
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("DB_REPLICA_NAME", default=os.path.join(Base.BASE_DIR, "db.sqlite3")),
+            "TEST": {"MIRROR": "default"},
+        },
+    }
+    REPLICA_DATABASES = ["replica"] if config("DB_REPLICA", default=False, cast=bool) else []
+
+    # Files stand in for the shared cache, so the server, the worker and commands share it. Parallel
+    # test processes each get their own directory.
+    CACHES = {
+        **Base.CACHES,
+        "shared": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": config(
+                "CACHE_DIR",
+                default=os.path.join(Base.BASE_DIR, "build", "cache", os.environ.get("PYTEST_XDIST_WORKER", "main")),
+            ),
+        },
+    }
+
+    JOBS = {
+        **Base.JOBS,
+        "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
     }
 
     CORS_ALLOW_ALL_ORIGINS = True
+
+
+class LocalWorker(WorkerMixin, Local):
+    pass
@@ -1,6 +1,15 @@
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 
 from .base import Base
+from .worker import WorkerMixin
+
+
+def replica_databases(primary: dict, hosts: list[str]) -> dict:
+    """Return the database settings of replicas on `hosts`, otherwise configured like `primary`."""
+    # Outside the class body, whose names its comprehensions cannot see.
+    return {f"replica_{index}": {**primary, "HOST": host} for index, host in enumerate(hosts)}
 
 
 class Production(Base):
@@ -11,6 +20,75 @@ class Production(Base):
 
     SECRET_KEY = get_random_secret_key()
 
+    # Connection reuse. With DB_POOL enabled (Django >= 5.1 and psycopg[pool] >= 3) every worker
+    # checks connections out of a psycopg pool; otherwise connections are kept open for
+    # DB_CONN_MAX_AGE seconds and health checked before reuse.
+    DB_POOL = config("DB_POOL", default=False, cast=bool)
+    DB_POOL_OPTIONS = {
+        "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+        "max_idle": config("DB_POOL_MAX_IDLE", default=300, cast=float),
+        "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=3600, cast=float),
+    }
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        # Validate connections as they are handed out, the pool equivalent of CONN_HEALTH_CHECKS.
+        DB_POOL_OPTIONS["check"] = ConnectionPool.check_connection
+
+    DB_STATEMENT_TIMEOUT = config("DB_STATEMENT_TIMEOUT", default=15000, cast=int)
+
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DB_NAME", default="pulsepost"),
+            "USER": config("DB_USER", default="postgres"),
+            "PASSWORD": config("DB_PASSWORD", default=""),
+            "HOST": config("DB_HOST", default="localhost"),
+            "PORT": config("DB_PORT", default="5432"),
+            # Pooling does not support persistent connections.
+            "CONN_MAX_AGE": 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=600, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int),
+                "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT}",
+                **({"pool": DB_POOL_OPTIONS} if DB_POOL else {}),
+            },
+        },
+    }
+
+    # Read replicas, as a comma separated list of hosts sharing the primary's credentials.
+    DB_REPLICA_HOSTS = config("DB_REPLICA_HOSTS", default="", cast=lambda value: [h for h in value.split(",") if h])
+    DATABASES = {**DATABASES, **replica_databases(DATABASES["default"], DB_REPLICA_HOSTS)}
+    REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+
+    # The shared cache tier and the live events broker. Post versions, cache stamps, locks and the
+    # buffered view counts only work when every web and worker process shares them.
+    REDIS_URL = config("REDIS_URL", default="")
+    CACHES = {
+        **Base.CACHES,
+        "shared": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+    LIVE_EVENTS = {
+        **Base.LIVE_EVENTS,
+        "BROKER": "core.pubsub.RedisBroker",
+        "BROKER_OPTIONS": {"url": REDIS_URL},
+    }
+
+    @classmethod
+    def setup(cls):
+        super().setup()
+        if not cls.REDIS_URL:
+            raise ImproperlyConfigured("Set REDIS_URL, production processes share their cache through Redis.")
+
     # TODO: Add specific domains when in production
     # CORS_ALLOWED_ORIGINS =
     # ALLOWED_HOSTS =
+
+
+class Worker(WorkerMixin, Production):
+    pass
@@ -0,0 +1,26 @@
+from .base import Base
+
+# Apps only the web process needs: the admin theme, the API schema and the auth endpoints. Apps
+# with models pointing at users, like the admin log and social accounts, stay installed so that
+# deleting a user also deletes their rows.
+WEB_ONLY_APPS = [
+    "jazzmin",
+    "drf_spectacular",
+    "djoser",
+]
+
+
+class WorkerMixin:
+    """Slimmer profile for `run_worker` and one-off management commands.
+
+    Leaves out the admin theme, schema and auth endpoint apps and serves no URLs, so processes
+    boot without importing them. None of the left out apps have models.
+    """
+
+    INSTALLED_APPS = [app for app in Base.INSTALLED_APPS if app not in WEB_ONLY_APPS]
+    ROOT_URLCONF = "core.worker_urls"
+    AUTHENTICATION_BACKENDS = ("django.contrib.auth.backends.ModelBackend",)
+    REST_FRAMEWORK = {
+        **Base.REST_FRAMEWORK,
+        "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.openapi.AutoSchema",
+    }